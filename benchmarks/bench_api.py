@@ -0,0 +1,70 @@
+import argparse
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from def_form.api import DefFormConfig
+from def_form.api import format_sources
+from def_form.cli.context import CLIContext
+from def_form.cli.console.null import NullConsole
+from def_form.cli.ui.null import NullUI
+from def_form.core.manager import DefManager
+from benchmarks.corpus import generate_module
+
+
+def time_manager_per_module(sources: list[str], config: DefFormConfig) -> float:
+    # What embedding used to require: a file on disk and a DefManager per generated module.
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, code in enumerate(sources):
+            path = Path(tmp) / f'module_{i}.py'
+            path.write_text(code, encoding='utf-8')
+            DefManager(
+                path=str(path),
+                ui=NullUI(console=NullConsole(context=CLIContext())),
+                config='/nonexistent',
+                max_def_length=config.max_def_length,
+                max_inline_args=config.max_inline_args,
+                cache=False,
+            ).format()
+            path.read_text(encoding='utf-8')
+    return time.perf_counter() - started
+
+
+def time_api(sources: list[str], config: DefFormConfig, batches: int, jobs: int) -> float:
+    batch_size = len(sources) // batches
+    started = time.perf_counter()
+    if jobs == 1:
+        for i in range(batches):
+            list(format_sources(sources[i * batch_size : (i + 1) * batch_size], config))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for i in range(batches):
+                batch = sources[i * batch_size : (i + 1) * batch_size]
+                list(format_sources(batch, config, executor=executor, chunksize=8))
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare the in-memory API with a DefManager per module')
+    parser.add_argument('--modules', type=int, default=500)
+    parser.add_argument('--batches', type=int, default=5)
+    parser.add_argument('--jobs', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    sources = [generate_module(rng, functions=10, args_per_def=4) for _ in range(args.modules)]
+    config = DefFormConfig(max_def_length=100, max_inline_args=2)
+
+    manager = time_manager_per_module(sources, config)
+    api = time_api(sources, config, args.batches, args.jobs)
+
+    print(f'modules: {args.modules}, batches: {args.batches}, jobs: {args.jobs}')
+    print(f'DefManager per module: {manager:.2f}s ({manager / args.modules * 1000:.1f} ms/module)')
+    print(f'def_form.api:          {api:.2f}s ({api / args.modules * 1000:.1f} ms/module)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import sysconfig
+import time
+from pathlib import Path
+
+from def_form.core.checker import DefChecker
+from def_form.core.config import DefFormConfig
+from def_form.core.fast_checker import FastDefChecker
+from def_form.core.processing import ProcessorClass
+from def_form.core.processing import process_source
+
+
+def load_sources(root: Path, limit: int | None) -> dict[str, str]:
+    sources: dict[str, str] = {}
+    for path in sorted(root.rglob('*.py')):
+        if limit is not None and len(sources) >= limit:
+            break
+        try:
+            sources[str(path)] = path.read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError):
+            continue
+    return sources
+
+
+def run_backend(
+    sources: dict[str, str],
+    processor_class: ProcessorClass,
+    config: DefFormConfig,
+) -> tuple[float, dict[str, list[str]]]:
+    results: dict[str, list[str]] = {}
+    started = time.perf_counter()
+    for filepath, code in sources.items():
+        try:
+            _, issues = process_source(code, filepath, processor_class, config)
+        except Exception:
+            continue
+        results[filepath] = [f'{type(issue).__name__} {issue.path} {issue.message}' for issue in issues]
+    return time.perf_counter() - started, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare the libcst and fast check backends')
+    parser.add_argument('path', nargs='?', default=sysconfig.get_paths()['stdlib'])
+    parser.add_argument('--limit', type=int, default=300)
+    args = parser.parse_args()
+
+    config = DefFormConfig(max_def_length=100, max_inline_args=2, indent_size=4)
+    sources = load_sources(Path(args.path), args.limit)
+    lines = sum(code.count('\n') for code in sources.values())
+
+    libcst_time, libcst_results = run_backend(sources, DefChecker, config)
+    fast_time, fast_results = run_backend(sources, FastDefChecker, config)
+
+    mismatches = [path for path, issues in libcst_results.items() if fast_results.get(path) != issues]
+
+    print(f'files: {len(sources)}, lines: {lines}')
+    print(f'libcst: {libcst_time:.2f}s ({lines / libcst_time:,.0f} lines/s)')
+    print(f'fast:   {fast_time:.2f}s ({lines / fast_time:,.0f} lines/s)')
+    print(f'speedup: {libcst_time / fast_time:.1f}x')
+    print(f'mismatched files: {len(mismatches)}')
+    for path in mismatches[:10]:
+        print(f'  {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from def_form.cli.context import CLIContext
+from def_form.cli.console.null import NullConsole
+from def_form.cli.ui.null import NullUI
+from def_form.daemon.client import run_remote
+from def_form.daemon.client import stop_daemon
+from def_form.exceptions.base import BaseDefFormException
+
+SOURCE = 'def too_many(a, b, c):\n    pass\n\n\ndef ok(a):\n    pass\n'
+
+
+def time_cold_cli(path: Path, runs: int) -> list[float]:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(
+            [sys.executable, '-m', 'def_form.cli.main', '--quiet', 'check', '--no-cache', str(path)],
+            capture_output=True,
+            check=False,
+        )
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def time_daemon_requests(path: Path, socket_path: Path, runs: int) -> list[float]:
+    ui = NullUI(console=NullConsole(context=CLIContext()))
+    options = {'path': [str(path)], 'config': '/nonexistent'}
+    timings = []
+    for _ in range(runs + 1):
+        started = time.perf_counter()
+        try:
+            run_remote('check', options, ui, socket_path=socket_path, idle_timeout=60)
+        except BaseDefFormException:
+            pass
+        timings.append(time.perf_counter() - started)
+    # The first request starts the daemon.
+    return timings[1:]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare per-call latency of cold CLI runs and daemon requests')
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='dfd-') as tmp:
+        root = Path(tmp)
+        path = root / 'module.py'
+        path.write_text(SOURCE, encoding='utf-8')
+        socket_path = root / 'd.sock'
+
+        cold = time_cold_cli(path, args.runs)
+        try:
+            warm = time_daemon_requests(path, socket_path, args.runs)
+        finally:
+            stop_daemon(socket_path)
+
+    print(f'cold CLI process:  median {statistics.median(cold) * 1e3:.1f} ms')
+    print(f'daemon request:    median {statistics.median(warm) * 1e3:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+import argparse
+import time
+
+from def_form.core.checker import DefChecker
+from def_form.core.config import DefFormConfig
+from def_form.core.processing import process_source
+
+
+def generate_nested(depth: int, statements: int = 20) -> str:
+    lines: list[str] = []
+    for level in range(depth):
+        indent = '    ' * level
+        lines.append(f'{indent}def level_{level}(a, b, c):')
+        lines.extend(f'{indent}    value_{i} = a + b + c + {i}' for i in range(statements))
+    lines.append('    ' * depth + 'return a')
+    return '\n'.join(lines) + '\n'
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure how checking scales with def nesting depth')
+    parser.add_argument('--depths', type=int, nargs='+', default=[10, 20, 40, 80])
+    args = parser.parse_args()
+
+    config = DefFormConfig(max_def_length=100, max_inline_args=2, indent_size=4)
+
+    for depth in args.depths:
+        code = generate_nested(depth)
+        started = time.perf_counter()
+        process_source(code, '<bench>', DefChecker, config)
+        elapsed = time.perf_counter() - started
+        print(f'depth {depth:>3}: {elapsed:.2f}s ({elapsed / depth * 1e3:.1f} ms/def)')
+
+
+if __name__ == '__main__':
+    main()
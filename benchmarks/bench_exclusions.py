@@ -0,0 +1,59 @@
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from def_form.cli.context import CLIContext
+from def_form.cli.console.null import NullConsole
+from def_form.cli.ui.null import NullUI
+from def_form.core.manager import DefManager
+
+
+def build_tree(root: Path, dirs: int, files_per_dir: int, depth: int) -> None:
+    # Empty files are enough: only the walk and the exclusion checks are measured.
+    for i in range(dirs):
+        directory = root.joinpath(*(f'level_{level}' for level in range(depth)), f'pkg_{i}')
+        directory.mkdir(parents=True, exist_ok=True)
+        for j in range(files_per_dir):
+            (directory / f'module_{j}.py').touch()
+    (root / 'build' / 'lib').mkdir(parents=True)
+    (root / 'build' / 'lib' / 'copy.py').touch()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure file discovery with many exclusions')
+    parser.add_argument('--dirs', type=int, default=200)
+    parser.add_argument('--files-per-dir', type=int, default=50)
+    parser.add_argument('--depth', type=int, default=4)
+    parser.add_argument('--exclusions', type=int, default=50)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp).resolve()
+        build_tree(root, args.dirs, args.files_per_dir, args.depth)
+        excluded = ('build', *(f'generated_{i}' for i in range(args.exclusions - 1)))
+        os.chdir(root)
+
+        with patch('def_form.core.manager.find_pyproject_toml', return_value=None):
+            manager = DefManager(
+                path=str(root),
+                ui=NullUI(console=NullConsole(context=CLIContext())),
+                excluded=excluded,
+                cache=False,
+            )
+
+        timings = []
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            files = list(manager._iter_py_files())
+            timings.append(time.perf_counter() - started)
+
+    print(f'files found: {len(files)}, exclusions: {len(excluded)}')
+    print(f'discovery: {min(timings) * 1000:.0f} ms (best of {args.runs})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+import argparse
+import time
+import tracemalloc
+
+from def_form.core.config import DefFormConfig
+from def_form.core.formatter import DefFormatter
+from def_form.core.processing import process_source
+
+
+def generate_module(functions: int) -> str:
+    # Every signature is clean except the one in the middle.
+    lines: list[str] = []
+    for i in range(functions):
+        args = 'a, b, c' if i == functions // 2 else 'a, b'
+        lines.append(f'def function_{i}({args}):')
+        lines.append(f'    return {i}')
+        lines.append('')
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure formatting a large module with a single bad signature')
+    parser.add_argument('--functions', type=int, default=3000)
+    args = parser.parse_args()
+
+    config = DefFormConfig(max_def_length=100, max_inline_args=2, indent_size=4)
+    code = generate_module(args.functions)
+
+    started = time.perf_counter()
+    edits, issues = process_source(code, '<bench>', DefFormatter, config)
+    elapsed = time.perf_counter() - started
+
+    # Measured in a separate run, because tracing allocations slows libcst down severalfold.
+    tracemalloc.start()
+    process_source(code, '<bench>', DefFormatter, config)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f'functions: {args.functions}, lines: {code.count(chr(10))}')
+    print(f'edits: {len(edits)}, issues: {len(issues)}')
+    print(f'time: {elapsed:.2f}s, peak memory: {peak / 1024 / 1024:.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from def_form.cli.context import CLIContext
+from def_form.cli.console.null import NullConsole
+from def_form.cli.ui.null import NullUI
+from def_form.core import DefManager
+from def_form.exceptions.base import BaseDefFormException
+
+from benchmarks.corpus import generate_tree
+
+
+def run_check(path: Path, jobs: int) -> float:
+    manager = DefManager(
+        path=str(path),
+        ui=NullUI(console=NullConsole(context=CLIContext())),
+        config='/nonexistent',
+        max_def_length=100,
+        max_inline_args=2,
+        jobs=jobs,
+        cache=False,
+    )
+    started = time.perf_counter()
+    try:
+        manager.check()
+    except BaseDefFormException:
+        pass
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure --jobs speedup on a synthetic tree')
+    parser.add_argument('--files', type=int, default=400)
+    parser.add_argument('--functions', type=int, default=40)
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        generate_tree(root, files=args.files, functions=args.functions)
+
+        serial = run_check(root, jobs=1)
+        parallel = run_check(root, jobs=args.jobs)
+
+    print(f'files: {args.files}, functions per file: {args.functions}')
+    print(f'jobs=1: {serial:.2f}s')
+    print(f'jobs={args.jobs}: {parallel:.2f}s')
+    print(f'speedup: {serial / parallel:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import time
+import tracemalloc
+from unittest.mock import patch
+
+import libcst as cst
+
+from def_form.core.checker import DefChecker
+from def_form.core.config import DefFormConfig
+from def_form.core.formatter import DefFormatter
+from def_form.core.processing import Processor
+from def_form.core.processing import process_source
+from def_form.core.profiling import FileProfile
+
+MIB = 1024 * 1024
+
+
+def generate_module(lines: int) -> str:
+    # Classes of methods with ordinary bodies; every fourth signature has too many inline args.
+    out: list[str] = []
+    i = 0
+    while len(out) < lines:
+        out.append(f'class Service{i}:')
+        for j in range(10):
+            args = 'self, a, b, c' if j % 4 == 0 else 'self, a'
+            out.append(f'    def method_{j}({args}):')
+            out.append(f'        values = [a * k for k in range({j + 1})]')
+            out.append(f"        mapping = {{'key': values, 'total': sum(values), 'index': {i}}}")
+            out.append('        if mapping["total"] > 10:')
+            out.append('            return mapping')
+            out.append('        return {**mapping, "extra": self.lookup(a, default=None, strict=True)}')
+            out.append('')
+        out.append('')
+        i += 1
+    return '\n'.join(out) + '\n'
+
+
+def peak_memory(code: str, processor: Processor, config: DefFormConfig) -> tuple[int, int]:
+    # Parsing sets the overall peak, so the peak from the parsed tree on is returned too.
+    parse = cst.parse_module
+    parse_peak = 0
+
+    def parse_module(source: str) -> cst.Module:
+        nonlocal parse_peak
+        tree = parse(source)
+        _, parse_peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        return tree
+
+    tracemalloc.start()
+    with patch('libcst.parse_module', parse_module):
+        process_source(code, '<bench>', processor, config)
+    _, after_parse = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return max(parse_peak, after_parse), after_parse
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure time and peak memory per phase on one large module')
+    parser.add_argument('--lines', type=int, default=50_000)
+    args = parser.parse_args()
+
+    config = DefFormConfig(max_def_length=100, max_inline_args=2, indent_size=4)
+    code = generate_module(args.lines)
+    print(f'lines: {code.count(chr(10))}')
+
+    processors: dict[str, Processor] = {'check': DefChecker, 'format': DefFormatter}
+    for name, processor in processors.items():
+        profile = FileProfile()
+        started = time.perf_counter()
+        edits, issues = process_source(code, '<bench>', processor, config, profile=profile)
+        elapsed = time.perf_counter() - started
+
+        # Measured in a separate run, because tracing allocations slows libcst down severalfold.
+        overall, after_parse = peak_memory(code, processor, config)
+
+        phases = ', '.join(f'{phase} {wall:.2f}s' for phase, wall in profile.wall.items())
+        print(
+            f'{name}: {elapsed:.2f}s ({phases}), peak memory {overall / MIB:.0f} MiB '
+            f'({after_parse / MIB:.0f} MiB after parsing), {len(issues)} issues, {len(edits)} edits'
+        )
+
+
+if __name__ == '__main__':
+    main()
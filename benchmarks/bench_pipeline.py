@@ -0,0 +1,80 @@
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from benchmarks.corpus import generate_tree
+from def_form.cli.context import CLIContext
+from def_form.cli.console.null import NullConsole
+from def_form.cli.ui.null import NullUI
+from def_form.core.manager import DefManager
+from def_form.exceptions.base import BaseDefFormException
+
+
+class TimingUI(NullUI):
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.started = time.perf_counter()
+        self.first_result: float | None = None
+        self.finished: float | None = None
+
+    def processing(self, path: Path) -> None:
+        if self.first_result is None:
+            self.first_result = time.perf_counter() - self.started
+
+    def finish(self, processed: int, issues: list[BaseDefFormException], **stats: Any) -> None:
+        self.finished = time.perf_counter() - self.started
+
+
+def slow_scandir(latency: float) -> Any:
+    # Emulates a network filesystem, where every directory listing costs a round trip.
+    real_scandir = os.scandir
+
+    def scandir(path: Any = '.') -> Any:
+        time.sleep(latency)
+        return real_scandir(path)
+
+    return scandir
+
+
+def run(root: Path, jobs: int, latency: float) -> tuple[float, float]:
+    ui = TimingUI(console=NullConsole(context=CLIContext()))
+    with patch('def_form.core.manager.find_pyproject_toml', return_value=None):
+        manager = DefManager(path=str(root), ui=ui, config=None, jobs=jobs, cache=False)
+
+    ui.started = time.perf_counter()
+    with patch('os.scandir', slow_scandir(latency)):
+        try:
+            manager.check()
+        except BaseDefFormException:
+            pass
+
+    assert ui.first_result is not None
+    assert ui.finished is not None
+    return ui.first_result, ui.finished
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure time to first result against total run time')
+    parser.add_argument('--files', type=int, default=2000)
+    parser.add_argument('--files-per-dir', type=int, default=10)
+    parser.add_argument('--jobs', type=int, default=1)
+    parser.add_argument('--walk-latency-ms', type=float, default=0.0)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        generate_tree(root, args.files, functions=10, files_per_dir=args.files_per_dir)
+        timings = [run(root, args.jobs, args.walk_latency_ms / 1000) for _ in range(args.runs)]
+
+    first_result, total = min(timings, key=lambda timing: timing[1])
+    print(f'files: {args.files}, jobs: {args.jobs}, walk latency: {args.walk_latency_ms:g} ms per directory')
+    print(f'first result: {first_result * 1000:.0f} ms, total: {total * 1000:.0f} ms (best of {args.runs})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+import argparse
+import time
+
+from def_form.core.checker import DefChecker
+from def_form.core.config import DefFormConfig
+from def_form.core.processing import process_source
+
+
+def generate_class(methods: int, skip_every: int = 10) -> str:
+    lines = ['class Client:']
+    for i in range(methods):
+        if i % skip_every == 0:
+            lines.append('    # def-form: skip')
+        lines.append(f'    def method_{i}(self, a, b, c):')
+        lines.append('        return a')
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure how checking scales with the number of methods in one file')
+    parser.add_argument('--methods', type=int, nargs='+', default=[1000, 2500, 5000])
+    args = parser.parse_args()
+
+    config = DefFormConfig(max_def_length=100, max_inline_args=2, indent_size=4)
+
+    for methods in args.methods:
+        code = generate_class(methods)
+        started = time.perf_counter()
+        _, issues = process_source(code, '<bench>', DefChecker, config)
+        elapsed = time.perf_counter() - started
+        print(f'{methods:>6} methods: {elapsed:.2f}s ({elapsed / methods * 1e6:.0f} us/method, {len(issues)} issues)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+import argparse
+import random
+import time
+
+import libcst as cst
+from libcst import CSTNode
+from libcst import CSTVisitor
+
+from def_form.core.base import DefVisitor
+from def_form.core.checker import DefChecker
+
+from benchmarks.corpus import generate_module
+
+
+class FullCounter(CSTVisitor):
+    def __init__(self) -> None:
+        super().__init__()
+        self.visited = 0
+
+    def on_visit(self, node: CSTNode) -> bool:
+        self.visited += 1
+        return super().on_visit(node)
+
+
+class PrunedCounter(DefVisitor):
+    def __init__(self) -> None:
+        super().__init__()
+        self.visited = 0
+
+    def on_visit(self, node: CSTNode) -> bool:
+        self.visited += 1
+        return super().on_visit(node)
+
+
+class UnprunedChecker(DefChecker):
+    def on_visit(self, node: CSTNode) -> bool:
+        return CSTVisitor.on_visit(self, node)
+
+
+def generate_table(rows: int) -> str:
+    lines = ['def lookup(table, key, default):', '    return table.get(key, default)', '', '', 'TABLE = [']
+    lines.extend(
+        f"    {{'id': {i}, 'name': 'row_{i}', 'scale': {i} * 1.5, 'tags': ('a', 'b', {i} % 7), 'ok': {i} > 3}},"
+        for i in range(rows)
+    )
+    lines.append(']')
+    return '\n'.join(lines) + '\n'
+
+
+def generate_protobuf(messages: int, fields: int = 8) -> str:
+    # Shaped like protoc's _pb2 output: descriptors built from long keyword calls.
+    lines = ['from google.protobuf import descriptor as _descriptor', '']
+    for m in range(messages):
+        lines.append(f'_MESSAGE_{m} = _descriptor.Descriptor(')
+        lines.append(f"    name='Message{m}', full_name='pkg.Message{m}', filename=None, containing_type=None,")
+        lines.append('    fields=[')
+        lines.extend(
+            f"        _descriptor.FieldDescriptor(name='field_{f}', full_name='pkg.Message{m}.field_{f}', "
+            f'index={f}, number={f + 1}, type=9, cpp_type=9, label=1, has_default_value=False, '
+            f"default_value=b''.decode('utf-8'), message_type=None, enum_type=None, options=None),"
+            for f in range(fields)
+        )
+        lines.append('    ],')
+        lines.append(f'    serialized_start={m * 100}, serialized_end={m * 100 + 99},')
+        lines.append(')')
+    lines.extend(['', '', 'class Message0:', '    def __init__(self, field_0, field_1, field_2):', '        pass'])
+    return '\n'.join(lines) + '\n'
+
+
+def _checker(checker_class: type[DefChecker]) -> DefChecker:
+    return checker_class(filepath='<bench>', max_def_length=100, max_inline_args=2, indent_size=4)
+
+
+def _visit_time(checker: DefChecker, wrapper: cst.metadata.MetadataWrapper, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        wrapper.visit(checker)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Count the CST nodes the checker visits with and without pruning')
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--messages', type=int, default=100)
+    parser.add_argument('--functions', type=int, default=300)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    corpora = {
+        'data table': generate_table(args.rows),
+        'protobuf': generate_protobuf(args.messages),
+        'functions': generate_module(random.Random(0), args.functions, args_per_def=4, nesting_depth=1),
+    }
+
+    for name, code in corpora.items():
+        wrapper = cst.metadata.MetadataWrapper(cst.parse_module(code))
+        # Positions are resolved once up front so only the traversal is timed.
+        wrapper.resolve(cst.metadata.PositionProvider)
+
+        full, pruned = FullCounter(), PrunedCounter()
+        wrapper.module.visit(full)
+        wrapper.module.visit(pruned)
+        before = _visit_time(_checker(UnprunedChecker), wrapper, args.repeat)
+        after = _visit_time(_checker(DefChecker), wrapper, args.repeat)
+        print(
+            f'{name:>10}: {full.visited:>7} -> {pruned.visited:>6} nodes visited, '
+            f'visit {before * 1e3:.1f} ms -> {after * 1e3:.1f} ms'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+import random
+import shutil
+import sysconfig
+from pathlib import Path
+
+SKIP_COMMENT = '# def-form: skip'
+STDLIB_EXCLUDED = frozenset({'site-packages', 'dist-packages', '__pycache__'})
+
+
+def generate_def(  # noqa: PLR0913
+    rng: random.Random,
+    name: str,
+    indent: str,
+    args_per_def: int,
+    nesting_depth: int,
+    decorator_density: float,
+    comment_density: float,
+    skip_frequency: float,
+) -> list[str]:
+    lines: list[str] = []
+    if rng.random() < comment_density:
+        lines.append(f'{indent}# {name} is generated')
+    if rng.random() < skip_frequency:
+        lines.append(f'{indent}{SKIP_COMMENT}')
+    if rng.random() < decorator_density:
+        lines.append(f'{indent}@decorator_{rng.randint(0, 9)}')
+
+    arg_count = rng.randint(0, args_per_def)
+    args = ', '.join(f'arg_{j}: int = {j}' for j in range(arg_count))
+    lines.append(f'{indent}def {name}({args}) -> int:')
+
+    body = indent + '    '
+    if nesting_depth:
+        lines.extend(
+            generate_def(
+                rng,
+                f'{name}_inner',
+                body,
+                args_per_def,
+                nesting_depth - 1,
+                decorator_density,
+                comment_density,
+                skip_frequency,
+            )
+        )
+    if rng.random() < comment_density:
+        lines.append(f'{body}# the value does not matter')
+    lines.append(f'{body}return {arg_count}')
+    return lines
+
+
+def generate_module(  # noqa: PLR0913
+    rng: random.Random,
+    functions: int,
+    args_per_def: int,
+    nesting_depth: int = 0,
+    decorator_density: float = 0.0,
+    comment_density: float = 0.0,
+    skip_frequency: float = 0.0,
+) -> str:
+    lines: list[str] = []
+    for i in range(functions):
+        lines.extend(
+            generate_def(
+                rng,
+                f'function_{i}',
+                '',
+                args_per_def,
+                nesting_depth,
+                decorator_density,
+                comment_density,
+                skip_frequency,
+            )
+        )
+        lines.append('')
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def generate_tree(  # noqa: PLR0913
+    root: Path,
+    files: int,
+    functions: int = 20,
+    args_per_def: int = 4,
+    files_per_dir: int = 50,
+    seed: int = 0,
+    nesting_depth: int = 0,
+    decorator_density: float = 0.0,
+    comment_density: float = 0.0,
+    skip_frequency: float = 0.0,
+) -> list[Path]:
+    rng = random.Random(seed)
+    paths: list[Path] = []
+    for i in range(files):
+        directory = root / f'pkg_{i // files_per_dir}'
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f'module_{i}.py'
+        code = generate_module(
+            rng,
+            functions,
+            args_per_def,
+            nesting_depth,
+            decorator_density,
+            comment_density,
+            skip_frequency,
+        )
+        path.write_text(code, encoding='utf-8')
+        paths.append(path)
+    return paths
+
+
+def copy_stdlib(root: Path, limit: int | None = None) -> list[Path]:
+    # Real-world code without network access: the .py files of the running interpreter's stdlib.
+    stdlib = Path(sysconfig.get_paths()['stdlib'])
+    paths: list[Path] = []
+    for source in sorted(stdlib.rglob('*.py')):
+        relative = source.relative_to(stdlib)
+        if not STDLIB_EXCLUDED.isdisjoint(relative.parts):
+            continue
+        if limit is not None and len(paths) >= limit:
+            break
+
+        target = root / relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(source, target)
+        paths.append(target)
+    return paths
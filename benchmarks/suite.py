@@ -0,0 +1,249 @@
+import argparse
+import ast
+import json
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from def_form.cli.context import CLIContext
+from def_form.cli.console.null import NullConsole
+from def_form.cli.ui.null import NullUI
+from def_form.core.manager import DefManager
+from def_form.core.models import FileResult
+from def_form.core.processing import process_text
+from def_form.core.processing import read_source
+from def_form.exceptions.base import BaseDefFormException
+
+from benchmarks.corpus import copy_stdlib
+from benchmarks.corpus import generate_tree
+
+COMMANDS = ('check', 'format')
+STDLIB = 'stdlib'
+CUSTOM = 'custom'
+CORPORA: dict[str, dict[str, Any]] = {
+    'flat': {'files': 100, 'functions': 20, 'args_per_def': 4},
+    'wide-args': {'files': 50, 'functions': 20, 'args_per_def': 12},
+    'nested': {'files': 50, 'functions': 10, 'nesting_depth': 3},
+    'commented': {
+        'files': 100,
+        'functions': 20,
+        'decorator_density': 0.5,
+        'comment_density': 0.5,
+        'skip_frequency': 0.1,
+    },
+}
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_STDLIB_LIMIT = 200
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def build_corpus(root: Path, name: str, args: argparse.Namespace) -> list[Path]:
+    if name == STDLIB:
+        return copy_stdlib(root, limit=args.stdlib_limit or None)
+
+    if name == CUSTOM:
+        return generate_tree(
+            root,
+            files=args.files,
+            functions=args.functions,
+            args_per_def=args.args_per_def,
+            nesting_depth=args.nesting_depth,
+            decorator_density=args.decorator_density,
+            comment_density=args.comment_density,
+            skip_frequency=args.skip_frequency,
+        )
+
+    return generate_tree(root, **CORPORA[name])
+
+
+def count_defs(paths: list[Path]) -> int:
+    count = 0
+    for path in paths:
+        try:
+            tree = ast.parse(path.read_bytes())
+        except (SyntaxError, ValueError):
+            continue
+        count += sum(isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef) for node in ast.walk(tree))
+    return count
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def create_manager(path: Path, jobs: int) -> DefManager:
+    return DefManager(
+        path=str(path),
+        ui=NullUI(console=NullConsole(context=CLIContext())),
+        config='/nonexistent',
+        max_def_length=100,
+        max_inline_args=2,
+        jobs=jobs,
+        cache=False,
+    )
+
+
+def time_phases(path: Path, command: str) -> dict[str, float]:
+    # The stages DefManager chains together, timed one after another on the same files.
+    manager = create_manager(path, jobs=1)
+    processor = manager.checker_class if command == 'check' else manager.formatter_class
+    phases: dict[str, float] = {}
+
+    started = time.perf_counter()
+    files = list(manager._iter_py_files())
+    phases['discover'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    sources = [(file, read_source(file)) for file in files]
+    phases['read'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    results = [
+        FileResult(path=file) if code is None else process_text(code, file, processor, manager.settings)
+        for file, code in sources
+    ]
+    phases['process'] = time.perf_counter() - started
+
+    if command == 'format':
+        started = time.perf_counter()
+        for result in results:
+            manager._write_result(result)
+        phases['write'] = time.perf_counter() - started
+
+    return phases
+
+
+def time_run(path: Path, command: str, jobs: int) -> float:
+    manager = create_manager(path, jobs)
+    started = time.perf_counter()
+    try:
+        getattr(manager, command)()
+    except BaseDefFormException:
+        pass
+    return time.perf_counter() - started
+
+
+def run_worker(corpus: Path, command: str, runs: int, jobs: int) -> dict[str, Any]:
+    # Every run gets a fresh copy, so format always starts from the same unformatted files.
+    totals: list[float] = []
+    phases: dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for run in range(runs):
+            for measure in ('total', 'phases'):
+                work = Path(tmp) / f'{measure}_{run}'
+                shutil.copytree(corpus, work)
+                if measure == 'total':
+                    totals.append(time_run(work, command, jobs))
+                else:
+                    for phase, seconds in time_phases(work, command).items():
+                        phases[phase] = min(seconds, phases.get(phase, seconds))
+                shutil.rmtree(work)
+
+    return {'seconds': min(totals), 'phases': phases, 'peak_rss_mb': round(peak_rss_mb(), 1)}
+
+
+def run_case(corpus: Path, command: str, args: argparse.Namespace) -> dict[str, Any]:
+    # A fresh interpreter per case keeps peak RSS and import state from leaking between cases.
+    worker = [sys.executable, '-m', 'benchmarks.suite', '--worker', str(corpus), command]
+    options = ['--runs', str(args.runs), '--jobs', str(args.jobs)]
+    completed = subprocess.run([*worker, *options], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    result: dict[str, Any] = json.loads(completed.stdout)
+    return result
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    previous = {(case['corpus'], case['command']): case for case in baseline['cases']}
+    regressions = []
+    for case in results['cases']:
+        before = previous.get((case['corpus'], case['command']))
+        if before is None:
+            continue
+        slowdown = before['files_per_s'] / case['files_per_s'] - 1
+        if slowdown > threshold:
+            regressions.append(
+                f'{case["corpus"]} {case["command"]}: {case["files_per_s"]:.0f} files/s, '
+                f'{slowdown:.0%} more time per file than the baseline ({before["files_per_s"]:.0f} files/s)'
+            )
+    return regressions
+
+
+def print_case(case: dict[str, Any]) -> None:
+    phases = ', '.join(f'{phase} {seconds * 1000:.0f} ms' for phase, seconds in case['phases'].items())
+    print(
+        f'{case["corpus"]:>10} {case["command"]:<6} {case["files"]:>5} files {case["files_per_s"]:>8.0f} files/s '
+        f'{case["defs_per_s"]:>9.0f} defs/s {case["peak_rss_mb"]:>6.1f} MB  ({phases})'
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure check and format throughput on generated and stdlib corpora')
+    parser.add_argument('--corpus', nargs='+', choices=[*CORPORA, STDLIB, CUSTOM], default=[*CORPORA, STDLIB])
+    parser.add_argument('--command', nargs='+', choices=COMMANDS, default=list(COMMANDS))
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--jobs', type=int, default=1)
+    parser.add_argument('--stdlib-limit', type=int, default=DEFAULT_STDLIB_LIMIT, help='0 copies every file')
+    parser.add_argument('--output', type=Path, default=None, help='Write the results as JSON')
+    parser.add_argument('--baseline', type=Path, default=None, help='Compare against earlier --output results')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='Allowed slowdown, e.g. 0.1')
+    # Generator parameters for --corpus custom.
+    parser.add_argument('--files', type=int, default=100)
+    parser.add_argument('--functions', type=int, default=20)
+    parser.add_argument('--args-per-def', type=int, default=4)
+    parser.add_argument('--nesting-depth', type=int, default=0)
+    parser.add_argument('--decorator-density', type=float, default=0.0)
+    parser.add_argument('--comment-density', type=float, default=0.0)
+    parser.add_argument('--skip-frequency', type=float, default=0.0)
+    parser.add_argument('--worker', nargs=2, metavar=('CORPUS', 'COMMAND'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        corpus, command = args.worker
+        print(json.dumps(run_worker(Path(corpus), command, args.runs, args.jobs)))
+        return
+
+    results: dict[str, Any] = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'jobs': args.jobs,
+        'cases': [],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in args.corpus:
+            corpus = Path(tmp) / name
+            paths = build_corpus(corpus, name, args)
+            defs = count_defs(paths)
+            for command in args.command:
+                measured = run_case(corpus, command, args)
+                case = {
+                    'corpus': name,
+                    'command': command,
+                    'files': len(paths),
+                    'defs': defs,
+                    'files_per_s': len(paths) / measured['seconds'],
+                    'defs_per_s': defs / measured['seconds'],
+                    **measured,
+                }
+                results['cases'].append(case)
+                print_case(case)
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=2) + '\n', encoding='utf-8')
+
+    if args.baseline is not None:
+        regressions = compare(results, json.loads(args.baseline.read_text(encoding='utf-8')), args.threshold)
+        for regression in regressions:
+            print(f'regression: {regression}')
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
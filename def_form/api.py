@@ -0,0 +1,94 @@
+from collections.abc import Iterable
+from collections.abc import Iterator
+from concurrent.futures import Executor
+from itertools import repeat
+from pathlib import Path
+from typing import Any
+
+import tomli
+
+from def_form.core.config import DefFormConfig
+from def_form.core.fast_checker import FAST_BACKEND
+from def_form.core.fast_checker import resolve_backend
+from def_form.core.models import FileResult
+from def_form.core.models import Issue
+from def_form.core.processing import CHECKER
+from def_form.core.processing import FAST_CHECKER
+from def_form.core.processing import FORMATTER
+from def_form.core.processing import Processor
+from def_form.core.processing import process_text
+from def_form.core.rules import resolve_rule_names
+
+DEFAULT_FILENAME = '<string>'
+DEFAULT_CONFIG = DefFormConfig()
+
+__all__ = [
+    'DefFormConfig',
+    'DefFormError',
+    'Issue',
+    'check_source',
+    'format_source',
+    'format_sources',
+    'load_config',
+]
+
+
+class DefFormError(Exception):
+    pass
+
+
+def load_config(pyproject: str | Path) -> DefFormConfig:
+    # The only function here that reads a file: resolve the config once, then reuse it.
+    with Path(pyproject).open('rb') as f:
+        config_def: dict[str, Any] = tomli.load(f).get('tool', {}).get('def-form', {})
+
+    select = config_def.get('select')
+    return DefFormConfig(
+        max_def_length=config_def.get('max_def_length'),
+        max_inline_args=config_def.get('max_inline_args'),
+        indent_size=config_def.get('indent_size'),
+        select=resolve_rule_names(select, 'select') if select is not None else None,
+        ignore=resolve_rule_names(config_def.get('ignore', ()), 'ignore'),
+    )
+
+
+def check_source(
+    code: str,
+    config: DefFormConfig = DEFAULT_CONFIG,
+    filename: str = DEFAULT_FILENAME,
+    backend: str | None = None,
+) -> list[Issue]:
+    checker = FAST_CHECKER if resolve_backend(backend) == FAST_BACKEND else CHECKER
+    return list(_process(code, filename, checker, config).issues)
+
+
+def format_source(
+    code: str,
+    config: DefFormConfig = DEFAULT_CONFIG,
+    filename: str = DEFAULT_FILENAME,
+) -> str:
+    result = _process(code, filename, FORMATTER, config)
+    return code if result.code is None else result.code
+
+
+def format_sources(
+    sources: Iterable[str],
+    config: DefFormConfig = DEFAULT_CONFIG,
+    executor: Executor | None = None,
+    chunksize: int = 1,
+) -> Iterator[str]:
+    # Results come back in input order; pass a long-lived executor to reuse its workers across batches.
+    if executor is None:
+        for code in sources:
+            yield format_source(code, config)
+        return
+
+    yield from executor.map(format_source, sources, repeat(config), chunksize=chunksize)
+
+
+def _process(code: str, filename: str, processor_class: Processor, config: DefFormConfig) -> FileResult:
+    # Unlike a run over files, a caller handing over one string should hear why it was not processed.
+    try:
+        return process_text(code, Path(filename), processor_class, config, strict=True)
+    except Exception as exc:
+        raise DefFormError(f'Cannot process {filename}: {exc}') from exc
@@ -1,39 +1,94 @@
+from typing import Any
+from typing import TextIO
+
 import click
 
+from def_form.cli.commands.options import backend_option
+from def_form.cli.commands.options import check_local_only
+from def_form.cli.commands.options import collect_paths
 from def_form.cli.commands.options import common_options
-from def_form.cli.console import RichConsole
+from def_form.cli.commands.options import describe_paths
+from def_form.cli.commands.stdin import is_stdin
+from def_form.cli.commands.stdin import run_stdin
 from def_form.cli.context import context
 from def_form.cli.errors import CheckFailedError
-from def_form.cli.ui.rich import RichUI
+from def_form.cli.ui.reporters import DEFAULT_OUTPUT_FORMAT
+from def_form.cli.ui.reporters import create_ui
 from def_form.exceptions.base import BaseDefFormException
 from def_form.core import DefManager
+from def_form.core.events import JsonLinesSink
+from def_form.daemon.client import run_remote
 
 
 @click.command()
 @common_options
+@backend_option
 def check(  # noqa: PLR0913
-    path: str,
+    paths: tuple[str, ...],
     max_def_length: int | None,
     max_inline_args: int | None,
     indent_size: int | None,
     config: str | None,
     exclude: tuple[str, ...],
     show_skipped: bool,
+    files_from: TextIO | None,
+    stdin_filename: str | None,
+    changed_since: str | None,
+    staged: bool,
+    jobs: str | None,
+    no_cache: bool,
+    cache_dir: str | None,
+    daemon: bool,
+    profile: bool,
+    profile_top: int,
+    profile_output: str | None,
+    events: TextIO | None,
+    output_format: str,
+    backend: str | None,
 ) -> None:
-    console = RichConsole(context=context)
-    console.info(f'Checking [bold]{path}[/bold]')
+    paths = collect_paths(paths, files_from)
+
+    options: dict[str, Any] = {
+        'path': paths,
+        'excluded': exclude,
+        'max_def_length': max_def_length,
+        'max_inline_args': max_inline_args,
+        'indent_size': indent_size,
+        'config': config,
+        'show_skipped': show_skipped,
+        'changed_since': changed_since,
+        'staged': staged,
+        'jobs': jobs,
+        'cache': not no_cache,
+        'cache_dir': cache_dir,
+        'profile': profile or profile_output is not None,
+        'profile_top': profile_top,
+        'profile_output': profile_output,
+        'backend': backend,
+    }
+
+    stdin = is_stdin(paths, stdin_filename)
+    check_local_only({'--profile': options['profile'], '--events': events is not None}, daemon, stdin)
+
+    if stdin and output_format != DEFAULT_OUTPUT_FORMAT:
+        raise click.UsageError('--output-format cannot be combined with reading from stdin')
+
+    if stdin:
+        run_stdin('check', options, stdin_filename)
+        return
+
+    ui = create_ui(output_format, context)
+    console = ui.console
+    console.info(f'Checking [bold]{describe_paths(paths)}[/bold]')
 
     try:
-        DefManager(
-            path=path,
-            excluded=exclude,
-            max_def_length=max_def_length,
-            max_inline_args=max_inline_args,
-            indent_size=indent_size,
-            config=config,
-            show_skipped=show_skipped,
-            ui=RichUI(console=console),
-        ).check()
+        if daemon:
+            run_remote('check', options, ui)
+        else:
+            manager = DefManager(**options, ui=ui)
+            if events is not None:
+                manager.events.subscribe(JsonLinesSink(events))
+            manager.check()
     except BaseDefFormException as exc:
         raise CheckFailedError('Code style violations found') from exc
     except Exception as exc:
@@ -0,0 +1,46 @@
+from pathlib import Path
+
+import click
+
+from def_form.cli.console import RichConsole
+from def_form.cli.context import context
+from def_form.cli.errors import CLIError
+from def_form.daemon.client import stop_daemon
+from def_form.daemon.protocol import DEFAULT_IDLE_TIMEOUT
+from def_form.daemon.protocol import default_socket_path
+
+
+@click.command()
+@click.option(
+    '--socket',
+    'socket_path',
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help='Unix socket to listen on (default: def-form.sock in the user runtime directory)',
+)
+@click.option(
+    '--idle-timeout',
+    type=float,
+    default=DEFAULT_IDLE_TIMEOUT,
+    show_default=True,
+    help='Exit after this many seconds without requests',
+)
+@click.option('--stop', is_flag=True, default=False, help='Stop a running daemon')
+def daemon(socket_path: Path | None, idle_timeout: float, stop: bool) -> None:
+    console = RichConsole(context=context)
+    socket_path = socket_path or default_socket_path()
+
+    if stop:
+        if stop_daemon(socket_path):
+            console.success('Daemon stopped')
+        else:
+            console.info(f'No daemon is listening on [bold]{socket_path}[/bold]')
+        return
+
+    from def_form.daemon.server import serve  # noqa: PLC0415
+
+    console.info(f'Listening on [bold]{socket_path}[/bold]')
+    try:
+        serve(socket_path, idle_timeout)
+    except OSError as exc:
+        raise CLIError(str(exc)) from exc
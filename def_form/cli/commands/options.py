@@ -1,10 +1,47 @@
 from collections.abc import Callable
+from typing import TextIO
 
 import click
 
+from def_form.cli.ui.reporters import DEFAULT_OUTPUT_FORMAT
+from def_form.cli.ui.reporters import OUTPUT_FORMATS
+from def_form.core.fast_checker import BACKENDS
+from def_form.core.profiling import DEFAULT_TOP
+
 
 def path_option(func: Callable) -> Callable:
-    return click.argument('path', type=click.Path(exists=True), default='.')(func)
+    return click.argument('paths', nargs=-1, type=click.Path(exists=True, allow_dash=True))(func)
+
+
+def stdin_filename_option(func: Callable) -> Callable:
+    return click.option(
+        '--stdin-filename',
+        type=click.Path(dir_okay=False),
+        default=None,
+        help='Path of the file read from stdin with "-", used for exclusions, config discovery and issues',
+    )(func)
+
+
+def files_from_option(func: Callable) -> Callable:
+    return click.option(
+        '--files-from',
+        type=click.File('r', encoding='utf-8'),
+        default=None,
+        help='Read paths to process from FILE ("-" for stdin), one per line or NUL-separated',
+    )(func)
+
+
+def collect_paths(paths: tuple[str, ...], files_from: TextIO | None) -> tuple[str, ...]:
+    if files_from is None:
+        return paths or ('.',)
+
+    text = files_from.read()
+    listed = text.split('\0') if '\0' in text else text.splitlines()
+    return (*paths, *(p for p in listed if p))
+
+
+def describe_paths(paths: tuple[str, ...]) -> str:
+    return paths[0] if len(paths) == 1 else f'{len(paths)} paths'
 
 
 def max_def_length_option(func: Callable) -> Callable:
@@ -36,6 +73,119 @@ def show_skipped_option(func: Callable) -> Callable:
     return click.option('--show-skipped', is_flag=True, default=False, help='Show skipped files and directories')(func)
 
 
+def jobs_option(func: Callable) -> Callable:
+    return click.option(
+        '--jobs',
+        '-j',
+        type=str,
+        default=None,
+        help='Number of worker processes, or "auto" to use all CPUs (default: 1)',
+    )(func)
+
+
+def no_cache_option(func: Callable) -> Callable:
+    return click.option('--no-cache', is_flag=True, default=False, help='Do not read or write the result cache')(func)
+
+
+def cache_dir_option(func: Callable) -> Callable:
+    return click.option(
+        '--cache-dir',
+        type=click.Path(file_okay=False),
+        default=None,
+        help='Directory for the result cache (default: .def_form_cache next to pyproject.toml)',
+    )(func)
+
+
+def changed_since_option(func: Callable) -> Callable:
+    return click.option(
+        '--changed-since',
+        metavar='REF',
+        default=None,
+        help='Only process files changed since a git ref, including untracked files',
+    )(func)
+
+
+def staged_option(func: Callable) -> Callable:
+    return click.option('--staged', is_flag=True, default=False, help='Only process files staged in git')(func)
+
+
+def daemon_option(func: Callable) -> Callable:
+    return click.option(
+        '--daemon',
+        is_flag=True,
+        default=False,
+        envvar='DEF_FORM_DAEMON',
+        help='Run in a background daemon that keeps the interpreter warm (started on demand)',
+    )(func)
+
+
+def backend_option(func: Callable) -> Callable:
+    return click.option(
+        '--backend',
+        type=click.Choice(BACKENDS),
+        default=None,
+        help='Check backend: "libcst" or the faster ast/tokenize based "fast" (default: libcst)',
+    )(func)
+
+
+def profile_option(func: Callable) -> Callable:
+    return click.option(
+        '--profile',
+        is_flag=True,
+        default=False,
+        help='Report time per phase and the slowest files',
+    )(func)
+
+
+def profile_top_option(func: Callable) -> Callable:
+    return click.option(
+        '--profile-top',
+        type=int,
+        default=DEFAULT_TOP,
+        help=f'Number of slowest files to list with --profile (default: {DEFAULT_TOP})',
+    )(func)
+
+
+def profile_output_option(func: Callable) -> Callable:
+    return click.option(
+        '--profile-output',
+        type=click.Path(dir_okay=False),
+        default=None,
+        help='Also write a Chrome trace (*.json, all workers) or a pstats file (this process only); implies --profile',
+    )(func)
+
+
+def events_option(func: Callable) -> Callable:
+    return click.option(
+        '--events',
+        type=click.File('w', encoding='utf-8', lazy=True),
+        metavar='FILE',
+        default=None,
+        help='Write file_discovered, file_started, file_finished, issue_found, cache_hit and write_performed '
+        'events to FILE as JSON lines',
+    )(func)
+
+
+def output_format_option(func: Callable) -> Callable:
+    return click.option(
+        '--output-format',
+        type=click.Choice(list(OUTPUT_FORMATS)),
+        metavar='FORMAT',
+        default=DEFAULT_OUTPUT_FORMAT,
+        help='How to report issues: rich, or jsonl, sarif, github or plain written to stdout as each file is done '
+        '(default: rich)',
+    )(func)
+
+
+def check_local_only(enabled: dict[str, bool], daemon: bool, stdin: bool) -> None:
+    # Options that observe a run over files in this process.
+    for option, is_enabled in enabled.items():
+        if is_enabled and daemon:
+            raise click.UsageError(f'{option} cannot be combined with --daemon')
+        if is_enabled and stdin:
+            raise click.UsageError(f'{option} cannot be combined with reading from stdin')
+
+
 def common_options(func: Callable) -> Callable:
     func = path_option(func)
     func = max_def_length_option(func)
@@ -43,4 +193,17 @@ def common_options(func: Callable) -> Callable:
     func = indent_size_option(func)
     func = exclude_option(func)
     func = show_skipped_option(func)
+    func = files_from_option(func)
+    func = stdin_filename_option(func)
+    func = changed_since_option(func)
+    func = staged_option(func)
+    func = jobs_option(func)
+    func = no_cache_option(func)
+    func = cache_dir_option(func)
+    func = daemon_option(func)
+    func = profile_option(func)
+    func = profile_top_option(func)
+    func = profile_output_option(func)
+    func = events_option(func)
+    func = output_format_option(func)
     return config_option(func)
@@ -0,0 +1,62 @@
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+import click
+
+from def_form.cli.console import NullConsole
+from def_form.cli.context import context
+from def_form.cli.errors import CheckFailedError
+from def_form.cli.errors import CLIError
+from def_form.cli.ui import NullUI
+from def_form.core import DefManager
+from def_form.utils.find_pyproject import find_pyproject_toml
+
+STDIN_PATH = '-'
+STDIN_DISPLAY_NAME = '<stdin>'
+
+
+def is_stdin(paths: tuple[str, ...], stdin_filename: str | None) -> bool:
+    if STDIN_PATH not in paths:
+        if stdin_filename is not None:
+            raise click.UsageError(f'--stdin-filename requires "{STDIN_PATH}" as the path')
+        return False
+
+    if paths != (STDIN_PATH,):
+        raise click.UsageError(f'"{STDIN_PATH}" cannot be combined with other paths')
+
+    return True
+
+
+def run_stdin(command: str, options: dict[str, Any], stdin_filename: str | None) -> None:
+    # stdout carries only the source and stderr only JSON lines, one issue per line,
+    # so the whole run stays in memory and is safe to use from editors and pipelines.
+    # Errors go to stderr as well, and the cache is skipped because it writes files.
+    context.report_to_stdout = True
+    filepath = Path(stdin_filename).resolve() if stdin_filename else Path(STDIN_DISPLAY_NAME)
+    if stdin_filename and options.get('config') is None:
+        options['config'] = find_pyproject_toml(filepath.parent)
+
+    try:
+        code = sys.stdin.buffer.read().decode('utf-8')
+    except UnicodeDecodeError as exc:
+        raise CLIError(f'stdin is not valid UTF-8: {exc}') from exc
+
+    manager = DefManager(
+        **{**options, 'path': str(filepath), 'cache': False},
+        ui=NullUI(console=NullConsole(context=context)),
+    )
+
+    if command == 'format':
+        result = manager.format_source(code, filepath)
+        sys.stdout.buffer.write((code if result.code is None else result.code).encode('utf-8'))
+    else:
+        result = manager.check_source(code, filepath)
+
+    for issue in result.issues:
+        click.echo(json.dumps(asdict(issue)), err=True)
+
+    if command == 'check' and result.issues:
+        raise CheckFailedError('Code style violations found')
@@ -1,9 +1,11 @@
 from def_form.cli.console.base import BaseConsole
 from def_form.cli.console.rich import RichConsole
 from def_form.cli.console.null import NullConsole
+from def_form.cli.console.plain import PlainConsole
 
 __all__ = [
     'BaseConsole',
     'NullConsole',
+    'PlainConsole',
     'RichConsole',
 ]
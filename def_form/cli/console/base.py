@@ -1,14 +1,28 @@
+from functools import cached_property
+from typing import TYPE_CHECKING
 from typing import Any
 
-from rich.console import Console
-
 from def_form.cli.context import CLIContext
 
+if TYPE_CHECKING:
+    from rich.console import Console
+
 
-class BaseConsole(Console):
+class BaseConsole:
     def __init__(self, context: CLIContext, *args: Any, **kwargs: Any) -> None:
         self.context = context
-        super().__init__(*args, **kwargs)
+        self._console_args = args
+        self._console_kwargs = kwargs
+
+    @cached_property
+    def rich_console(self) -> 'Console':
+        # rich is the most expensive import of the CLI, so it waits for the first output.
+        from rich.console import Console  # noqa: PLC0415
+
+        return Console(*self._console_args, **self._console_kwargs)
+
+    def print(self, *objects: Any, **kwargs: Any) -> None:
+        self.rich_console.print(*objects, **kwargs)
 
     def info(self, message: str) -> None:
         raise NotImplementedError
@@ -0,0 +1,27 @@
+from typing import Any
+
+import click
+
+from def_form.cli.console.base import BaseConsole
+
+
+class PlainConsole(BaseConsole):
+    # Messages go to stderr without markup, so stdout carries only the report and rich is never loaded.
+    def print(self, *objects: Any, **kwargs: Any) -> None:
+        click.echo(' '.join(str(obj) for obj in objects), err=True)
+
+    def info(self, message: str) -> None:
+        return
+
+    def success(self, message: str) -> None:
+        return
+
+    def warning(self, message: str) -> None:
+        self.print(message)
+
+    def error(self, message: str) -> None:
+        self.print(message)
+
+    def debug(self, message: str) -> None:
+        if self.context.verbose:
+            self.print(message)
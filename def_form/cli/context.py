@@ -7,6 +7,8 @@ class CLIContext:
     quiet: bool = False
     show_skipped: bool = False
     config_path: str | None = None
+    # Set when stdout carries a machine-readable report; errors then go to stderr without rich.
+    report_to_stdout: bool = False
 
     @property
     def should_output(self) -> bool:
@@ -1,9 +1,12 @@
 import click
 import sys
+from def_form.cli.console import BaseConsole
+from def_form.cli.console import PlainConsole
 from def_form.cli.console import RichConsole
 from def_form.cli.context import context
 from def_form.cli.errors import CLIError
 from def_form.cli.commands.check import check
+from def_form.cli.commands.daemon import daemon
 from def_form.cli.commands.format import format
 
 console = RichConsole(context=context)
@@ -19,19 +22,24 @@ def cli(verbose: bool, quiet: bool) -> None:
 
 cli.add_command(check)
 cli.add_command(format)
+cli.add_command(daemon)
+
+
+def error_console() -> BaseConsole:
+    return PlainConsole(context=context) if context.report_to_stdout else console
 
 
 def main() -> None:
     try:
         cli()
     except CLIError as exc:
-        console.error(str(exc))
+        error_console().error(str(exc))
         sys.exit(1)
     except KeyboardInterrupt:
-        console.error('Operation cancelled by user')
+        error_console().error('Operation cancelled by user')
         sys.exit(130)
     except Exception as exc:
-        console.error(f'Unexpected error: {exc}')
+        error_console().error(f'Unexpected error: {exc}')
         sys.exit(1)
 
 
@@ -1,13 +1,22 @@
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 from pathlib import Path
+from typing import TYPE_CHECKING
 from typing import Any
 
 from def_form.cli.console import BaseConsole
 from def_form.cli.context import CLIContext
 from def_form.exceptions.base import BaseDefFormException
 
+if TYPE_CHECKING:
+    from def_form.core.models import Issue
+    from def_form.core.profiling import RunProfile
+
 
 class BaseUI(ABC):
+    # UIs that report issues as files finish clear this, so a run does not keep every issue for finish.
+    collects_issues = True
+
     def __init__(self, console: BaseConsole) -> None:
         self.console: BaseConsole = console
         self.context: CLIContext = console.context
@@ -20,6 +29,10 @@ class BaseUI(ABC):
     def start(self, total: int | None) -> None:
         raise NotImplementedError
 
+    def update_total(self, total: int, final: bool) -> None:
+        # Called while files are still being discovered; final is set once the walk is done.
+        return
+
     @abstractmethod
     def processing(self, path: Path) -> None:
         raise NotImplementedError
@@ -28,14 +41,22 @@ class BaseUI(ABC):
     def skipped(self, path: Path) -> None:
         raise NotImplementedError
 
+    def report(self, path: Path, issues: Sequence['Issue']) -> None:
+        # Called once per file with issues, as soon as the file is done.
+        return
+
     @abstractmethod
-    def finish(self, processed: int, issues: list[BaseDefFormException]) -> None:
+    def finish(self, processed: int, issues: list[BaseDefFormException], **stats: Any) -> None:
         raise NotImplementedError
 
     @abstractmethod
-    def show_issues(self, processed: int, issues: list[BaseDefFormException]) -> None:
+    def show_issues(self, processed: int, issues: list[BaseDefFormException], **stats: Any) -> None:
         raise NotImplementedError
 
+    def show_profile(self, profile: 'RunProfile') -> None:
+        # Called after finish when the run was profiled.
+        return
+
     @abstractmethod
-    def show_summary(self, processed: int, issues: list[BaseDefFormException]) -> None:
+    def show_summary(self, processed: int, issues: list[BaseDefFormException], **stats: Any) -> None:
         raise NotImplementedError
@@ -18,11 +18,11 @@ class NullUI(BaseUI):
     def skipped(self, path: Path) -> None:
         return
 
-    def finish(self, processed: int, issues: list[BaseDefFormException]) -> None:
+    def finish(self, processed: int, issues: list[BaseDefFormException], **stats: Any) -> None:
         return
 
-    def show_issues(self, processed: int, issues: list[BaseDefFormException]) -> None:
+    def show_issues(self, processed: int, issues: list[BaseDefFormException], **stats: Any) -> None:
         return
 
-    def show_summary(self, processed: int, issues: list[BaseDefFormException]) -> None:
+    def show_summary(self, processed: int, issues: list[BaseDefFormException], **stats: Any) -> None:
         return
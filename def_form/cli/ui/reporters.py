@@ -0,0 +1,188 @@
+import json
+import os
+import sys
+from collections.abc import Sequence
+from dataclasses import asdict
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import TextIO
+
+from def_form.cli.console import BaseConsole
+from def_form.cli.console import PlainConsole
+from def_form.cli.console import RichConsole
+from def_form.cli.context import CLIContext
+from def_form.cli.ui.base import BaseUI
+from def_form.cli.ui.rich import RichUI
+from def_form.exceptions.base import BaseDefFormException
+from def_form.version import package_version
+
+if TYPE_CHECKING:
+    from def_form.core.models import Issue
+
+DEFAULT_OUTPUT_FORMAT = 'rich'
+TOOL_NAME = 'def-form'
+SARIF_VERSION = '2.1.0'
+SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+SARIF_ROOT = '%SRCROOT%'
+
+
+class StreamUI(BaseUI):
+    # Writes each file's issues as soon as it is done and keeps only counters, so memory
+    # stays flat however many issues a run finds. Nothing here imports rich.
+    collects_issues = False
+
+    def __init__(self, console: BaseConsole, stream: TextIO | None = None) -> None:
+        super().__init__(console=console)
+        self.stream = stream or sys.stdout
+        self.root = f'{Path.cwd()}{os.sep}'
+        self.issue_count = 0
+        self.file_count = 0
+
+    def relative(self, path: str) -> str:
+        # CI annotations and SARIF locations are resolved against the checkout, i.e. the working directory.
+        if path.startswith(self.root):
+            path = path[len(self.root) :]
+        return path.replace(os.sep, '/')
+
+    def format_issue(self, issue: 'Issue') -> str:
+        raise NotImplementedError
+
+    def show_config_info(self, **config: Any) -> None:
+        return
+
+    def start(self, total: int | None) -> None:
+        return
+
+    def processing(self, path: Path) -> None:
+        return
+
+    def skipped(self, path: Path) -> None:
+        return
+
+    def report(self, path: Path, issues: Sequence['Issue']) -> None:
+        self.stream.write(''.join(self.format_issue(issue) for issue in issues))
+        self.issue_count += len(issues)
+        self.file_count += 1
+
+    def finish(self, processed: int, issues: list[BaseDefFormException], **stats: Any) -> None:
+        self.stream.flush()
+
+    def show_issues(self, processed: int, issues: list[BaseDefFormException], **stats: Any) -> None:
+        return
+
+    def show_summary(self, processed: int, issues: list[BaseDefFormException], **stats: Any) -> None:
+        return
+
+
+class JsonLinesUI(StreamUI):
+    # Same objects as check reading from stdin writes to stderr.
+    def format_issue(self, issue: 'Issue') -> str:
+        return json.dumps(asdict(issue)) + '\n'
+
+
+def _escape_data(value: str) -> str:
+    return value.replace('%', '%25').replace('\r', '%0D').replace('\n', '%0A')
+
+
+def _escape_property(value: str) -> str:
+    return _escape_data(value).replace(':', '%3A').replace(',', '%2C')
+
+
+class GithubUI(StreamUI):
+    # GitHub Actions workflow commands, shown as annotations on the changed lines.
+    def format_issue(self, issue: 'Issue') -> str:
+        location = f'file={_escape_property(self.relative(issue.path))}'
+        if issue.line:
+            location += f',line={issue.line}'
+        return f'::error {location},title={_escape_property(issue.kind)}::{_escape_data(issue.message)}\n'
+
+
+class PlainUI(StreamUI):
+    def format_issue(self, issue: 'Issue') -> str:
+        return f'{self.relative(issue.path)}:{issue.line}: {issue.message} ({issue.kind})\n'
+
+    def skipped(self, path: Path) -> None:
+        if self.context.should_output and self.context.show_skipped:
+            self.stream.write(f'SKIPPED {path}\n')
+
+    def finish(self, processed: int, issues: list[BaseDefFormException], **stats: Any) -> None:
+        if self.context.should_output:
+            lines = [f'Found {self.issue_count} errors in {self.file_count} files ({processed} files processed)']
+            lines.extend(f'{key.replace("_", " ").capitalize()}: {value}' for key, value in stats.items())
+            self.stream.write('\n'.join(lines) + '\n')
+        super().finish(processed, issues, **stats)
+
+
+class SarifUI(StreamUI):
+    # SARIF is one JSON document: results are written as they arrive, and the tool
+    # section with the rules seen so far goes after them, once the run is done.
+    def __init__(self, console: BaseConsole, stream: TextIO | None = None) -> None:
+        super().__init__(console=console, stream=stream)
+        self.rules: dict[str, None] = {}
+        self._opened = False
+        self._separator = ''
+
+    def _open(self) -> None:
+        if self._opened:
+            return
+
+        self._opened = True
+        self.stream.write(f'{{"version": "{SARIF_VERSION}", "$schema": "{SARIF_SCHEMA}", "runs": [{{"results": [')
+
+    def start(self, total: int | None) -> None:
+        self._open()
+
+    def format_issue(self, issue: 'Issue') -> str:
+        self.rules.setdefault(issue.kind)
+
+        # Files outside the working directory keep an absolute file URI.
+        path = self.relative(issue.path)
+        absolute = Path(path).is_absolute()
+        artifact = {'uri': Path(path).as_uri()} if absolute else {'uri': path, 'uriBaseId': SARIF_ROOT}
+
+        location: dict[str, Any] = {'artifactLocation': artifact}
+        if issue.line:
+            location['region'] = {'startLine': issue.line}
+
+        result = {
+            'ruleId': issue.kind,
+            'level': 'error',
+            'message': {'text': issue.message},
+            'locations': [{'physicalLocation': location}],
+        }
+        separator, self._separator = self._separator, ','
+        return f'{separator}\n{json.dumps(result)}'
+
+    def report(self, path: Path, issues: Sequence['Issue']) -> None:
+        self._open()
+        super().report(path, issues)
+
+    def finish(self, processed: int, issues: list[BaseDefFormException], **stats: Any) -> None:
+        self._open()
+        tool = {
+            'driver': {
+                'name': TOOL_NAME,
+                'version': package_version(),
+                'rules': [{'id': rule} for rule in self.rules],
+            }
+        }
+        root = {SARIF_ROOT: {'uri': Path(self.root).as_uri() + '/'}}
+        self.stream.write(f'\n], "tool": {json.dumps(tool)}, "originalUriBaseIds": {json.dumps(root)}}}]}}\n')
+        super().finish(processed, issues, **stats)
+
+
+OUTPUT_FORMATS: dict[str, type[BaseUI]] = {
+    DEFAULT_OUTPUT_FORMAT: RichUI,
+    'jsonl': JsonLinesUI,
+    'sarif': SarifUI,
+    'github': GithubUI,
+    'plain': PlainUI,
+}
+
+
+def create_ui(output_format: str, context: CLIContext) -> BaseUI:
+    context.report_to_stdout = output_format != DEFAULT_OUTPUT_FORMAT
+    if not context.report_to_stdout:
+        return RichUI(console=RichConsole(context=context))
+    return OUTPUT_FORMATS[output_format](console=PlainConsole(context=context))
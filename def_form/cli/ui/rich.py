@@ -1,19 +1,21 @@
 # ruff: noqa: PLR2004
 from collections import defaultdict
 from pathlib import Path
+from typing import TYPE_CHECKING
 from typing import Any
 
-from rich import box
-from rich.console import Group
-from rich.live import Live
-from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TimeElapsedColumn, TaskID
-from rich.table import Table
-from rich.text import Text
-
 from def_form.cli.console import BaseConsole
 from def_form.cli.ui.base import BaseUI
 from def_form.exceptions.base import BaseDefFormException
 
+if TYPE_CHECKING:
+    from def_form.core.profiling import RunProfile
+    from rich.console import Group
+    from rich.live import Live
+    from rich.progress import Progress
+
+# rich is imported inside the methods that render, so quiet runs never load it.
+
 
 class RichUI(BaseUI):
     def __init__(self, console: BaseConsole) -> None:
@@ -22,6 +24,7 @@ class RichUI(BaseUI):
         )
         self.progress: Progress | None = None
         self._live: Live | None = None
+        self._progress_display: Group | None = None
         self.task_id: int | None = None
         self.current_file: Path | None = None
 
@@ -41,6 +44,9 @@ class RichUI(BaseUI):
         if not config:
             return
 
+        from rich import box  # noqa: PLC0415
+        from rich.table import Table  # noqa: PLC0415
+
         config_table = Table(
             title='[yellow]Configuration[/yellow]', box=box.HORIZONTALS, show_header=False, border_style='dim'
         )
@@ -80,6 +86,16 @@ class RichUI(BaseUI):
         if not self.context.should_output:
             return
 
+        from rich.console import Group  # noqa: PLC0415
+        from rich.live import Live  # noqa: PLC0415
+        from rich.progress import BarColumn  # noqa: PLC0415
+        from rich.progress import MofNCompleteColumn  # noqa: PLC0415
+        from rich.progress import Progress  # noqa: PLC0415
+        from rich.progress import SpinnerColumn  # noqa: PLC0415
+        from rich.progress import TextColumn  # noqa: PLC0415
+        from rich.progress import TimeElapsedColumn  # noqa: PLC0415
+        from rich.text import Text  # noqa: PLC0415
+
         self.progress = Progress(
             SpinnerColumn(),
             BarColumn(bar_width=None, complete_style='blue', finished_style='green'),
@@ -87,14 +103,14 @@ class RichUI(BaseUI):
             TextColumn('•'),
             TimeElapsedColumn(),
             TextColumn('•'),
-            TextColumn('{task.completed}/{task.total}'),
-            console=self.console,
+            MofNCompleteColumn(),
+            console=self.console.rich_console,
             expand=True,
         )
 
         self._progress_display = Group(Text('', style='dim'), self.progress)
 
-        self._live = Live(self._progress_display, console=self.console, refresh_per_second=10)
+        self._live = Live(self._progress_display, console=self.console.rich_console, refresh_per_second=10)
         self._live.start()
 
         self.task_id = self.progress.add_task(
@@ -102,13 +118,24 @@ class RichUI(BaseUI):
             total=total,
         )
 
+    def update_total(self, total: int, final: bool) -> None:
+        if not (self.progress and self.task_id is not None):
+            return
+
+        from rich.progress import TaskID  # noqa: PLC0415
+
+        self.progress.update(TaskID(self.task_id), total=total)
+
     def processing(self, path: Path) -> None:
         if not self.context.should_output:
             return
 
-        if not (self.progress and self._live and self.task_id is not None):
+        if not (self.progress and self._live and self._progress_display and self.task_id is not None):
             return
 
+        from rich.progress import TaskID  # noqa: PLC0415
+        from rich.text import Text  # noqa: PLC0415
+
         self.current_file = path
 
         file_text = Text(str(path), style='dim')
@@ -133,7 +160,7 @@ class RichUI(BaseUI):
     def issue(self, issue: BaseDefFormException) -> None:
         pass
 
-    def finish(self, processed: int, issues: list[BaseDefFormException]) -> None:
+    def finish(self, processed: int, issues: list[BaseDefFormException], **stats: Any) -> None:
         if not self.context.should_output:
             return
 
@@ -146,9 +173,53 @@ class RichUI(BaseUI):
             self.progress = None
 
         if issues:
-            self.show_issues(processed, issues)
+            self.show_issues(processed, issues, **stats)
+        elif stats:
+            self.show_summary(processed, issues, **stats)
 
-    def show_issues(self, processed: int, issues: list[BaseDefFormException]) -> None:
+    def show_profile(self, profile: 'RunProfile') -> None:
+        if not self.context.should_output:
+            return
+
+        from rich import box  # noqa: PLC0415
+        from rich.table import Table  # noqa: PLC0415
+
+        measured = sum(wall for _, wall, _ in profile.phases())
+
+        phases = Table(title='[yellow]Profile[/yellow]', box=box.HORIZONTALS, border_style='dim')
+        phases.add_column('Phase', style='bold')
+        phases.add_column('Wall', justify='right')
+        phases.add_column('CPU', justify='right')
+        phases.add_column('Share', justify='right', style='cyan')
+
+        for name, wall, cpu in profile.phases():
+            share = wall / measured * 100 if measured else 0
+            phases.add_row(name, f'{wall * 1000:.1f} ms', f'{cpu * 1000:.1f} ms', f'{share:.1f}%')
+
+        phases.add_row('total', f'{measured * 1000:.1f} ms', '', '', style='bold')
+        phases.caption = f'{profile.elapsed * 1000:.0f} ms elapsed; phase times add up across workers and threads'
+
+        self.console.print(phases)
+        self.console.print()
+
+        slowest = profile.slowest()
+        if slowest:
+            files = Table(title='[yellow]Slowest files[/yellow]', box=box.HORIZONTALS, border_style='dim')
+            files.add_column('File', style='cyan')
+            files.add_column('Time', justify='right')
+            files.add_column('Slowest phase', style='dim')
+
+            for total, path, phase in slowest:
+                files.add_row(str(path), f'{total * 1000:.1f} ms', phase)
+
+            self.console.print(files)
+            self.console.print()
+
+        if profile.output is not None:
+            kind = 'Chrome trace' if profile.writes_trace else 'pstats'
+            self.console.info(f'Wrote {kind} profile to [bold]{profile.output}[/bold]')
+
+    def show_issues(self, processed: int, issues: list[BaseDefFormException], **stats: Any) -> None:
         if not self.context.should_output:
             return
 
@@ -185,12 +256,15 @@ class RichUI(BaseUI):
 
             self.console.print()
 
-        self.show_summary(processed, issues)
+        self.show_summary(processed, issues, **stats)
 
-    def show_summary(self, processed: int, issues: list[BaseDefFormException]) -> None:
+    def show_summary(self, processed: int, issues: list[BaseDefFormException], **stats: Any) -> None:
         if not self.context.should_output:
             return
 
+        from rich import box  # noqa: PLC0415
+        from rich.table import Table  # noqa: PLC0415
+
         unique_files = {issue.path.split(':')[0] for issue in issues}
 
         summary = Table(title='[yellow]Summary[/yellow]', box=box.HORIZONTALS, show_header=False, border_style='dim')
@@ -210,5 +284,8 @@ class RichUI(BaseUI):
                 f'[/{"green" if success_rate > 90 else "yellow" if success_rate > 70 else "red"}]',
             )
 
+        for key, value in stats.items():
+            summary.add_row(f'{key.replace("_", " ").capitalize()}:', f'[cyan]{value}[/cyan]')
+
         self.console.print(summary)
         self.console.print()
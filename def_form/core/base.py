@@ -1,71 +1,155 @@
-import re
+from functools import cached_property
 from pathlib import Path
 from typing import cast
 
+from libcst import BaseCompoundStatement
 from libcst import Comma
+from libcst import CSTNode
+from libcst import CSTVisitor
+from libcst import Else
+from libcst import ExceptHandler
+from libcst import ExceptStarHandler
+from libcst import Finally
 from libcst import FunctionDef
+from libcst import IndentedBlock
+from libcst import MatchCase
 from libcst import MetadataDependent
 from libcst import Module
 from libcst import Param
 from libcst import ParenthesizedWhitespace
 from libcst import SimpleWhitespace
 from libcst.matchers import BaseParenthesizableWhitespace
+from libcst.metadata import CodePosition
 from libcst.metadata import PositionProvider
 
 from def_form.exceptions.base import BaseDefFormException
+from def_form.core.config import DefFormConfig
 from def_form.core.models import FunctionAnalysis
 from def_form.core.params import get_params_list
+from def_form.core.profiling import FileProfile
+from def_form.core.profiling import timed
+from def_form.core.rules import Rule
+from def_form.core.rules import enabled_rules
 from def_form.core.rules import run_rules
 from def_form.core.rules.context import RuleContext
+from def_form.core.source import SourceIndex
+from def_form.core.source import is_single_line_def
+
+
+def render_def_header(node: FunctionDef) -> str:
+    # Render the signature without decorators, leading comments or the body, so the cost
+    # is proportional to the header instead of the whole (possibly nested) function.
+    body = node.body
+    if isinstance(body, IndentedBlock):
+        body = body.with_changes(body=())
+
+    header = node.with_changes(
+        leading_lines=(),
+        decorators=(),
+        lines_after_decorators=(),
+        body=body,
+    )
+    return Module([]).code_for_node(header)
+
+
+# Nodes that can hold a def somewhere below them. Everything else (simple statement
+# lines, expressions, parameters, decorators, annotations) is not entered at all.
+DEF_CONTAINERS = (
+    Module,
+    IndentedBlock,
+    BaseCompoundStatement,
+    Else,
+    ExceptHandler,
+    ExceptStarHandler,
+    Finally,
+    MatchCase,
+)
+
+
+def has_compound_statement(node: FunctionDef) -> bool:
+    body = node.body
+    return isinstance(body, IndentedBlock) and any(isinstance(stmt, BaseCompoundStatement) for stmt in body.body)
+
+
+class DefVisitor(CSTVisitor):
+    # Prunes the traversal to the statements that can contain a def; leave_* hooks still
+    # run for every node that is reached, including defs whose children are skipped.
+    def on_visit(self, node: CSTNode) -> bool:
+        if not isinstance(node, DEF_CONTAINERS):
+            return False
+
+        visit_children = super().on_visit(node)
+        # A def whose body holds only simple statements cannot contain another def.
+        if isinstance(node, FunctionDef) and not has_compound_statement(node):
+            return False
+        return visit_children
 
 
 class DefBase(MetadataDependent):
     METADATA_DEPENDENCIES = (PositionProvider,)
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         filepath: str,
         max_def_length: int | None,
         max_inline_args: int | None,
         indent_size: int | None = None,
+        source: SourceIndex | None = None,
+        rules: tuple[Rule, ...] | None = None,
     ):
         super().__init__()
         self.filepath = filepath
+        self.source = source
         self.max_def_length = max_def_length
         self.max_inline_args = max_inline_args
         self.indent_size = indent_size if indent_size is not None else 4
+        self.rules = rules if rules is not None else enabled_rules(DefFormConfig(max_def_length, max_inline_args))
         self.issues: list[BaseDefFormException] = []
+        self.profile: FileProfile | None = None
+        self._starts: dict[FunctionDef, CodePosition] = {}
+
+    @cached_property
+    def def_starts(self) -> tuple[tuple[int, int], ...] | None:
+        # Positions of defs taken from the source, so the tree needs no position metadata.
+        # Read once, before the first def: a source loaded later for skip comments must not
+        # switch a visit that started on metadata over to source positions.
+        return self.source.def_starts if self.source is not None else None
+
+    def visit_FunctionDef(self, node: FunctionDef) -> None:
+        # Every def is reached, in source order, which is the order of def_starts.
+        starts = self.def_starts
+        if starts is not None:
+            self._starts[node] = CodePosition(*starts[len(self._starts)])
+
+    def def_start(self, node: FunctionDef) -> CodePosition:
+        start = self._starts.get(node)
+        if start is None:
+            return self.get_metadata(PositionProvider, node).start
+        return start
+
+    def get_def_line(self, node: FunctionDef) -> str:
+        return render_def_header(node).split('\n', 1)[0]
 
     def is_single_line_function(self, node: FunctionDef) -> bool:
-        func_code = Module([]).code_for_node(node).strip()
-        lines = func_code.split('\n')
+        return is_single_line_def(self.get_def_line(node))
 
-        for line in lines:
-            if line.strip().startswith(('def ', 'async def ')):
-                clean_line = re.sub(r'#.*', '', line)
-                return ')' in clean_line and ':' in clean_line
-
-        return False
-
-    def has_skip_comment(self, node: FunctionDef) -> bool:
-        pos = self.get_metadata(PositionProvider, node)
+    @cached_property
+    def skip_lines(self) -> frozenset[int]:
+        if self.source is not None:
+            return self.source.skip_lines
 
         try:
             with Path.open(Path(self.filepath), encoding='utf-8') as f:
-                lines = f.readlines()
+                self.source = SourceIndex(f.read())
         except (OSError, UnicodeDecodeError):
-            return False
-
-        def_line = lines[pos.start.line - 1]
-        if '# def-form: skip' in def_line.lower():
-            return True
+            return frozenset()
 
-        if pos.start.line > 1:
-            prev_line = lines[pos.start.line - 2]
-            if '# def-form: skip' in prev_line.lower():
-                return True
+        return self.source.skip_lines
 
-        return False
+    def has_skip_comment(self, node: FunctionDef) -> bool:
+        line = self.def_start(node).line
+        skip_lines = self.skip_lines
+        return line in skip_lines or line - 1 in skip_lines
 
     def has_correct_multiline_params_format(self, node: FunctionDef) -> bool:  # noqa: PLR0911, PLR0912
         ws = node.whitespace_before_params
@@ -136,6 +220,10 @@ class DefBase(MetadataDependent):
         return count
 
     def analyze_function(self, node: FunctionDef) -> FunctionAnalysis:
+        with timed(self.profile, 'rules'):
+            return self._analyze_function(node)
+
+    def _analyze_function(self, node: FunctionDef) -> FunctionAnalysis:
         if self.has_skip_comment(node):
             return FunctionAnalysis(
                 should_process=False,
@@ -143,10 +231,6 @@ class DefBase(MetadataDependent):
                 node=node,
             )
 
-        func_code = Module([]).code_for_node(node).strip()
-        first_line = func_code.split('\n')[0]
-        line_length = len(first_line)
-
         arg_count = self._count_arguments(node)
 
         if arg_count == 0:
@@ -154,33 +238,32 @@ class DefBase(MetadataDependent):
                 should_process=False,
                 reason='no_args',
                 node=node,
-                line_length=line_length,
                 arg_count=arg_count,
             )
 
-        pos = self.get_metadata(PositionProvider, node)
-        line_no = pos.start.line
+        start = self.def_start(node)
+        line_no = start.line
 
         context = RuleContext(
             filepath=self.filepath,
             line_no=line_no,
-            line_length=line_length,
             arg_count=arg_count,
-            is_single_line=self.is_single_line_function(node),
-            has_correct_multiline_format=self.has_correct_multiline_params_format(node),
             indent_size=self.indent_size,
             max_def_length=self.max_def_length,
             max_inline_args=self.max_inline_args,
+            def_line=lambda: self.get_def_line(node),
+            multiline_format=lambda: self.has_correct_multiline_params_format(node),
         )
-        issues = run_rules(context)
+        issues = run_rules(context, self.rules)
         has_issues = bool(issues)
 
         return FunctionAnalysis(
             should_process=has_issues,
-            line_length=line_length,
+            # The formatter needs it; rules that reported have usually read it already.
+            is_single_line=context.is_single_line if has_issues else None,
             arg_count=arg_count,
             line_no=line_no,
-            pos=pos,
+            start=start,
             node=node,
             issues=issues,
         )
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+from contextlib import suppress
+from dataclasses import asdict
+from dataclasses import dataclass
+from pathlib import Path
+
+from def_form.core.config import DefFormConfig
+from def_form.core.models import Issue
+from def_form.utils.atomic_write import atomic_write
+from def_form.version import package_version
+
+CACHE_DIR_NAME = '.def_form_cache'
+CACHE_FORMAT = 1
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+ENTRY_SUFFIX = '.json'
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    issues: tuple[tuple[int, str, str, str | None], ...]
+    changed: bool
+
+    @classmethod
+    def build(cls, issues: tuple[Issue, ...], changed: bool) -> 'CacheEntry':
+        return cls(
+            issues=tuple((i.line, i.kind, i.message, i.description) for i in issues),
+            changed=changed,
+        )
+
+    def issues_for(self, filepath: Path) -> tuple[Issue, ...]:
+        return tuple(
+            Issue(path=str(filepath), line=line, kind=kind, message=message, description=description)
+            for line, kind, message, description in self.issues
+        )
+
+
+class ResultCache:
+    def __init__(
+        self,
+        directory: Path,
+        config: DefFormConfig,
+        max_size: int = DEFAULT_MAX_SIZE,
+    ) -> None:
+        self.directory = directory
+        self.max_size = max_size
+        self.fingerprint = json.dumps(
+            {
+                'format': CACHE_FORMAT,
+                'version': package_version(),
+                'config': asdict(config),
+            },
+            sort_keys=True,
+        ).encode('utf-8')
+
+    def key(self, code: str) -> str:
+        digest = hashlib.sha256(self.fingerprint)
+        digest.update(b'\0')
+        digest.update(code.encode('utf-8', errors='surrogatepass'))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f'{key[2:]}{ENTRY_SUFFIX}'
+
+    def get(self, key: str) -> CacheEntry | None:
+        path = self._entry_path(key)
+        try:
+            data = json.loads(path.read_bytes())
+            entry = CacheEntry(
+                issues=tuple((line, kind, message, description) for line, kind, message, description in data['issues']),
+                changed=bool(data['changed']),
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        # The mtime doubles as the last-access time for LRU eviction.
+        with suppress(OSError):
+            os.utime(path)
+
+        return entry
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        path = self._entry_path(key)
+        payload = json.dumps({'issues': entry.issues, 'changed': entry.changed}).encode('utf-8')
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Readers in other workers see either the old entry or the new one, never a partial write.
+            atomic_write(path, payload)
+        except OSError:
+            return
+
+    def prune(self) -> None:
+        entries: list[tuple[int, int, str]] = []
+        total = 0
+
+        try:
+            shards = list(os.scandir(self.directory))
+        except OSError:
+            return
+
+        for shard in shards:
+            if not shard.is_dir(follow_symlinks=False):
+                continue
+            try:
+                with os.scandir(shard.path) as it:
+                    for item in it:
+                        if not item.name.endswith(ENTRY_SUFFIX):
+                            continue
+                        stat = item.stat(follow_symlinks=False)
+                        entries.append((stat.st_mtime_ns, stat.st_size, item.path))
+                        total += stat.st_size
+            except OSError:
+                continue
+
+        if total <= self.max_size:
+            return
+
+        for _, size, entry_path in sorted(entries):
+            try:
+                Path(entry_path).unlink()
+            except OSError:
+                continue
+            total -= size
+            if total <= self.max_size:
+                break
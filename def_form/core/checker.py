@@ -1,22 +1,28 @@
-from libcst import CSTVisitor
 from libcst import FunctionDef
 
 from def_form.core.base import DefBase
+from def_form.core.base import DefVisitor
+from def_form.core.rules import Rule
+from def_form.core.source import SourceIndex
 
 
-class DefChecker(DefBase, CSTVisitor):
-    def __init__(
+class DefChecker(DefBase, DefVisitor):
+    def __init__(  # noqa: PLR0913
         self,
         filepath: str,
         max_def_length: int | None,
         max_inline_args: int | None,
         indent_size: int | None,
+        source: SourceIndex | None = None,
+        rules: tuple[Rule, ...] | None = None,
     ):
         super().__init__(
             filepath=filepath,
             max_def_length=max_def_length,
             max_inline_args=max_inline_args,
             indent_size=indent_size,
+            source=source,
+            rules=rules,
         )
 
     def leave_FunctionDef(self, original_node: FunctionDef) -> None:
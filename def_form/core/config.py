@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class DefFormConfig:
+    max_def_length: int | None = None
+    max_inline_args: int | None = None
+    indent_size: int | None = None
+    # Rule names to run (all when None) and to leave out.
+    select: tuple[str, ...] | None = None
+    ignore: tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        # Stored as tuples, so configs read from TOML lists stay hashable and compare equal.
+        if self.select is not None:
+            object.__setattr__(self, 'select', tuple(self.select))
+        object.__setattr__(self, 'ignore', tuple(self.ignore))
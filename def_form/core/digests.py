@@ -0,0 +1,255 @@
+import hashlib
+import json
+import os
+import time
+from collections.abc import Mapping
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+from def_form.core.cache import CacheEntry
+from def_form.core.exclusions import GITIGNORE
+from def_form.core.exclusions import IgnoreRules
+from def_form.core.manifest import RACY_WINDOW_NS
+from def_form.core.manifest import StatKey
+from def_form.core.manifest import stat_key
+from def_form.utils.atomic_write import atomic_write
+
+DIGESTS_PREFIX = 'digests-'
+DIGESTS_SUFFIX = '.json'
+
+
+@dataclass(frozen=True)
+class DirectoryRecord:
+    mtime_ns: int
+    ino: int
+    rules: str
+    child_rules: str
+    gitignore: StatKey | None
+    files: dict[str, StatKey]
+    dirs: tuple[str, ...]
+
+    def to_json(self) -> list[object]:
+        return [self.mtime_ns, self.ino, self.rules, self.child_rules, self.gitignore, self.files, self.dirs]
+
+    @classmethod
+    def from_json(cls, data: list) -> 'DirectoryRecord':
+        mtime_ns, ino, rules, child_rules, gitignore, files, dirs = data
+        return cls(
+            mtime_ns=mtime_ns,
+            ino=ino,
+            rules=rules,
+            child_rules=child_rules,
+            gitignore=tuple(gitignore) if gitignore is not None else None,
+            files={name: tuple(key) for name, key in files.items()},
+            dirs=tuple(dirs),
+        )
+
+
+@dataclass(frozen=True)
+class WalkedDirectory:
+    path: str
+    mtime_ns: int
+    ino: int
+    rules: str
+    child_rules: str
+    gitignore: StatKey | None
+    files: tuple[str, ...]
+    dirs: tuple[str, ...]
+
+
+def _is_clean(entry: CacheEntry) -> bool:
+    return not entry.issues and not entry.changed
+
+
+def _stat_key(path: str) -> StatKey:
+    return stat_key(os.stat(path))  # noqa: PTH116
+
+
+def _unchanged(path: str, record: DirectoryRecord) -> bool:
+    try:
+        st = os.stat(path)  # noqa: PTH116
+        if (st.st_mtime_ns, st.st_ino) != (record.mtime_ns, record.ino):
+            return False
+        # An unchanged mtime means no .gitignore was added or removed, but one can be edited in place.
+        if record.gitignore is not None and _stat_key(os.path.join(path, GITIGNORE)) != record.gitignore:  # noqa: PTH118
+            return False
+        return all(_stat_key(os.path.join(path, name)) == key for name, key in record.files.items())  # noqa: PTH118
+    except OSError:
+        return False
+
+
+class DirectoryDigests:
+    # Records every directory whose whole subtree was clean on the last run: its own stat,
+    # the ignore rules in effect, its .gitignore, its .py files with their stats and its
+    # clean subdirectories. A subtree is clean again while all of that still matches,
+    # which is checked with stats alone: nothing is listed, matched against exclusions,
+    # read or processed. One file per config and exclusion fingerprint.
+    #
+    # A directory's mtime only moves when entries are added, removed or renamed, so the
+    # .py files are still stat'ed; an in-place edit changes only the file's own stat.
+    def __init__(self, directory: Path, fingerprint: bytes) -> None:
+        digest = hashlib.sha256(fingerprint).hexdigest()[:16]
+        self.path = directory / f'{DIGESTS_PREFIX}{digest}{DIGESTS_SUFFIX}'
+        self.records = self._load()
+        self._signatures: dict[tuple[IgnoreRules, ...], str] = {}
+        self._changed = False
+        self.start()
+
+    def start(self) -> None:
+        self.skipped_dirs = 0
+        self.skipped_files = 0
+        self._walked: list[WalkedDirectory] = []
+        self._verified: dict[str, tuple[str, tuple[int, int] | None]] = {}
+        self._started = time.time_ns()
+
+    def _load(self) -> dict[str, DirectoryRecord]:
+        try:
+            data = json.loads(self.path.read_bytes())
+            return {path: DirectoryRecord.from_json(record) for path, record in data.items()}
+        except (OSError, ValueError, TypeError, AttributeError):
+            return {}
+
+    def signature(self, rules: tuple[IgnoreRules, ...]) -> str:
+        # Rules tuples are shared between sibling directories, so each is hashed once.
+        signature = self._signatures.get(rules)
+        if signature is None:
+            described = [
+                [r.prefix, [[p.regex.pattern, p.anchored, p.dir_only, p.negated] for p in r.patterns]] for r in rules
+            ]
+            signature = hashlib.sha256(json.dumps(described).encode('utf-8')).hexdigest()
+            self._signatures[rules] = signature
+        return signature
+
+    def skip(self, path: str, rules: tuple[IgnoreRules, ...]) -> bool:
+        counts = self._verify(path, self.signature(rules))
+        if counts is None:
+            return False
+
+        self.skipped_dirs += counts[0]
+        self.skipped_files += counts[1]
+        return True
+
+    def _verify(self, path: str, rules: str) -> tuple[int, int] | None:
+        # Each directory is verified at most once per run, however often the walk asks.
+        verified = self._verified.get(path)
+        if verified is not None and verified[0] == rules:
+            return verified[1]
+
+        counts = self._check(path, rules)
+        self._verified[path] = (rules, counts)
+        return counts
+
+    def _check(self, path: str, rules: str) -> tuple[int, int] | None:
+        record = self.records.get(path)
+        if record is None or record.rules != rules or not _unchanged(path, record):
+            return None
+
+        dirs, files = 1, len(record.files)
+        for name in record.dirs:
+            counts = self._verify(os.path.join(path, name), record.child_rules)  # noqa: PTH118
+            if counts is None:
+                return None
+            dirs += counts[0]
+            files += counts[1]
+        return dirs, files
+
+    def walked(
+        self,
+        path: str,
+        rules: tuple[IgnoreRules, ...],
+        child_rules: tuple[IgnoreRules, ...],
+        files: Sequence[str],
+        dirs: Sequence[str],
+    ) -> None:
+        # Called by the walk for every directory it lists, with the .py files and
+        # subdirectories it kept; the records are built once the run's results are in.
+        try:
+            st = os.stat(path)  # noqa: PTH116
+            gitignore = os.path.join(path, GITIGNORE)  # noqa: PTH118
+            gitignore_key = _stat_key(gitignore) if os.path.exists(gitignore) else None  # noqa: PTH110
+        except OSError:
+            return
+
+        self._walked.append(
+            WalkedDirectory(
+                path=path,
+                mtime_ns=st.st_mtime_ns,
+                ino=st.st_ino,
+                rules=self.signature(rules),
+                child_rules=self.signature(child_rules),
+                gitignore=gitignore_key,
+                files=tuple(files),
+                dirs=tuple(dirs),
+            )
+        )
+
+    def _settled(self, mtime_ns: int) -> bool:
+        return mtime_ns < self._started - RACY_WINDOW_NS
+
+    def update(self, results: Mapping[str, tuple[StatKey, CacheEntry]]) -> None:
+        # results holds the last known stat and result of each file (the stat manifest).
+        # Children are walked after their parents, so going backwards settles them first.
+        clean = {path for path, (_, counts) in self._verified.items() if counts is not None}
+        walked = {directory.path for directory in self._walked}
+
+        for directory in reversed(self._walked):
+            record = self._record(directory, results, clean, walked)
+            if record is not None:
+                clean.add(directory.path)
+                self.records[directory.path] = record
+                self._changed = True
+            elif self.records.pop(directory.path, None) is not None:
+                self._changed = True
+
+        self._walked.clear()
+
+    def _record(
+        self,
+        directory: WalkedDirectory,
+        results: Mapping[str, tuple[StatKey, CacheEntry]],
+        clean: set[str],
+        walked: set[str],
+    ) -> DirectoryRecord | None:
+        if not self._settled(directory.mtime_ns):
+            return None
+        if directory.gitignore is not None and not self._settled(directory.gitignore[0]):
+            return None
+
+        files: dict[str, StatKey] = {}
+        for name in directory.files:
+            result = results.get(os.path.join(directory.path, name))  # noqa: PTH118
+            if result is None or not _is_clean(result[1]) or not self._settled(result[0][0]):
+                return None
+            files[name] = result[0]
+
+        # Subdirectories the walk did not enter (symlinks) are not part of the subtree.
+        dirs = []
+        for name in directory.dirs:
+            child = os.path.join(directory.path, name)  # noqa: PTH118
+            if child in clean:
+                dirs.append(name)
+            elif child in walked:
+                return None
+
+        return DirectoryRecord(
+            mtime_ns=directory.mtime_ns,
+            ino=directory.ino,
+            rules=directory.rules,
+            child_rules=directory.child_rules,
+            gitignore=directory.gitignore,
+            files=files,
+            dirs=tuple(dirs),
+        )
+
+    def save(self) -> None:
+        if not self._changed:
+            return
+
+        self._changed = False
+        payload = json.dumps({path: record.to_json() for path, record in self.records.items()})
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(self.path, payload.encode('utf-8'))
+        except OSError:
+            return
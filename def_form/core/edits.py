@@ -0,0 +1,41 @@
+import io
+from collections.abc import Sequence
+from dataclasses import dataclass
+from itertools import accumulate
+
+
+@dataclass(frozen=True)
+class TextEdit:
+    # Lines are 1-based and columns 0-based character offsets, as in libcst's PositionProvider.
+    start_line: int
+    start_column: int
+    end_line: int
+    end_column: int
+    text: str
+
+
+def line_offsets(code: str) -> list[int]:
+    # Offset of the first character of each line, split on the same line endings as libcst.
+    return [0, *accumulate(len(line) for line in io.StringIO(code, newline='').readlines())]
+
+
+def apply_edits(code: str, edits: Sequence[TextEdit]) -> str:
+    if not edits:
+        return code
+
+    offsets = line_offsets(code)
+    parts: list[str] = []
+    last = 0
+
+    for edit in sorted(edits, key=lambda e: (e.start_line, e.start_column)):
+        start = offsets[edit.start_line - 1] + edit.start_column
+        end = offsets[edit.end_line - 1] + edit.end_column
+        if start < last or end < start:
+            raise ValueError(f'Overlapping or inverted edit at {edit.start_line}:{edit.start_column}')
+
+        parts.append(code[last:start])
+        parts.append(edit.text)
+        last = end
+
+    parts.append(code[last:])
+    return ''.join(parts)
@@ -0,0 +1,94 @@
+import json
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import TextIO
+
+FILE_DISCOVERED = 'file_discovered'
+FILE_STARTED = 'file_started'
+FILE_FINISHED = 'file_finished'
+ISSUE_FOUND = 'issue_found'
+CACHE_HIT = 'cache_hit'
+WRITE_PERFORMED = 'write_performed'
+
+EVENT_KINDS = (FILE_DISCOVERED, FILE_STARTED, FILE_FINISHED, ISSUE_FOUND, CACHE_HIT, WRITE_PERFORMED)
+
+
+@dataclass(frozen=True)
+class Event:
+    kind: str
+    path: str
+    timestamp: float
+    data: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {'event': self.kind, 'path': self.path, 'timestamp': self.timestamp, **self.data}
+
+
+Subscriber = Callable[[Event], None]
+
+
+class EventHooks:
+    # Subscribers are called in subscription order on the thread running DefManager.
+    # Emitters check truthiness first, so nothing is built while no one listens.
+    def __init__(self) -> None:
+        self._subscribers: list[Subscriber] = []
+
+    def __bool__(self) -> bool:
+        return bool(self._subscribers)
+
+    def subscribe(self, subscriber: Subscriber) -> Callable[[], None]:
+        self._subscribers.append(subscriber)
+        return lambda: self._subscribers.remove(subscriber)
+
+    def emit(self, kind: str, path: object, timestamp: float | None = None, /, **data: Any) -> None:
+        event = Event(kind=kind, path=str(path), timestamp=time.time() if timestamp is None else timestamp, data=data)
+        for subscriber in self._subscribers:
+            subscriber(event)
+
+
+class JsonLinesSink:
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+
+    def __call__(self, event: Event) -> None:
+        self.stream.write(json.dumps(event.to_dict()) + '\n')
+
+
+class MetricsCollector:
+    def __init__(self) -> None:
+        self.events: Counter[str] = Counter()
+        self.issues: Counter[str] = Counter()
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.duration = 0.0
+        self.max_duration = 0.0
+
+    def __call__(self, event: Event) -> None:
+        self.events[event.kind] += 1
+        if event.kind == FILE_FINISHED:
+            self.bytes_read += event.data.get('bytes', 0)
+            duration = event.data.get('duration', 0.0)
+            self.duration += duration
+            self.max_duration = max(self.max_duration, duration)
+        elif event.kind == ISSUE_FOUND:
+            self.issues[event.data['kind']] += 1
+        elif event.kind == WRITE_PERFORMED:
+            self.bytes_written += event.data['bytes']
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            'files_discovered': self.events[FILE_DISCOVERED],
+            'files_finished': self.events[FILE_FINISHED],
+            'cache_hits': self.events[CACHE_HIT],
+            'issues': self.events[ISSUE_FOUND],
+            'issues_by_kind': dict(self.issues),
+            'writes': self.events[WRITE_PERFORMED],
+            'bytes_read': self.bytes_read,
+            'bytes_written': self.bytes_written,
+            'duration': self.duration,
+            'max_duration': self.max_duration,
+        }
@@ -0,0 +1,206 @@
+import os
+import re
+from collections.abc import Iterable
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+GLOB_CHARS = frozenset('*?[')
+GITIGNORE = '.gitignore'
+GIT_DIR = '.git'
+
+
+def is_glob(pattern: str) -> bool:
+    return not GLOB_CHARS.isdisjoint(pattern)
+
+
+def _translate_bracket(glob: str, start: int) -> tuple[str, int] | None:
+    end = start + 1
+    if end < len(glob) and glob[end] in '!^':
+        end += 1
+    if end < len(glob) and glob[end] == ']':
+        end += 1
+    end = glob.find(']', end)
+    if end == -1:
+        return None
+
+    content = glob[start + 1 : end].replace('\\', '\\\\')
+    if content[0] in '!^':
+        content = '^' + content[1:]
+    return f'[{content}]', end + 1
+
+
+def translate_glob(glob: str) -> str:
+    # gitignore globs: '*' and '?' stop at '/', while '**' spans directories.
+    parts: list[str] = []
+    i = 0
+    while i < len(glob):
+        at_boundary = i == 0 or glob[i - 1] == '/'
+        if at_boundary and glob.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+        elif at_boundary and glob[i:] == '**':
+            parts.append('.*')
+            i += 2
+        elif glob[i] == '*':
+            parts.append('[^/]*')
+            i += 1
+        elif glob[i] == '?':
+            parts.append('[^/]')
+            i += 1
+        elif glob[i] == '[' and (bracket := _translate_bracket(glob, i)) is not None:
+            parts.append(bracket[0])
+            i = bracket[1]
+        elif glob[i] == '\\' and i + 1 < len(glob):
+            parts.append(re.escape(glob[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(glob[i]))
+            i += 1
+    return ''.join(parts)
+
+
+@dataclass(frozen=True)
+class IgnorePattern:
+    regex: re.Pattern[str]
+    anchored: bool
+    dir_only: bool
+    negated: bool
+
+    @classmethod
+    def parse(cls, line: str) -> 'IgnorePattern | None':
+        line = line.rstrip('\r\n')
+        if not line.endswith('\\ '):
+            line = line.rstrip()
+        if not line or line.startswith('#'):
+            return None
+
+        negated = line.startswith('!')
+        if negated or line.startswith(('\\!', '\\#')):
+            line = line[1:]
+
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            return None
+
+        # A separator at the start or in the middle anchors the pattern to its base directory;
+        # otherwise it matches the name at any depth.
+        anchored = '/' in line
+        return cls(
+            regex=re.compile(translate_glob(line.lstrip('/'))),
+            anchored=anchored,
+            dir_only=dir_only,
+            negated=negated,
+        )
+
+    def matches(self, relative: str, name: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        return self.regex.fullmatch(relative if self.anchored else name) is not None
+
+
+class IgnoreRules:
+    # The patterns of one ignore file (or of the configuration), relative to one directory.
+    def __init__(self, base: Path, patterns: Iterable[IgnorePattern]) -> None:
+        base_str = str(base)
+        self.prefix = base_str if base_str.endswith(os.sep) else base_str + os.sep
+        self.patterns = tuple(patterns)
+
+    @classmethod
+    def from_lines(cls, base: Path, lines: Iterable[str]) -> 'IgnoreRules':
+        patterns = (IgnorePattern.parse(line) for line in lines)
+        return cls(base, (pattern for pattern in patterns if pattern is not None))
+
+    @classmethod
+    def from_file(cls, base: Path, path: Path) -> 'IgnoreRules | None':
+        try:
+            rules = cls.from_lines(base, path.read_text(encoding='utf-8').splitlines())
+        except (OSError, UnicodeDecodeError):
+            return None
+        return rules if rules.patterns else None
+
+    def match(self, path: str, name: str, is_dir: bool) -> bool | None:
+        # The last matching pattern wins; None means no pattern has an opinion.
+        if not path.startswith(self.prefix):
+            return None
+
+        relative = path[len(self.prefix) :]
+        if os.sep != '/':
+            relative = relative.replace(os.sep, '/')
+
+        for pattern in reversed(self.patterns):
+            if pattern.matches(relative, name, is_dir):
+                return not pattern.negated
+        return None
+
+
+def is_ignored(path: str, name: str, is_dir: bool, rules: Sequence[IgnoreRules]) -> bool:
+    # Deeper ignore files come last and override the ones above them.
+    for ignore_rules in reversed(rules):
+        matched = ignore_rules.match(path, name, is_dir)
+        if matched is not None:
+            return matched
+    return False
+
+
+def find_git_dir(path: Path) -> Path | None:
+    for directory in (path, *path.parents):
+        if (directory / GIT_DIR).is_dir():
+            return directory / GIT_DIR
+    return None
+
+
+def inherited_ignore_rules(path: Path) -> tuple[IgnoreRules, ...]:
+    # Rules that apply to a walk starting at path: .git/info/exclude and the .gitignore
+    # files between the repository root and path. path's own .gitignore is read by the walk.
+    git_dir = find_git_dir(path)
+    if git_dir is None:
+        return ()
+
+    root = git_dir.parent
+    candidates = [(root, git_dir / 'info' / 'exclude')]
+    directories = path.parents[: len(path.parents) - len(root.parents)]
+    candidates.extend((directory, directory / GITIGNORE) for directory in reversed(directories))
+
+    loaded = (IgnoreRules.from_file(base, file) for base, file in candidates)
+    return tuple(rules for rules in loaded if rules is not None)
+
+
+class ExclusionMatcher:
+    def __init__(self, paths: Iterable[Path], patterns: Iterable[str], base: Path) -> None:
+        self.paths = frozenset(paths)
+        # Every path under an excluded directory has that directory's name among its parts,
+        # and excluded names match at any depth, so one set lookup per path covers both.
+        self.names = frozenset(path.parts[-1] for path in self.paths if path.parts)
+        self.patterns = tuple(patterns)
+        self.rules = IgnoreRules.from_lines(base, self.patterns)
+
+    def excludes_entry(
+        self,
+        path: str,
+        name: str,
+        is_dir: bool,
+        ignore_rules: Sequence[IgnoreRules] = (),
+    ) -> bool:
+        # For entries met during a walk: their parent directories were already checked,
+        # so only the entry's own name and the patterns are left, without building a Path.
+        if name in self.names:
+            return True
+
+        if self.rules.match(path, name, is_dir):
+            return True
+
+        return is_ignored(path, name, is_dir, ignore_rules)
+
+    def excludes(self, path: Path) -> bool:
+        if not self.names.isdisjoint(path.parts):
+            return True
+
+        if not self.rules.patterns:
+            return False
+
+        return any(
+            self.rules.match(str(candidate), candidate.name, is_dir=candidate != path)
+            for candidate in (path, *path.parents)
+        )
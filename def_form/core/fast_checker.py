@@ -0,0 +1,247 @@
+import ast
+import io
+import tokenize
+from collections.abc import Iterator
+from collections.abc import Sequence
+from functools import cached_property
+from pathlib import Path
+
+from def_form.exceptions.base import BaseDefFormException
+from def_form.core.config import DefFormConfig
+from def_form.core.rules import Rule
+from def_form.core.rules import enabled_rules
+from def_form.core.rules import run_rules
+from def_form.core.rules.context import RuleContext
+from def_form.core.source import SourceIndex
+
+LIBCST_BACKEND = 'libcst'
+FAST_BACKEND = 'fast'
+BACKENDS = (LIBCST_BACKEND, FAST_BACKEND)
+
+AnyFunctionDef = ast.FunctionDef | ast.AsyncFunctionDef
+
+SKIPPED_TOKENS = frozenset({tokenize.NL, tokenize.COMMENT, tokenize.INDENT, tokenize.DEDENT})
+
+
+def resolve_backend(backend: str | None) -> str:
+    if backend is None:
+        return LIBCST_BACKEND
+
+    value = backend.strip().lower()
+    if value not in BACKENDS:
+        raise ValueError(f'Invalid backend: {backend!r} (expected one of: {", ".join(BACKENDS)})')
+
+    return value
+
+
+def _read_lines(lines: Sequence[str], start: int) -> Iterator[str]:
+    for i in range(start, len(lines)):
+        yield lines[i]
+
+
+def _next_token(tokens: Sequence[tokenize.TokenInfo], index: int) -> tokenize.TokenInfo:
+    for token in tokens[index + 1 :]:
+        if token.type not in SKIPPED_TOKENS:
+            return token
+    return tokens[-1]
+
+
+def _count_arguments(args: ast.arguments) -> int:
+    # Positional-only parameters are not counted, same as DefBase._count_arguments.
+    return len(args.args) + (args.vararg is not None) + len(args.kwonlyargs) + (args.kwarg is not None)
+
+
+def _params_tokens(lines: Sequence[str], line_no: int) -> list[tokenize.TokenInfo]:
+    # Tokens of the parameter list, from its '(' to the matching ')'.
+    tokens: list[tokenize.TokenInfo] = []
+    depth = 0
+    seen_def = False
+
+    for token in tokenize.generate_tokens(_read_lines(lines, line_no - 1).__next__):
+        if not seen_def:
+            seen_def = token.type == tokenize.NAME and token.string == 'def'
+            continue
+
+        is_op = token.type == tokenize.OP
+        if is_op and token.string in '([{':
+            depth += 1
+        elif is_op and token.string in ')]}':
+            depth -= 1
+
+        # Type parameters come before the parameter list, so it starts at the first top-level '('.
+        if not tokens and not (is_op and depth == 1 and token.string == '('):
+            continue
+
+        tokens.append(token)
+        if depth == 0:
+            return tokens
+
+    return tokens
+
+
+def _split_params(tokens: Sequence[tokenize.TokenInfo]) -> list[tuple[int, int | None]]:
+    # Top-level items between the parentheses: (index of first token, index of trailing comma).
+    items: list[tuple[int, int | None]] = []
+    first: int | None = None
+    depth = 0
+    lambdas = 0
+
+    for i in range(1, len(tokens) - 1):
+        token = tokens[i]
+        if token.type in SKIPPED_TOKENS:
+            continue
+        if first is None:
+            first = i
+        if token.type not in {tokenize.OP, tokenize.NAME}:
+            continue
+
+        if token.string in {'(', '[', '{'}:
+            depth += 1
+        elif token.string in {')', ']', '}'}:
+            depth -= 1
+        elif depth == 0 and token.string == 'lambda':
+            lambdas += 1
+        elif depth == 0 and lambdas and token.string == ':':
+            lambdas -= 1
+        elif depth == 0 and not lambdas and token.string == ',':
+            items.append((first, i))
+            first = None
+
+    if first is not None:
+        items.append((first, None))
+
+    return items
+
+
+def _list_params(tokens: Sequence[tokenize.TokenInfo]) -> list[int | None]:
+    # Trailing commas of the parameters DefBase.get_params_list returns: positional-only
+    # parameters, '/' and the bare '*' separator are left out.
+    items = _split_params(tokens)
+    posonly_end = max((n for n, (start, _) in enumerate(items) if tokens[start].string == '/'), default=-1)
+
+    return [
+        comma
+        for start, comma in items[posonly_end + 1 :]
+        if not (tokens[start].string == '*' and _next_token(tokens, start).string in {',', ')'})
+    ]
+
+
+class FastDefChecker:
+    def __init__(  # noqa: PLR0913
+        self,
+        filepath: str,
+        max_def_length: int | None,
+        max_inline_args: int | None,
+        indent_size: int | None = None,
+        source: SourceIndex | None = None,
+        rules: tuple[Rule, ...] | None = None,
+    ):
+        self.filepath = filepath
+        self.source = source
+        self.max_def_length = max_def_length
+        self.max_inline_args = max_inline_args
+        self.indent_size = indent_size if indent_size is not None else 4
+        self.rules = rules if rules is not None else enabled_rules(DefFormConfig(max_def_length, max_inline_args))
+        self.issues: list[BaseDefFormException] = []
+
+    @cached_property
+    def skip_lines(self) -> frozenset[int]:
+        if self.source is not None:
+            return self.source.skip_lines
+
+        try:
+            with Path.open(Path(self.filepath), encoding='utf-8') as f:
+                self.source = SourceIndex(f.read())
+        except (OSError, UnicodeDecodeError):
+            return frozenset()
+
+        return self.source.skip_lines
+
+    def _is_newline_slot(
+        self,
+        tokens: Sequence[tokenize.TokenInfo],
+        index: int,
+        expected_whitespace: str,
+    ) -> bool:
+        # Mirrors libcst's ParenthesizedWhitespace after tokens[index]: an optional trailing
+        # comment, a newline, any blank or comment-only lines, then the indentation of the
+        # next token, which must be the block indentation plus `expected_whitespace`.
+        i = index + 1
+        if i < len(tokens) and tokens[i].type == tokenize.COMMENT:
+            i += 1
+        if i >= len(tokens) or tokens[i].type != tokenize.NL:
+            return False
+
+        while i < len(tokens) and tokens[i].type in SKIPPED_TOKENS:
+            i += 1
+        if i >= len(tokens):
+            return False
+
+        return tokens[i].line[: tokens[i].start[1]] == expected_whitespace
+
+    def has_correct_multiline_params_format(
+        self,
+        lines: Sequence[str],
+        line_no: int,
+        block_indent: str,
+    ) -> bool:
+        tokens = _params_tokens(lines, line_no)
+        if not tokens:
+            return False
+
+        expected_indent = block_indent + ' ' * self.indent_size
+        if not self._is_newline_slot(tokens, 0, expected_indent):
+            return False
+
+        params = _list_params(tokens)
+        if not params:
+            return True
+
+        for comma in params[:-1]:
+            if comma is None or not self._is_newline_slot(tokens, comma, expected_indent):
+                return False
+
+        last_comma = params[-1]
+        return last_comma is not None and self._is_newline_slot(tokens, last_comma, block_indent)
+
+    def _analyze(self, node: AnyFunctionDef, lines: Sequence[str]) -> list[BaseDefFormException]:
+        line_no = node.lineno
+        if line_no in self.skip_lines or line_no - 1 in self.skip_lines:
+            return []
+
+        arg_count = _count_arguments(node.args)
+        if arg_count == 0:
+            return []
+
+        line = lines[line_no - 1]
+        col_offset = node.col_offset
+
+        context = RuleContext(
+            filepath=self.filepath,
+            line_no=line_no,
+            arg_count=arg_count,
+            indent_size=self.indent_size,
+            max_def_length=self.max_def_length,
+            max_inline_args=self.max_inline_args,
+            def_line=lambda: line[col_offset:].rstrip('\r\n'),
+            multiline_format=lambda: self.has_correct_multiline_params_format(lines, line_no, line[:col_offset]),
+        )
+        return run_rules(context, self.rules)
+
+    def _visit(self, node: ast.AST, lines: Sequence[str]) -> None:
+        # Post-order, so issues come out in the same order as DefChecker.leave_FunctionDef.
+        for child in ast.iter_child_nodes(node):
+            self._visit(child, lines)
+
+        if isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef):
+            self.issues.extend(self._analyze(node, lines))
+
+    def check_source(self, code: str) -> list[BaseDefFormException]:
+        if self.source is None:
+            self.source = SourceIndex(code)
+
+        tree = ast.parse(code)
+        # Split on the same line endings as ast and libcst, unlike str.splitlines.
+        lines = io.StringIO(code, newline='').readlines()
+        self._visit(tree, lines)
+        return self.issues
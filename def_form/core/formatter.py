@@ -1,38 +1,125 @@
-from libcst import CSTTransformer
+import re
+
+from libcst import BaseParenthesizableWhitespace
 from libcst import FunctionDef
+from libcst import IndentedBlock
+from libcst import Match
+from libcst import Module
+from libcst import Parameters
+from libcst._nodes.internal import CodegenState
+from libcst.metadata import CodePosition
 
 from def_form.core.base import DefBase
+from def_form.core.base import DefVisitor
+from def_form.core.edits import TextEdit
+from def_form.core.profiling import timed
+from def_form.core.rules import Rule
+from def_form.core.source import SourceIndex
 from def_form.core.node_builder import build_parameters
 
+# The same line endings libcst and ast split on.
+NEWLINE = re.compile(r'\r\n?|\n')
+
+
+def advance(position: CodePosition, text: str) -> CodePosition:
+    newlines = list(NEWLINE.finditer(text))
+    if not newlines:
+        return CodePosition(position.line, position.column + len(text))
+    return CodePosition(position.line + len(newlines), len(text) - newlines[-1].end())
+
 
-class DefFormatter(DefBase, CSTTransformer):
-    def __init__(
+class DefFormatter(DefBase, DefVisitor):
+    def __init__(  # noqa: PLR0913
         self,
         filepath: str,
         max_def_length: int | None,
         max_inline_args: int | None,
         indent_size: int | None = None,
+        source: SourceIndex | None = None,
+        rules: tuple[Rule, ...] | None = None,
     ):
         super().__init__(
             filepath=filepath,
             max_def_length=max_def_length,
             max_inline_args=max_inline_args,
             indent_size=indent_size,
+            source=source,
+            rules=rules,
+        )
+        self.edits: list[TextEdit] = []
+        self.default_indent = ' ' * 4
+        self.default_newline = '\n'
+        self.indent_tokens: list[str] = []
+
+    def visit_Module(self, node: Module) -> None:
+        self.default_indent = node.default_indent
+        self.default_newline = node.default_newline
+
+    def visit_IndentedBlock(self, node: IndentedBlock) -> None:
+        self.indent_tokens.append(self.default_indent if node.indent is None else node.indent)
+
+    def leave_IndentedBlock(self, original_node: IndentedBlock) -> None:
+        self.indent_tokens.pop()
+
+    # Case clauses are indented by the match statement itself, not by an IndentedBlock.
+    def visit_Match(self, node: Match) -> None:
+        self.indent_tokens.append(self.default_indent if node.indent is None else node.indent)
+
+    def leave_Match(self, original_node: Match) -> None:
+        self.indent_tokens.pop()
+
+    def codegen_state(self) -> CodegenState:
+        return CodegenState(
+            default_indent=self.default_indent,
+            default_newline=self.default_newline,
+            indent_tokens=list(self.indent_tokens),
         )
 
-    def leave_FunctionDef(self, original_node: FunctionDef, updated_node: FunctionDef) -> FunctionDef:
+    def render_params(self, whitespace: BaseParenthesizableWhitespace, params: Parameters) -> str:
+        # Render only the text between the parentheses, indented as it would be inside the module.
+        state = self.codegen_state()
+        whitespace._codegen(state)  # noqa: SLF001
+        params._codegen(state)  # noqa: SLF001
+        return ''.join(state.tokens)
+
+    def params_start(self, node: FunctionDef) -> CodePosition:
+        # Just after '(': the def's start plus the header text up to it, rendered as codegen does.
+        state = self.codegen_state()
+        if node.asynchronous is not None:
+            node.asynchronous._codegen(state)  # noqa: SLF001
+        state.add_token('def')
+        node.whitespace_after_def._codegen(state)  # noqa: SLF001
+        node.name._codegen(state)  # noqa: SLF001
+        node.whitespace_after_name._codegen(state)  # noqa: SLF001
+        state.add_token('(')
+        return advance(self.def_start(node), ''.join(state.tokens))
+
+    def leave_FunctionDef(self, original_node: FunctionDef) -> None:
         analysis = self.analyze_function(original_node)
         if not analysis.should_process:
-            return updated_node
+            return
         if analysis.issues:
             self.issues.extend(analysis.issues)
-        is_single_line = self.is_single_line_function(original_node)
-        params, whitespace_before_params = build_parameters(
-            updated_node,
-            is_single_line=is_single_line,
-            indent_size=self.indent_size,
-        )
-        return updated_node.with_changes(
-            params=params,
-            whitespace_before_params=whitespace_before_params,
+        with timed(self.profile, 'codegen'):
+            params, whitespace_before_params = build_parameters(
+                original_node,
+                is_single_line=bool(analysis.is_single_line),
+                indent_size=self.indent_size,
+            )
+
+            text = self.render_params(whitespace_before_params, params)
+            original = self.render_params(original_node.whitespace_before_params, original_node.params)
+            if text == original:
+                return
+
+        start = self.params_start(original_node)
+        end = advance(start, original)
+        self.edits.append(
+            TextEdit(
+                start_line=start.line,
+                start_column=start.column,
+                end_line=end.line,
+                end_column=end.column,
+                text=text,
+            )
         )
@@ -1,37 +1,108 @@
+import json
 import os
+import stat
+import time
+from collections import deque
+from collections.abc import Callable
 from collections.abc import Generator
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Sequence
+from concurrent.futures import Executor
+from contextlib import suppress
+from itertools import chain
+from itertools import islice
 from pathlib import Path
 
 import tomli
-import libcst as cst
 
 from def_form.cli.ui import BaseUI
 from def_form.exceptions.base import BaseDefFormException
 from def_form.exceptions.def_formatter import CheckCommandFoundAnIssue
-from def_form.core.checker import DefChecker
-from def_form.core.formatter import DefFormatter
+from def_form.core.cache import CACHE_DIR_NAME
+from def_form.core.cache import DEFAULT_MAX_SIZE
+from def_form.core.cache import CacheEntry
+from def_form.core.cache import ResultCache
+from def_form.core.config import DefFormConfig
+from def_form.core.digests import DirectoryDigests
+from def_form.core.events import CACHE_HIT
+from def_form.core.events import FILE_DISCOVERED
+from def_form.core.events import FILE_FINISHED
+from def_form.core.events import FILE_STARTED
+from def_form.core.events import ISSUE_FOUND
+from def_form.core.events import WRITE_PERFORMED
+from def_form.core.events import EventHooks
+from def_form.core.exclusions import GIT_DIR
+from def_form.core.exclusions import GITIGNORE
+from def_form.core.exclusions import ExclusionMatcher
+from def_form.core.exclusions import IgnoreRules
+from def_form.core.exclusions import inherited_ignore_rules
+from def_form.core.exclusions import is_glob
+from def_form.core.fast_checker import FAST_BACKEND
+from def_form.core.fast_checker import resolve_backend
+from def_form.core.manifest import StatKey
+from def_form.core.manifest import StatManifest
+from def_form.core.manifest import stat_key
+from def_form.core.models import FileResult
+from def_form.core.models import RunStats
+from def_form.core.parallel import iter_parallel
+from def_form.core.parallel import resolve_jobs
+from def_form.core.pipeline import BackgroundIterator
+from def_form.core.pipeline import iter_prefetched
+from def_form.core.pipeline import tap
+from def_form.core.processing import CHECKER
+from def_form.core.processing import FAST_CHECKER
+from def_form.core.processing import FORMATTER
+from def_form.core.processing import Processor
+from def_form.core.processing import process_text
+from def_form.core.processing import rewrites_source
+from def_form.core.profiling import DEFAULT_TOP
+from def_form.core.profiling import RunProfile
+from def_form.core.profiling import timed
+from def_form.core.rules import resolve_rule_names
+from def_form.utils.atomic_write import atomic_write
 from def_form.utils.find_pyproject import find_pyproject_toml
+from def_form.utils.git import changed_files
+from def_form.utils.git import find_git_root
 
 
 class DefManager:
     def __init__(  # noqa: PLR0913
         self,
-        path: str,
+        path: str | Sequence[str],
         ui: BaseUI,
         excluded: tuple[str, ...] | None = None,
-        formatter: type[DefFormatter] = DefFormatter,
-        checker: type[DefChecker] = DefChecker,
+        formatter: Processor = FORMATTER,
+        checker: Processor = CHECKER,
         max_def_length: int | None = None,
         max_inline_args: int | None = None,
         indent_size: int | None = None,
         config: str | None = None,
         show_skipped: bool = False,
+        jobs: int | str | None = None,
+        cache: bool = True,
+        cache_dir: str | None = None,
+        cache_max_size: int | None = None,
+        backend: str | None = None,
+        changed_since: str | None = None,
+        staged: bool = False,
+        profile: bool = False,
+        profile_top: int = DEFAULT_TOP,
+        profile_output: str | None = None,
     ) -> None:
         self.config: str | None = config or find_pyproject_toml()
-        self.path = Path(path).resolve()
+        self.paths = self._resolve_paths(path)
+        self.path = self.paths[0] if self.paths else Path.cwd()
         self.ui = ui
+        self.changed_since = changed_since
+        self.staged = staged
+        self.show_skipped = show_skipped
 
         self.issues: list[BaseDefFormException] = []
+        self.stats = RunStats()
+        self.executor: Executor | None = None
+        self.profile = RunProfile(top=profile_top, output=profile_output) if profile or profile_output else None
+        self.events = EventHooks()
 
         self.formatter_class = formatter
         self.checker_class = checker
@@ -41,9 +112,18 @@ class DefManager:
             max_def_length=max_def_length,
             max_inline_args=max_inline_args,
             indent_size=indent_size,
+            jobs=jobs,
+            cache=cache,
+            cache_dir=cache_dir,
+            cache_max_size=cache_max_size,
+            backend=backend,
         )
 
+        if self.backend == FAST_BACKEND:
+            self.checker_class = FAST_CHECKER
+
         self._init_exclusions(excluded or ())
+        self._init_cache()
 
         self.ui.show_config_info(
             config_path=self.config,
@@ -51,23 +131,42 @@ class DefManager:
             max_def_length=self.max_def_length,
             indent_size=f'{self.indent_size} spaces',
             show_skipped=show_skipped,
+            changed_since=self.changed_since,
+            staged=self.staged,
+            jobs=self.jobs,
+            backend=self.backend,
+            cache=self.cache is not None,
             excluded=self.excluded,
+            exclude_patterns=self.exclude_patterns,
         )
 
     # --------------------------------------------------------------------- #
     # Configuration
     # --------------------------------------------------------------------- #
 
-    def _init_config(
+    def _init_config(  # noqa: PLR0913
         self,
         config: str | None,
         max_def_length: int | None,
         max_inline_args: int | None,
         indent_size: int | None,
+        jobs: int | str | None = None,
+        cache: bool = True,
+        cache_dir: str | None = None,
+        cache_max_size: int | None = None,
+        backend: str | None = None,
     ) -> None:
         self.max_def_length = max_def_length
         self.max_inline_args = max_inline_args
         self.indent_size = indent_size
+        self.select: tuple[str, ...] | None = None
+        self.ignore: tuple[str, ...] = ()
+        self.jobs = resolve_jobs(jobs)
+        self.backend = resolve_backend(backend)
+        self.cache_enabled = cache
+        self.cache_dir = cache_dir
+        self.cache_max_size = cache_max_size if cache_max_size is not None else DEFAULT_MAX_SIZE
+        self.respect_gitignore = True
 
         self._config_excluded: list[str] = []
 
@@ -92,168 +191,516 @@ class DefManager:
                 'indent_size',
                 self.indent_size,
             )
+            select = config_def.get('select')
+            self.select = resolve_rule_names(select, 'select') if select is not None else None
+            self.ignore = resolve_rule_names(config_def.get('ignore', ()), 'ignore')
+            # Options given on the command line win over the project file.
+            if jobs is None:
+                self.jobs = resolve_jobs(config_def.get('jobs'))
+            if backend is None:
+                self.backend = resolve_backend(config_def.get('backend'))
+            self.cache_enabled = self.cache_enabled and config_def.get('cache', True)
+            if cache_dir is None:
+                self.cache_dir = config_def.get('cache_dir')
+            if cache_max_size is None:
+                self.cache_max_size = config_def.get('cache_max_size', DEFAULT_MAX_SIZE)
+            self.respect_gitignore = config_def.get('respect_gitignore', self.respect_gitignore)
             self._config_excluded = config_def.get('exclude', [])
 
         except (FileNotFoundError, tomli.TOMLDecodeError):
             self._config_excluded = []
 
+    @property
+    def settings(self) -> DefFormConfig:
+        return DefFormConfig(
+            max_def_length=self.max_def_length,
+            max_inline_args=self.max_inline_args,
+            indent_size=self.indent_size,
+            select=self.select,
+            ignore=self.ignore,
+        )
+
+    def _init_cache(self) -> None:
+        self.cache: ResultCache | None = None
+        self.manifest: StatManifest | None = None
+        self.digests: DirectoryDigests | None = None
+
+        if not self.cache_enabled:
+            return
+
+        if self.cache_dir:
+            directory = Path(self.cache_dir)
+        elif self.config and Path(self.config).is_file():
+            directory = Path(self.config).parent / CACHE_DIR_NAME
+        else:
+            directory = Path.cwd() / CACHE_DIR_NAME
+
+        self.cache = ResultCache(
+            directory=directory.resolve(),
+            config=self.settings,
+            max_size=self.cache_max_size,
+        )
+        self.manifest = StatManifest(self.cache.directory, self.cache.fingerprint)
+
+        # Clean subtrees are skipped without listing them, so their excluded files are
+        # not reported; --show-skipped walks everything to list them.
+        if not self.show_skipped:
+            exclusions = [
+                sorted(map(str, self.excluded)),
+                self.exclude_patterns,
+                self.respect_gitignore,
+                str(Path.cwd()),
+            ]
+            fingerprint = self.cache.fingerprint + json.dumps(exclusions).encode('utf-8')
+            self.digests = DirectoryDigests(self.cache.directory, fingerprint)
+
+    @staticmethod
+    def _resolve_paths(path: str | Sequence[str]) -> list[Path]:
+        # Explicit paths keep their order; the same file or directory given twice is processed once.
+        raw_paths = [path] if isinstance(path, str) else path
+        return list(dict.fromkeys(Path(p).resolve() for p in raw_paths))
+
     # --------------------------------------------------------------------- #
     # Exclusions
     # --------------------------------------------------------------------- #
 
     def _init_exclusions(self, cli_excluded: tuple[str, ...]) -> None:
-        self.excluded: set[Path] = set()
+        paths: set[Path] = set()
+        patterns: list[str] = []
 
         for p in (*cli_excluded, *self._config_excluded):
+            if is_glob(p):
+                patterns.append(p)
+                continue
             try:
-                self.excluded.add(Path(p).resolve())
+                paths.add(Path(p).resolve())
             except Exception:
                 continue
 
-    def _is_excluded(self, path: Path) -> bool:
-        for excluded in self.excluded:
-            try:
-                path.relative_to(excluded)
-                return True
-            except ValueError:
-                pass
+        self.exclude_patterns = tuple(patterns)
+        self.excluded = paths
+
+    @property
+    def excluded(self) -> set[Path]:
+        return self._excluded
 
-            if excluded.name in path.parts:
-                return True
+    @excluded.setter
+    def excluded(self, paths: set[Path]) -> None:
+        # Exclusions are compiled once into a matcher; assigning a new set recompiles it.
+        self._excluded = set(paths)
+        self._matcher = ExclusionMatcher(self._excluded, self.exclude_patterns, base=Path.cwd())
 
-        return False
+    def _is_excluded(self, path: Path) -> bool:
+        return self._matcher.excludes(path)
 
     # --------------------------------------------------------------------- #
     # File iteration
     # --------------------------------------------------------------------- #
 
-    def _iter_py_files(self) -> Generator[Path, None, None]:
-        if self.path.is_file():
-            if self.path.suffix != '.py':
+    def _iter_py_files(self, on_skipped: Callable[[Path], None] | None = None) -> Generator[Path, None, None]:
+        skipped = on_skipped or self.ui.skipped
+
+        if self.changed_since is not None or self.staged:
+            yield from self._iter_changed_py_files(skipped)
+            return
+
+        # Overlapping paths (a directory and a file inside it) must not yield a file twice.
+        seen: set[Path] = set()
+        for path in self.paths:
+            for file_path in self._iter_path_py_files(path, skipped):
+                if file_path not in seen:
+                    seen.add(file_path)
+                    yield file_path
+
+    def _iter_path_py_files(self, path: Path, skipped: Callable[[Path], None]) -> Generator[Path, None, None]:
+        if path.is_file():
+            if path.suffix != '.py':
                 return
 
-            if self._is_excluded(self.path):
-                self.ui.skipped(self.path)
+            if self._is_excluded(path):
+                skipped(path)
                 return
 
-            yield self.path
+            yield path
+            return
+
+        if self._is_excluded(path):
+            skipped(path)
             return
 
-        for root, dirs, files in os.walk(self.path):
-            root_path = Path(root)
+        rules = inherited_ignore_rules(path) if self.respect_gitignore else ()
+        if self.digests is not None and self.digests.skip(os.fspath(path), rules):
+            return
+
+        yield from self._walk_py_files(path, rules, skipped)
 
-            dirs[:] = [d for d in dirs if not self._is_excluded(root_path / d)]
+    def _walk_py_files(
+        self,
+        path: Path,
+        root_rules: tuple[IgnoreRules, ...],
+        skipped: Callable[[Path], None],
+    ) -> Generator[Path, None, None]:
+        # Ignore rules are keyed by directory; each directory inherits its parent's rules
+        # plus its own .gitignore. Pruning only looks at names, so it costs no stat calls.
+        ignore_rules = {os.fspath(path): root_rules}
+        excludes = self._matcher.excludes_entry
+        digests = self.digests
+
+        for root, dirs, files in os.walk(path):
+            inherited = rules = ignore_rules.pop(root)
+            if self.respect_gitignore and GITIGNORE in files:
+                own_rules = IgnoreRules.from_file(Path(root), Path(root, GITIGNORE))
+                if own_rules is not None:
+                    rules = (*rules, own_rules)
+
+            # Subdirectories whose recorded subtree is still clean are kept out of the walk.
+            kept = []
+            clean = []
+            for dirname in dirs:
+                dir_path = os.path.join(root, dirname)  # noqa: PTH118
+                # The cache sits next to pyproject.toml, usually inside the tree being walked.
+                if dirname == CACHE_DIR_NAME or (self.respect_gitignore and dirname == GIT_DIR):
+                    continue
+                if excludes(dir_path, dirname, True, rules):
+                    continue
+                if digests is not None and digests.skip(dir_path, rules):
+                    clean.append(dirname)
+                    continue
+                ignore_rules[dir_path] = rules
+                kept.append(dirname)
+            dirs[:] = kept
 
+            py_files = []
             for filename in files:
                 if not filename.endswith('.py'):
                     continue
 
-                file_path = root_path / filename
+                file_path = Path(root, filename)
 
-                if self._is_excluded(file_path):
-                    self.ui.skipped(file_path)
+                if excludes(os.fspath(file_path), filename, False, rules):
+                    skipped(file_path)
                     continue
 
+                py_files.append(filename)
                 yield file_path
 
+            if digests is not None:
+                digests.walked(root, inherited, rules, py_files, [*kept, *clean])
+
+    def _iter_changed_py_files(self, skipped: Callable[[Path], None]) -> Generator[Path, None, None]:
+        # Paths may live in different repositories; each repository is asked once, about its own paths.
+        paths_by_root: dict[Path, list[Path]] = {}
+        for path in self.paths or [self.path]:
+            paths_by_root.setdefault(find_git_root(path), []).append(path)
+
+        for root, paths in paths_by_root.items():
+            yield from self._iter_changed_py_files_in(root, paths, skipped)
+
+    def _iter_changed_py_files_in(
+        self,
+        root: Path,
+        paths: list[Path],
+        skipped: Callable[[Path], None],
+    ) -> Generator[Path, None, None]:
+        for file_path in changed_files(root, changed_since=self.changed_since, staged=self.staged):
+            if file_path.suffix != '.py' or not file_path.is_file():
+                continue
+
+            if not any(file_path == path or path in file_path.parents for path in paths):
+                continue
+
+            if self._is_excluded(file_path):
+                skipped(file_path)
+                continue
+
+            yield file_path
+
     # --------------------------------------------------------------------- #
     # Processing
     # --------------------------------------------------------------------- #
 
-    def _create_processor(
+    def _iter_results(
         self,
-        processor_class: type[DefFormatter] | type[DefChecker],
-        filepath: str,
-    ) -> DefFormatter | DefChecker:
-        return processor_class(
-            filepath=filepath,
-            max_def_length=self.max_def_length,
-            max_inline_args=self.max_inline_args,
-            indent_size=self.indent_size,
-        )
-
-    def _process_file(
+        files: Iterable[Path],
+        processor_class: Processor,
+    ) -> Iterator[FileResult]:
+        if self.manifest is None:
+            return self._iter_processed(files, processor_class)
+        return self._iter_unchanged_or_processed(files, processor_class, self.manifest)
+
+    def _iter_unchanged_or_processed(
         self,
-        filepath: Path,
-        processor_class: type[DefFormatter] | type[DefChecker],
-    ) -> tuple[cst.Module | None, list[BaseDefFormException]]:
-        try:
-            code = filepath.read_text(encoding='utf-8')
-        except (OSError, UnicodeDecodeError):
-            return None, []
+        files: Iterable[Path],
+        processor_class: Processor,
+        manifest: StatManifest,
+    ) -> Iterator[FileResult]:
+        # Files whose stat matches the manifest are answered without being opened; the rest
+        # go through processing. The stat runs where the pipeline pulls its input (a feeder
+        # thread), and answered files are queued so results still come out in walk order.
+        is_formatter = rewrites_source(processor_class)
+        order: deque[tuple[StatKey | None, FileResult | None]] = deque()
+
+        def misses() -> Iterator[Path]:
+            for path in files:
+                try:
+                    key: StatKey | None = stat_key(path.stat())
+                except OSError:
+                    key = None
+
+                entry = manifest.get(str(path), key) if key is not None else None
+                if entry is not None and not (is_formatter and entry.changed):
+                    order.append((key, FileResult(path=path, issues=entry.issues_for(path), cache_hit=True)))
+                    continue
 
-        try:
-            tree = cst.parse_module(code)
-            wrapper = cst.metadata.MetadataWrapper(tree)
-            processor = self._create_processor(processor_class, str(filepath))
+                order.append((key, None))
+                yield path
 
-            if issubclass(processor_class, DefFormatter):
-                new_tree = wrapper.visit(processor)
-                return new_tree, processor.issues
+        for result in self._iter_processed(misses(), processor_class):
+            key, answered = order.popleft()
+            while answered is not None:
+                yield answered
+                key, answered = order.popleft()
 
-            wrapper.visit(processor)
-            return None, processor.issues
+            # A rewritten file gets a new stat, so only results that leave the file as is are kept.
+            if key is not None and result.code is None:
+                changed = not is_formatter and bool(result.issues)
+                manifest.put(str(result.path), key, CacheEntry.build(result.issues, changed))
+            yield result
 
-        except cst.ParserSyntaxError:
-            return None, []
-        except Exception:
-            return None, []
+        yield from (answered for _, answered in order if answered is not None)
+
+    def _iter_processed(
+        self,
+        files: Iterable[Path],
+        processor_class: Processor,
+    ) -> Iterator[FileResult]:
+        # files may be a stream still being discovered; a single file never starts a pool.
+        paths = iter(files)
+        head = list(islice(paths, 2))
+
+        if self.jobs > 1 and len(head) > 1:
+            yield from iter_parallel(
+                chain(head, paths),
+                processor_class,
+                self.settings,
+                self.jobs,
+                self.cache,
+                self.executor,
+                profile=self._profiling,
+            )
+            return
+
+        yield from iter_prefetched(chain(head, paths), processor_class, self.settings, self.cache, self._profiling)
+
+    @property
+    def _profiling(self) -> bool:
+        # Event subscribers get per-file durations and sizes from the same measurements.
+        return self.profile is not None or bool(self.events)
 
     def _write(
         self,
         dest: str | Path,
         module: str,
     ) -> None:
+        # Write through symlinks and replace the target atomically, keeping its permissions.
+        target = Path(os.path.realpath(dest))
+        data = module.encode('utf-8')
         try:
-            Path(dest).write_text(module, encoding='utf-8')
+            mode = stat.S_IMODE(target.stat().st_mode) if target.exists() else None
+            atomic_write(target, data, mode=mode)
         except OSError:
             self.ui.console.error(f'Exception occurred while writing to {dest}')
+            return
 
-    # --------------------------------------------------------------------- #
-    # Public API
-    # --------------------------------------------------------------------- #
+        if self.events:
+            self.events.emit(WRITE_PERFORMED, dest, bytes=len(data))
+
+    def _emit_queued(self, queued: deque[tuple[str, Path, float]]) -> None:
+        while queued:
+            kind, path, timestamp = queued.popleft()
+            self.events.emit(kind, path, timestamp)
+
+    def _emit_result(self, result: FileResult, queued: deque[tuple[str, Path, float]]) -> None:
+        self._emit_queued(queued)
+
+        if result.cache_hit:
+            self.events.emit(CACHE_HIT, result.path)
+
+        for issue in result.issues:
+            self.events.emit(ISSUE_FOUND, issue.path, line=issue.line, kind=issue.kind, message=issue.message)
+
+    def _emit_finished(self, result: FileResult) -> None:
+        profile = result.profile
+        self.events.emit(
+            FILE_FINISHED,
+            result.path,
+            duration=profile.total if profile is not None else 0.0,
+            bytes=profile.size if profile is not None else 0,
+            phases=dict(profile.wall) if profile is not None else {},
+            issues=len(result.issues),
+            cache_hit=result.cache_hit,
+            prefiltered=result.prefiltered,
+        )
 
-    def format(self) -> None:
+    def _start_discovery(
+        self,
+        skipped: deque[Path],
+        queued: deque[tuple[str, Path, float]],
+    ) -> tuple[BackgroundIterator[Path], Iterable[Path]]:
+        # The walk runs on its own thread and feeds processing through a bounded queue.
+        # Skipped files are queued too, so every UI call stays on this thread.
+        walk = self._iter_py_files(on_skipped=skipped.append)
+        if not self.events:
+            discovery = BackgroundIterator(walk)
+            return discovery, discovery
+
+        # Discovery and hand-off to processing happen on other threads; their events are
+        # queued with the time they happened and delivered from this thread, in order.
+        discovery = BackgroundIterator(tap(walk, lambda path: queued.append((FILE_DISCOVERED, path, time.time()))))
+        return discovery, tap(discovery, lambda path: queued.append((FILE_STARTED, path, time.time())))
+
+    def _collect(self, result: FileResult) -> None:
+        self.stats.add(result)
+        if not result.issues:
+            return
+
+        self.ui.report(result.path, result.issues)
+        if self.ui.collects_issues:
+            self.issues.extend(result.exceptions())
+
+    def _start_run(self) -> None:
         self.issues.clear()
-        files = list(self._iter_py_files())
+        self.stats = RunStats()
+        if self.manifest is not None:
+            self.manifest.start()
+        if self.digests is not None:
+            self.digests.start()
 
-        self.ui.start(total=len(files))
+    def _run(
+        self,
+        processor_class: Processor,
+        on_result: Callable[[FileResult], None] | None = None,
+    ) -> None:
+        self._start_run()
 
-        for path in files:
-            self.ui.processing(path)
+        skipped: deque[Path] = deque()
+        queued: deque[tuple[str, Path, float]] = deque()
+        discovery, files = self._start_discovery(skipped, queued)
+        total_final = False
+        processed = 0
 
-            new_tree, file_issues = self._process_file(
-                path,
-                self.formatter_class,
-            )
+        if self.profile is not None:
+            self.profile.start()
 
-            self.issues.extend(file_issues)
+        self.ui.start(total=None)
 
-            if new_tree is not None:
-                self._write(
-                    dest=path,
-                    module=new_tree.code,
-                )
+        for result in self._iter_results(files, processor_class):
+            while skipped:
+                self.ui.skipped(skipped.popleft())
 
-        self.ui.finish(len(files), self.issues)
+            if self.events:
+                self._emit_result(result, queued)
 
-    def check(self) -> None:
+            if not total_final:
+                total_final = discovery.finished
+                self.ui.update_total(discovery.produced, final=total_final)
+
+            processed += 1
+            self.ui.processing(result.path)
+            self._collect(result)
+
+            if on_result is not None:
+                on_result(result)
+
+            if self.events:
+                self._emit_finished(result)
+
+            if self.profile is not None:
+                self.profile.add(result)
+
+        while skipped:
+            self.ui.skipped(skipped.popleft())
+
+        if self.events:
+            self._emit_queued(queued)
+
+        if not total_final:
+            self.ui.update_total(processed, final=True)
+
+        self._save_cache()
+        self.ui.finish(processed, self.issues, **self.stats.summary(cache_enabled=self.cache is not None))
+        self._report_profile()
+
+    def _save_cache(self) -> None:
+        if self.cache is not None and self.stats.parsed:
+            self.cache.prune()
+
+        if self.manifest is not None:
+            self.manifest.save()
+
+        if self.digests is not None and self.manifest is not None:
+            self.digests.update(self.manifest.entries)
+            self.digests.save()
+            self.stats.clean_dirs = self.digests.skipped_dirs
+            self.stats.clean_files = self.digests.skipped_files
+
+    def _report_profile(self) -> None:
+        if self.profile is None:
+            return
+
+        self.profile.stop()
+        self.profile.save()
+        self.ui.show_profile(self.profile)
+
+    def _run_source(
+        self,
+        code: str,
+        filepath: Path,
+        processor_class: Processor,
+    ) -> FileResult:
+        # In-memory counterpart of _run for a single buffer, e.g. one read from stdin.
         self.issues.clear()
-        files = list(self._iter_py_files())
+        self.stats = RunStats()
 
-        self.ui.start(total=len(files))
+        if self._is_excluded(filepath):
+            self.ui.skipped(filepath)
+            return FileResult(path=filepath)
 
-        for path in files:
-            self.ui.processing(path)
+        result = process_text(code, filepath, processor_class, self.settings, self.cache)
+        self.stats.add(result)
+        self.issues.extend(result.exceptions())
 
-            _, file_issues = self._process_file(
-                path,
-                self.checker_class,
+        return result
+
+    def _write_result(self, result: FileResult) -> None:
+        if result.code is None:
+            self.stats.unchanged += 1
+            with suppress(OSError):
+                self.stats.write_bytes_saved += result.path.stat().st_size
+            return
+
+        self.stats.reformatted += 1
+        with timed(result.profile, 'write'):
+            self._write(
+                dest=result.path,
+                module=result.code,
             )
 
-            self.issues.extend(file_issues)
+    # --------------------------------------------------------------------- #
+    # Public API
+    # --------------------------------------------------------------------- #
 
-        self.ui.finish(len(files), self.issues)
+    def format(self) -> None:
+        self._run(self.formatter_class, on_result=self._write_result)
+
+    def check(self) -> None:
+        self._run(self.checker_class)
 
-        if self.issues:
+        if self.stats.issues:
             raise CheckCommandFoundAnIssue(str(self.path), 'check command did found an issue')
+
+    def format_source(self, code: str, filepath: Path) -> FileResult:
+        return self._run_source(code, filepath, self.formatter_class)
+
+    def check_source(self, code: str, filepath: Path) -> FileResult:
+        return self._run_source(code, filepath, self.checker_class)
@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from def_form.core.cache import CacheEntry
+from def_form.utils.atomic_write import atomic_write
+
+MANIFEST_PREFIX = 'manifest-'
+MANIFEST_SUFFIX = '.log'
+COMPACT_MIN_RECORDS = 4096
+COMPACT_RATIO = 2
+# A file changed within this window of a run's start could change again without its stat
+# moving on coarse clocks, so it is not trusted until a later run.
+RACY_WINDOW_NS = 2_000_000_000
+
+StatKey = tuple[int, int, int]
+
+
+def stat_key(st: os.stat_result) -> StatKey:
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+class StatManifest:
+    # The last result of every file, keyed by resolved path and valid while the file's
+    # (mtime_ns, size, inode) stays the same, so unchanged files are answered from one stat
+    # without being read or hashed. There is one manifest per config fingerprint.
+    #
+    # Stored as an append-only log of JSON lines: a run appends only the files whose result
+    # changed, later lines win on load, and the log is rewritten once it is mostly stale.
+    def __init__(self, directory: Path, fingerprint: bytes) -> None:
+        digest = hashlib.sha256(fingerprint).hexdigest()[:16]
+        self.path = directory / f'{MANIFEST_PREFIX}{digest}{MANIFEST_SUFFIX}'
+        self.entries: dict[str, tuple[StatKey, CacheEntry]] = {}
+        self.records = 0
+        self._pending: list[str] = []
+        self._load()
+        self.start()
+
+    def start(self) -> None:
+        self._started = time.time_ns()
+
+    def settled(self, mtime_ns: int) -> bool:
+        return mtime_ns < self._started - RACY_WINDOW_NS
+
+    def _load(self) -> None:
+        try:
+            with self.path.open('rb') as f:
+                for line in f:
+                    self.records += 1
+                    # A torn line from an interrupted append only loses that file's record.
+                    try:
+                        path, mtime_ns, size, ino, issues, changed = json.loads(line)
+                        entry = CacheEntry(issues=tuple(tuple(issue) for issue in issues), changed=bool(changed))
+                    except (ValueError, TypeError):
+                        continue
+                    self.entries[path] = ((mtime_ns, size, ino), entry)
+        except OSError:
+            return
+
+    def get(self, path: str, key: StatKey) -> CacheEntry | None:
+        record = self.entries.get(path)
+        if record is None or record[0] != key:
+            return None
+        return record[1]
+
+    def put(self, path: str, key: StatKey, entry: CacheEntry) -> None:
+        # A same-size rewrite in the same mtime tick would otherwise be answered from this record.
+        if not self.settled(key[0]) or self.entries.get(path) == (key, entry):
+            return
+        self.entries[path] = (key, entry)
+        self._pending.append(self._line(path, key, entry))
+
+    @staticmethod
+    def _line(path: str, key: StatKey, entry: CacheEntry) -> str:
+        return json.dumps([path, *key, entry.issues, entry.changed]) + '\n'
+
+    def save(self) -> None:
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, []
+        self.records += len(pending)
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.records > max(COMPACT_MIN_RECORDS, len(self.entries) * COMPACT_RATIO):
+                self._compact()
+                return
+            # One write per run; O_APPEND keeps concurrent runs from overwriting each other.
+            with self.path.open('a', encoding='utf-8') as f:
+                f.write(''.join(pending))
+        except OSError:
+            return
+
+    def _compact(self) -> None:
+        # Files that no longer exist are dropped while the log is rewritten anyway.
+        self.entries = {path: record for path, record in self.entries.items() if Path(path).exists()}
+        lines = [self._line(path, key, entry) for path, (key, entry) in self.entries.items()]
+        atomic_write(self.path, ''.join(lines).encode('utf-8'))
+        self.records = len(lines)
@@ -1,9 +1,16 @@
 from dataclasses import dataclass
-
-from libcst import FunctionDef
-from libcst._position import CodeRange
+from dataclasses import field
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 from def_form.exceptions.base import BaseDefFormException
+from def_form.core.edits import TextEdit
+
+if TYPE_CHECKING:
+    from libcst import FunctionDef
+    from libcst._position import CodePosition
+
+    from def_form.core.profiling import FileProfile
 
 
 @dataclass
@@ -12,11 +19,112 @@ class FunctionAnalysis:
     reason: str | None = None
     line_length: int | None = None
     arg_count: int | None = None
+    is_single_line: bool | None = None
     line_no: int | None = None
-    pos: CodeRange | None = None
-    node: FunctionDef | None = None
+    start: 'CodePosition | None' = None
+    node: 'FunctionDef | None' = None
     issues: list[BaseDefFormException] | None = None
 
     def __post_init__(self) -> None:
         if self.issues is None:
             self.issues = []
+
+
+def _exception_types(
+    base: type[BaseDefFormException] = BaseDefFormException,
+) -> dict[str, type[BaseDefFormException]]:
+    types = {base.__name__: base}
+    for subclass in base.__subclasses__():
+        types.update(_exception_types(subclass))
+    return types
+
+
+@dataclass(frozen=True)
+class Issue:
+    path: str
+    line: int
+    kind: str
+    message: str
+    description: str | None = None
+
+    @classmethod
+    def from_exception(cls, exc: BaseDefFormException) -> 'Issue':
+        path, sep, line = exc.path.rpartition(':')
+        if not sep or not line.isdigit():
+            path, line = exc.path, '0'
+        return cls(
+            path=path,
+            line=int(line),
+            kind=type(exc).__name__,
+            message=exc.message,
+            description=exc.description,
+        )
+
+    def to_exception(self) -> BaseDefFormException:
+        exc_type = _exception_types().get(self.kind, BaseDefFormException)
+        return exc_type(
+            path=f'{self.path}:{self.line}',
+            message=self.message,
+            description=self.description,
+        )
+
+
+@dataclass(frozen=True)
+class FileResult:
+    path: Path
+    issues: tuple[Issue, ...] = ()
+    code: str | None = None
+    edits: tuple[TextEdit, ...] = ()
+    cache_hit: bool = False
+    prefiltered: bool = False
+    profile: 'FileProfile | None' = field(default=None, compare=False)
+
+    def exceptions(self) -> list[BaseDefFormException]:
+        return [issue.to_exception() for issue in self.issues]
+
+
+def _rate(count: int, total: int) -> str:
+    return f'{count}/{total} ({count / total * 100:.1f}%)' if total else '0/0'
+
+
+def _size(size: float) -> str:
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:  # noqa: PLR2004
+            return f'{size:.0f} {unit}' if unit == 'B' else f'{size:.1f} {unit}'
+        size /= 1024
+    return f'{size:.1f} GB'
+
+
+@dataclass
+class RunStats:
+    files: int = 0
+    prefilter_hits: int = 0
+    cache_hits: int = 0
+    parsed: int = 0
+    reformatted: int = 0
+    unchanged: int = 0
+    write_bytes_saved: int = 0
+    issues: int = 0
+    clean_dirs: int = 0
+    clean_files: int = 0
+
+    def add(self, result: FileResult) -> None:
+        self.files += 1
+        self.issues += len(result.issues)
+        if result.prefiltered:
+            self.prefilter_hits += 1
+        elif result.cache_hit:
+            self.cache_hits += 1
+        else:
+            self.parsed += 1
+
+    def summary(self, cache_enabled: bool = True) -> dict[str, str]:
+        summary = {'prefilter_hits': _rate(self.prefilter_hits, self.files)}
+        if cache_enabled:
+            summary['cache_hits'] = _rate(self.cache_hits, self.files)
+        if self.clean_dirs:
+            summary['clean_subtrees_skipped'] = f'{self.clean_dirs} directories, {self.clean_files} files'
+        if self.reformatted or self.unchanged:
+            summary['files_reformatted'] = str(self.reformatted)
+            summary['files_unchanged'] = f'{self.unchanged} ({_size(self.write_bytes_saved)} not rewritten)'
+        return summary
@@ -0,0 +1,106 @@
+import os
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Sequence
+from concurrent.futures import Executor
+from contextlib import ExitStack
+from itertools import islice
+from pathlib import Path
+
+from def_form.core.cache import ResultCache
+from def_form.core.config import DefFormConfig
+from def_form.core.models import FileResult
+from def_form.core.pipeline import BackgroundIterator
+from def_form.core.processing import Processor
+from def_form.core.processing import process_path
+
+AUTO_JOBS = 'auto'
+CHUNKS_PER_WORKER = 8
+MAX_CHUNK_SIZE = 64
+
+
+def available_cpus() -> int:
+    # cpu_count() counts every CPU in the machine, even those an affinity mask or cpuset
+    # keeps this process off.
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def resolve_jobs(jobs: int | str | None) -> int:
+    if jobs is None:
+        return 1
+
+    if isinstance(jobs, str):
+        if jobs.strip().lower() == AUTO_JOBS:
+            return available_cpus()
+        try:
+            jobs = int(jobs)
+        except ValueError:
+            raise ValueError(f'Invalid jobs value: {jobs!r} (expected a positive integer or "auto")') from None
+
+    if jobs < 1:
+        raise ValueError(f'Invalid jobs value: {jobs} (expected a positive integer or "auto")')
+
+    return jobs
+
+
+def process_paths(
+    paths: Sequence[Path],
+    processor_class: Processor,
+    config: DefFormConfig,
+    cache: ResultCache | None = None,
+    profile: bool = False,
+) -> list[FileResult]:
+    return [process_path(path, processor_class, config, cache, profile) for path in paths]
+
+
+def iter_chunks(paths: Iterable[Path], max_size: int = MAX_CHUNK_SIZE) -> Iterator[list[Path]]:
+    # Chunks start at one path so the first result comes back quickly, then double
+    # up to max_size to amortise the inter-process overhead.
+    iterator = iter(paths)
+    size = 1
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+        size = min(size * 2, max_size)
+
+
+def iter_parallel(  # noqa: PLR0913
+    paths: Iterable[Path],
+    processor_class: Processor,
+    config: DefFormConfig,
+    jobs: int,
+    cache: ResultCache | None = None,
+    executor: Executor | None = None,
+    profile: bool = False,
+) -> Iterator[FileResult]:
+    # paths may still be growing (e.g. fed by the directory walk), so chunks are submitted
+    # from a feeder thread as they fill up, with at most a fixed window of them in flight.
+    window = jobs * CHUNKS_PER_WORKER
+
+    # A long-lived executor (e.g. the daemon's) is reused as is and left running.
+    with ExitStack() as stack:
+        if executor is None:
+            from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415
+
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=jobs))
+
+        pool = executor
+        submitted = BackgroundIterator(
+            (
+                pool.submit(process_paths, chunk, processor_class, config, cache, profile)
+                for chunk in iter_chunks(paths)
+            ),
+            maxsize=window,
+            name='def-form-chunk-feeder',
+        )
+        futures = iter(submitted)
+        try:
+            # Results are taken in submission order, so output stays deterministic
+            # no matter which worker finishes first.
+            for future in futures:
+                yield from future.result()
+        finally:
+            futures.close()  # type: ignore[attr-defined]
+            for future in submitted.remaining():
+                future.cancel()
@@ -0,0 +1,129 @@
+import queue
+import threading
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Generic
+from typing import TypeVar
+
+from def_form.core.cache import ResultCache
+from def_form.core.config import DefFormConfig
+from def_form.core.models import FileResult
+from def_form.core.processing import Processor
+from def_form.core.profiling import FileProfile
+from def_form.core.processing import process_text
+from def_form.core.processing import read_source
+
+T = TypeVar('T')
+
+DISCOVERY_QUEUE_SIZE = 1024
+READER_THREADS = 4
+READ_AHEAD = 16
+PUT_TIMEOUT = 0.1
+
+
+class _Failure:
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+_DONE = object()
+
+
+class BackgroundIterator(Generic[T]):
+    # Runs a producer (e.g. the directory walk) on a thread and hands its items over
+    # through a bounded queue, so consumers start before the producer is exhausted
+    # and at most maxsize items are held in memory.
+    def __init__(
+        self,
+        iterable: Iterable[T],
+        maxsize: int = DISCOVERY_QUEUE_SIZE,
+        name: str = 'def-form-walker',
+    ) -> None:
+        self.produced = 0
+        self.finished = False
+        self._iterable = iterable
+        self._queue: queue.Queue[object] = queue.Queue(maxsize)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._produce, name=name, daemon=True)
+
+    def _put(self, item: object) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=PUT_TIMEOUT)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    def _produce(self) -> None:
+        try:
+            for item in self._iterable:
+                # Counted before the hand-over, so a consumer never sees more items than produced.
+                self.produced += 1
+                if not self._put(item):
+                    return
+        except BaseException as exc:
+            self._put(_Failure(exc))
+            return
+        self.finished = True
+        self._put(_DONE)
+
+    def __iter__(self) -> Iterator[T]:
+        self._thread.start()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, _Failure):
+                    raise item.exc
+                yield item  # type: ignore[misc]
+        finally:
+            self._stop.set()
+            self._thread.join()
+
+    def remaining(self) -> list[T]:
+        # Items produced but never consumed, e.g. futures to cancel after an early exit.
+        items: list[T] = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return items
+            if item is not _DONE and not isinstance(item, _Failure):
+                items.append(item)  # type: ignore[arg-type]
+
+
+def tap(iterable: Iterable[T], callback: Callable[[T], None]) -> Iterator[T]:
+    # Reports each item as it passes, on whichever thread consumes the iterable.
+    for item in iterable:
+        callback(item)
+        yield item
+
+
+def iter_prefetched(
+    paths: Iterable[Path],
+    processor_class: Processor,
+    config: DefFormConfig,
+    cache: ResultCache | None = None,
+    profile: bool = False,
+) -> Iterator[FileResult]:
+    # Serial processing with the file reads done ahead on threads, so parsing in this
+    # thread overlaps with I/O. Reads are submitted from a feeder thread, so a slow walk
+    # never holds back files that are already read. Results keep the order of paths.
+    def read(path: Path) -> tuple[Path, 'Future[str | None]', FileProfile | None]:
+        file_profile = FileProfile() if profile else None
+        return path, pool.submit(read_source, path, file_profile), file_profile
+
+    with ThreadPoolExecutor(max_workers=READER_THREADS, thread_name_prefix='def-form-reader') as pool:
+        reads = BackgroundIterator((read(path) for path in paths), maxsize=READ_AHEAD, name='def-form-read-feeder')
+        for path, future, file_profile in reads:
+            code = future.result()
+            if code is None:
+                yield FileResult(path=path, profile=file_profile)
+            else:
+                yield process_text(code, path, processor_class, config, cache, file_profile)
@@ -0,0 +1,128 @@
+import re
+
+from def_form.core.source import is_single_line_def
+from def_form.core.config import DefFormConfig
+from def_form.core.rules import RULES
+from def_form.core.rules import enabled_rules
+
+# Every def statement starts a logical line, so matching physical line starts finds all of
+# them. Matches inside multi-line strings are harmless: they can only make the prefilter
+# give up, never hide a real def.
+DEF_LINE_RE = re.compile(r'^[ \t\f]*((?:async[ \t\f]+)?def[ \t\f]+\w+)', re.MULTILINE)
+# libcst and ast end a line at a lone carriage return too; the line scan only knows '\n'.
+LONE_CR_RE = re.compile(r'\r(?!\n)')
+QUOTES = '\'"'
+OPENING_BRACKETS = '([{'
+CLOSING_BRACKETS = ')]}'
+
+
+def _skip_string(line: str, start: int) -> int | None:
+    quote = line[start]
+    if line.startswith(quote * 3, start):
+        return None
+
+    i = start + 1
+    while i < len(line):
+        char = line[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == quote:
+            return i + 1
+        i += 1
+
+    return None
+
+
+def count_header_items(def_line: str, params_start: int) -> int | None:
+    # Returns how many comma-separated items the parameter list holds, or None when the
+    # header does not provably end on this line. The count is an upper bound of the
+    # argument count used by the rules, since '/', bare '*' and positional-only
+    # parameters are counted too.
+    depth = 0
+    items = 0
+    has_content = False
+    params_closed = False
+
+    i = params_start
+    while i < len(def_line):
+        char = def_line[i]
+
+        if char in QUOTES:
+            end = _skip_string(def_line, i)
+            if end is None:
+                return None
+            has_content = True
+            i = end
+            continue
+
+        if char == '#':
+            return None
+
+        if char in OPENING_BRACKETS:
+            depth += 1
+            if depth > 1:
+                has_content = True
+        elif char in CLOSING_BRACKETS:
+            depth -= 1
+            if depth == 0 and not params_closed:
+                params_closed = True
+                items += has_content
+            elif depth < 0:
+                return None
+        elif depth == 0 and params_closed and char == ':':
+            return items
+        elif depth == 1 and not params_closed and char == ',':
+            items += has_content
+            has_content = False
+        elif depth >= 1 and not params_closed and not char.isspace():
+            has_content = True
+
+        i += 1
+
+    return None
+
+
+def is_clean_def_line(def_line: str, config: DefFormConfig) -> bool:
+    match = re.match(r'(?:async\s+)?def\s+\w+\s*\(', def_line)
+    if match is None:
+        return False
+
+    items = count_header_items(def_line, match.end() - 1)
+    if items is None:
+        return False
+
+    if items == 0:
+        return True
+
+    if not is_single_line_def(def_line):
+        return False
+
+    # Mirrors the rules, so a rule that is not enabled never makes a def a candidate.
+    rules = enabled_rules(config)
+
+    if RULES['max-def-length'] in rules and config.max_def_length and len(def_line) > config.max_def_length:
+        return False
+
+    return not (RULES['max-inline-args'] in rules and config.max_inline_args and items > config.max_inline_args)
+
+
+def has_no_candidate_defs(code: str, config: DefFormConfig) -> bool:
+    if 'def' not in code or not enabled_rules(config):
+        return True
+
+    # A backslash continuation can split a header in ways the line scan cannot follow.
+    if '\\\n' in code or '\\\r' in code:
+        return False
+
+    if '\r' in code and LONE_CR_RE.search(code):
+        return False
+
+    for match in DEF_LINE_RE.finditer(code):
+        start = match.start(1)
+        end = code.find('\n', start)
+        def_line = code[start:] if end == -1 else code[start:end]
+        if not is_clean_def_line(def_line.rstrip('\r'), config):
+            return False
+
+    return True
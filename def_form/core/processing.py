@@ -0,0 +1,230 @@
+import ast
+from importlib import import_module
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import NamedTuple
+from typing import TypeAlias
+
+from def_form.exceptions.base import BaseDefFormException
+from def_form.core.cache import CacheEntry
+from def_form.core.cache import ResultCache
+from def_form.core.config import DefFormConfig
+from def_form.core.edits import TextEdit
+from def_form.core.edits import apply_edits
+from def_form.core.fast_checker import FastDefChecker
+from def_form.core.models import FileResult
+from def_form.core.models import Issue
+from def_form.core.prefilter import has_no_candidate_defs
+from def_form.core.profiling import FileProfile
+from def_form.core.profiling import timed
+from def_form.core.rules import enabled_rules
+from def_form.core.source import SourceIndex
+
+if TYPE_CHECKING:
+    from def_form.core.checker import DefChecker
+    from def_form.core.formatter import DefFormatter
+
+
+ProcessorClass: TypeAlias = 'type[DefFormatter] | type[DefChecker] | type[FastDefChecker]'
+
+
+class ProcessorRef(NamedTuple):
+    # Names a processor class without importing it, so libcst is only loaded by the
+    # first file that actually has to be parsed.
+    module: str
+    name: str
+    rewrites: bool = False
+
+    def load(self) -> ProcessorClass:
+        processor_class: ProcessorClass = getattr(import_module(self.module), self.name)
+        return processor_class
+
+
+CHECKER = ProcessorRef('def_form.core.checker', 'DefChecker')
+FORMATTER = ProcessorRef('def_form.core.formatter', 'DefFormatter', rewrites=True)
+FAST_CHECKER = ProcessorRef('def_form.core.fast_checker', 'FastDefChecker')
+
+Processor: TypeAlias = 'ProcessorClass | ProcessorRef'
+
+
+def load_processor(processor: Processor) -> ProcessorClass:
+    if isinstance(processor, ProcessorRef):
+        return processor.load()
+    return processor
+
+
+def rewrites_source(processor: Processor) -> bool:
+    if isinstance(processor, ProcessorRef):
+        return processor.rewrites
+
+    from def_form.core.formatter import DefFormatter  # noqa: PLC0415
+
+    return issubclass(processor, DefFormatter)
+
+
+def create_processor(
+    processor_class: Processor,
+    filepath: str,
+    config: DefFormConfig,
+    source: SourceIndex | None = None,
+) -> 'DefFormatter | DefChecker | FastDefChecker':
+    return load_processor(processor_class)(
+        filepath=filepath,
+        max_def_length=config.max_def_length,
+        max_inline_args=config.max_inline_args,
+        indent_size=config.indent_size,
+        source=source,
+        rules=enabled_rules(config),
+    )
+
+
+def read_source(filepath: Path, profile: FileProfile | None = None) -> str | None:
+    try:
+        with timed(profile, 'read'):
+            code = filepath.read_text(encoding='utf-8')
+            if profile is not None:
+                profile.size = filepath.stat().st_size
+    except (OSError, UnicodeDecodeError):
+        return None
+    return code
+
+
+def process_source(
+    code: str,
+    filepath: str,
+    processor_class: Processor,
+    config: DefFormConfig,
+    profile: FileProfile | None = None,
+) -> tuple[list[TextEdit], list[BaseDefFormException]]:
+    processor = create_processor(processor_class, filepath, config, source=SourceIndex(code))
+    if not processor.rules:
+        return [], []
+
+    if isinstance(processor, FastDefChecker):
+        with timed(profile, 'visit'):
+            return [], processor.check_source(code)
+
+    import libcst as cst  # noqa: PLC0415
+
+    from def_form.core.formatter import DefFormatter  # noqa: PLC0415
+
+    with timed(profile, 'parse'):
+        tree = cst.parse_module(code)
+
+    with timed(profile, 'metadata'):
+        # Def positions normally come from the source, so the tree is visited as parsed.
+        # Position metadata for every node is only computed when ast cannot parse the code;
+        # the tree is not shared, so MetadataWrapper's defensive deep copy is skipped too.
+        wrapper = None
+        if processor.def_starts is None:
+            wrapper = cst.metadata.MetadataWrapper(tree, unsafe_skip_copy=True)
+            if profile is not None:
+                # Resolved here only to time it apart from the visit, which reuses the result.
+                wrapper.resolve(cst.metadata.PositionProvider)
+
+    processor.profile = profile
+    with timed(profile, 'visit'):
+        if wrapper is None:
+            tree.visit(processor)
+        else:
+            wrapper.visit(processor)
+
+    if isinstance(processor, DefFormatter):
+        return processor.edits, processor.issues
+
+    return [], processor.issues
+
+
+def process_code(  # noqa: PLR0913
+    code: str,
+    filepath: Path,
+    processor_class: Processor,
+    config: DefFormConfig,
+    profile: FileProfile | None = None,
+    strict: bool = False,
+) -> tuple[list[TextEdit], list[BaseDefFormException]]:
+    try:
+        return process_source(code, str(filepath), processor_class, config, profile)
+    except Exception:
+        if strict:
+            raise
+        return [], []
+
+
+def to_file_result(
+    filepath: Path,
+    edits: list[TextEdit],
+    issues: list[BaseDefFormException],
+    original: str,
+    profile: FileProfile | None = None,
+) -> FileResult:
+    # Splice the edits into the buffer that was already read, instead of regenerating the module.
+    with timed(profile, 'codegen'):
+        code = apply_edits(original, edits) if edits else None
+
+    return FileResult(
+        path=filepath,
+        issues=tuple(Issue.from_exception(issue) for issue in issues),
+        code=code,
+        edits=tuple(edits),
+        profile=profile,
+    )
+
+
+def process_text(  # noqa: PLR0913
+    code: str,
+    filepath: Path,
+    processor_class: Processor,
+    config: DefFormConfig,
+    cache: ResultCache | None = None,
+    profile: FileProfile | None = None,
+    strict: bool = False,
+) -> FileResult:
+    with timed(profile, 'prefilter'):
+        prefiltered = has_no_candidate_defs(code, config)
+    if prefiltered:
+        # Skipped code is never parsed, so strict callers get its syntax checked here.
+        if strict:
+            ast.parse(code, str(filepath))
+        return FileResult(path=filepath, prefiltered=True, profile=profile)
+
+    if cache is None:
+        edits, issues = process_code(code, filepath, processor_class, config, profile, strict)
+        return to_file_result(filepath, edits, issues, original=code, profile=profile)
+
+    is_formatter = rewrites_source(processor_class)
+    with timed(profile, 'cache'):
+        key = cache.key(code)
+        entry = cache.get(key)
+
+    # A formatter still has to run when the cached entry says the file would change,
+    # because the rewritten source itself is not cached.
+    if entry is not None and not (is_formatter and entry.changed):
+        return FileResult(path=filepath, issues=entry.issues_for(filepath), cache_hit=True, profile=profile)
+
+    edits, issues = process_code(code, filepath, processor_class, config, profile, strict)
+    result = to_file_result(filepath, edits, issues, original=code, profile=profile)
+
+    # DefFormatter only rewrites defs that have issues, so a checker run can tell
+    # whether a format run would change the file without running the formatter.
+    changed = result.code is not None if is_formatter else bool(result.issues)
+    with timed(profile, 'cache'):
+        cache.put(key, CacheEntry.build(result.issues, changed))
+
+    return result
+
+
+def process_path(
+    filepath: Path,
+    processor_class: Processor,
+    config: DefFormConfig,
+    cache: ResultCache | None = None,
+    profile: bool = False,
+) -> FileResult:
+    # Worker entry point: only picklable arguments go in and compact records come out.
+    file_profile = FileProfile() if profile else None
+    code = read_source(filepath, file_profile)
+    if code is None:
+        return FileResult(path=filepath, profile=file_profile)
+
+    return process_text(code, filepath, processor_class, config, cache, file_profile)
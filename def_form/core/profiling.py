@@ -0,0 +1,145 @@
+import heapq
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager
+from contextlib import contextmanager
+from contextlib import nullcontext
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from cProfile import Profile
+
+    from def_form.core.models import FileResult
+
+PHASES = ('read', 'prefilter', 'cache', 'parse', 'metadata', 'visit', 'rules', 'codegen', 'write')
+TRACE_SUFFIX = '.json'
+DEFAULT_TOP = 10
+
+_NOT_PROFILED = nullcontext()
+
+
+class FileProfile:
+    # Wall and CPU time per phase for one file. Phases nest (rules run inside visit),
+    # and each phase keeps only its own time, so the phases of a file add up to its total.
+    def __init__(self) -> None:
+        self.pid = os.getpid()
+        self.size = 0
+        self.wall: dict[str, float] = {}
+        self.cpu: dict[str, float] = {}
+        self.events: list[tuple[str, float, float, int]] = []
+        self._children: list[list[float]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        children = [0.0, 0.0]
+        self._children.append(children)
+        # thread_time, not process_time: reads run on reader threads next to the parser.
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.thread_time() - cpu_start
+            self._children.pop()
+            self.wall[name] = self.wall.get(name, 0.0) + wall - children[0]
+            self.cpu[name] = self.cpu.get(name, 0.0) + cpu - children[1]
+            self.events.append((name, wall_start, wall, threading.get_native_id()))
+            if self._children:
+                self._children[-1][0] += wall
+                self._children[-1][1] += cpu
+
+    @property
+    def total(self) -> float:
+        return sum(self.wall.values())
+
+
+def timed(profile: FileProfile | None, name: str) -> AbstractContextManager[None]:
+    return _NOT_PROFILED if profile is None else profile.phase(name)
+
+
+class RunProfile:
+    # Collects the FileProfiles of a run, wherever they were measured, and optionally
+    # records a pstats dump (this process only) or a Chrome trace (all workers).
+    def __init__(self, top: int = DEFAULT_TOP, output: str | Path | None = None) -> None:
+        self.top = top
+        self.output = Path(output) if output is not None else None
+        self._reset()
+
+    def _reset(self) -> None:
+        self.wall: dict[str, float] = {}
+        self.cpu: dict[str, float] = {}
+        self.files: list[tuple[float, Path, str]] = []
+        self.trace_events: list[dict[str, object]] = []
+        self.elapsed = 0.0
+        self._started = 0.0
+        self._profiler: Profile | None = None
+
+    @property
+    def writes_trace(self) -> bool:
+        return self.output is not None and self.output.suffix == TRACE_SUFFIX
+
+    def start(self) -> None:
+        self._reset()
+        if self.output is not None and not self.writes_trace:
+            from cProfile import Profile  # noqa: PLC0415
+
+            self._profiler = Profile()
+            self._profiler.enable()
+        self._started = time.perf_counter()
+
+    def stop(self) -> None:
+        self.elapsed = time.perf_counter() - self._started
+        if self._profiler is not None:
+            self._profiler.disable()
+
+    def add(self, result: 'FileResult') -> None:
+        profile = result.profile
+        if profile is None:
+            return
+
+        for name, wall in profile.wall.items():
+            self.wall[name] = self.wall.get(name, 0.0) + wall
+        for name, cpu in profile.cpu.items():
+            self.cpu[name] = self.cpu.get(name, 0.0) + cpu
+
+        slowest_phase = max(profile.wall, key=profile.wall.__getitem__, default='')
+        self.files.append((profile.total, result.path, slowest_phase))
+
+        if self.writes_trace:
+            self.trace_events.extend(
+                {
+                    'name': name,
+                    'cat': 'def-form',
+                    'ph': 'X',
+                    'ts': start * 1e6,
+                    'dur': wall * 1e6,
+                    'pid': profile.pid,
+                    'tid': tid,
+                    'args': {'file': str(result.path)},
+                }
+                for name, start, wall, tid in profile.events
+            )
+
+    def phases(self) -> list[tuple[str, float, float]]:
+        known = [name for name in PHASES if name in self.wall]
+        other = sorted(set(self.wall) - set(PHASES))
+        return [(name, self.wall[name], self.cpu.get(name, 0.0)) for name in (*known, *other)]
+
+    def slowest(self) -> list[tuple[float, Path, str]]:
+        return heapq.nlargest(self.top, self.files, key=lambda file: file[0])
+
+    def save(self) -> None:
+        if self.output is None:
+            return
+
+        if self._profiler is not None:
+            self._profiler.dump_stats(self.output)
+            return
+
+        trace = {'traceEvents': self.trace_events, 'displayTimeUnit': 'ms'}
+        self.output.write_text(json.dumps(trace), encoding='utf-8')
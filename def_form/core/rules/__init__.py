@@ -1,5 +1,9 @@
+from collections.abc import Iterable
+from functools import lru_cache
+
 from def_form.exceptions.base import BaseDefFormException
 
+from def_form.core.config import DefFormConfig
 from def_form.core.rules.base import Rule
 from def_form.core.rules.context import RuleContext
 from def_form.core.rules.max_def_length import RuleMaxDefLength
@@ -14,23 +18,47 @@ DEFAULT_RULES: tuple[Rule, ...] = (
     RuleMultilineParamsIndent(),
 )
 
+RULES: dict[str, Rule] = {rule.name: rule for rule in DEFAULT_RULES}
+
+
+def resolve_rule_names(names: Iterable[str], setting: str) -> tuple[str, ...]:
+    resolved = tuple(name.strip().lower() for name in names)
+    unknown = [name for name in resolved if name not in RULES]
+    if unknown:
+        raise ValueError(f'Unknown rule in {setting}: {", ".join(unknown)} (expected one of: {", ".join(RULES)})')
+
+    return resolved
+
+
+@lru_cache(maxsize=16)
+def enabled_rules(config: DefFormConfig) -> tuple[Rule, ...]:
+    # Resolved once per config: rules that are not selected, ignored or have no threshold
+    # set are dropped here, so they are never called and the facts they read never computed.
+    selected = RULES.keys() if config.select is None else resolve_rule_names(config.select, 'select')
+    ignored = resolve_rule_names(config.ignore, 'ignore')
+    return tuple(
+        rule for name, rule in RULES.items() if name in selected and name not in ignored and rule.is_enabled(config)
+    )
+
 
 def run_rules(
     context: RuleContext,
     rules: tuple[Rule, ...] | list[Rule] | None = None,
 ) -> list[BaseDefFormException]:
-    rule_list = rules if rules is not None else list(DEFAULT_RULES)
     issues: list[BaseDefFormException] = []
-    for rule in rule_list:
+    for rule in DEFAULT_RULES if rules is None else rules:
         issues.extend(rule.check(context))
     return issues
 
 
 __all__ = [
     'DEFAULT_RULES',
+    'RULES',
     'Rule',
     'RuleMaxDefLength',
     'RuleMaxInlineArgs',
     'RuleMultilineParamsIndent',
+    'enabled_rules',
+    'resolve_rule_names',
     'run_rules',
 ]
@@ -1,11 +1,19 @@
 from abc import ABC
 from abc import abstractmethod
+from typing import ClassVar
 
 from def_form.exceptions.base import BaseDefFormException
+from def_form.core.config import DefFormConfig
 from def_form.core.rules.context import RuleContext
 
 
 class Rule(ABC):
+    # The name select and ignore refer to.
+    name: ClassVar[str]
+
+    def is_enabled(self, config: DefFormConfig) -> bool:
+        return True
+
     @abstractmethod
     def check(self, context: RuleContext) -> list[BaseDefFormException]:
         raise NotImplementedError
@@ -1,14 +1,58 @@
-from dataclasses import dataclass
+from collections.abc import Callable
+from functools import cached_property
+
+from def_form.core.source import is_single_line_def
 
 
-@dataclass(frozen=True)
 class RuleContext:
-    filepath: str
-    line_no: int
-    line_length: int
-    arg_count: int
-    is_single_line: bool
-    has_correct_multiline_format: bool
-    indent_size: int
-    max_def_length: int | None
-    max_inline_args: int | None
+    # The facts about one def are computed when a rule first reads them and then kept:
+    # facts only disabled rules need are never computed, and shared ones are computed once.
+    # Facts passed in directly, as before the callables existed, are used as they are.
+    def __init__(  # noqa: PLR0913
+        self,
+        filepath: str,
+        line_no: int,
+        line_length: int | None = None,
+        arg_count: int = 0,
+        is_single_line: bool | None = None,
+        has_correct_multiline_format: bool | None = None,
+        indent_size: int = 4,
+        max_def_length: int | None = None,
+        max_inline_args: int | None = None,
+        def_line: Callable[[], str] | None = None,
+        multiline_format: Callable[[], bool] | None = None,
+    ) -> None:
+        self.filepath = filepath
+        self.line_no = line_no
+        self.arg_count = arg_count
+        self.indent_size = indent_size
+        self.max_def_length = max_def_length
+        self.max_inline_args = max_inline_args
+        self._def_line = def_line
+        self._multiline_format = multiline_format
+        given = {
+            'line_length': line_length,
+            'is_single_line': is_single_line,
+            'has_correct_multiline_format': has_correct_multiline_format,
+        }
+        self.__dict__.update({name: value for name, value in given.items() if value is not None})
+
+    @cached_property
+    def def_line(self) -> str:
+        if self._def_line is None:
+            raise TypeError('RuleContext needs def_line to compute facts that were not passed in')
+        return self._def_line()
+
+    @cached_property
+    def line_length(self) -> int:
+        return len(self.def_line)
+
+    @cached_property
+    def is_single_line(self) -> bool:
+        return is_single_line_def(self.def_line)
+
+    @cached_property
+    def has_correct_multiline_format(self) -> bool:
+        if self._multiline_format is None:
+            raise TypeError('RuleContext needs multiline_format or has_correct_multiline_format')
+        return self._multiline_format()
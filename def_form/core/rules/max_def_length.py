@@ -1,15 +1,21 @@
 from def_form.exceptions.base import BaseDefFormException
 from def_form.exceptions.def_formatter import DefStringTooLongException
+from def_form.core.config import DefFormConfig
 from def_form.core.rules.base import Rule
 from def_form.core.rules.context import RuleContext
 
 
 class RuleMaxDefLength(Rule):
+    name = 'max-def-length'
+
+    def is_enabled(self, config: DefFormConfig) -> bool:
+        return bool(config.max_def_length)
+
     def check(self, context: RuleContext) -> list[BaseDefFormException]:
-        if not context.is_single_line:
-            return []
         if not context.max_def_length or context.line_length <= context.max_def_length:
             return []
+        if not context.is_single_line:
+            return []
         return [
             DefStringTooLongException(
                 path=f'{context.filepath}:{context.line_no}',
@@ -1,15 +1,21 @@
 from def_form.exceptions.base import BaseDefFormException
 from def_form.exceptions.def_formatter import TooManyInlineArgumentsException
+from def_form.core.config import DefFormConfig
 from def_form.core.rules.base import Rule
 from def_form.core.rules.context import RuleContext
 
 
 class RuleMaxInlineArgs(Rule):
+    name = 'max-inline-args'
+
+    def is_enabled(self, config: DefFormConfig) -> bool:
+        return bool(config.max_inline_args)
+
     def check(self, context: RuleContext) -> list[BaseDefFormException]:
-        if not context.is_single_line:
-            return []
         if not context.max_inline_args or context.arg_count <= context.max_inline_args:
             return []
+        if not context.is_single_line:
+            return []
         return [
             TooManyInlineArgumentsException(
                 path=f'{context.filepath}:{context.line_no}',
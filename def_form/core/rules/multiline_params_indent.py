@@ -5,6 +5,8 @@ from def_form.core.rules.context import RuleContext
 
 
 class RuleMultilineParamsIndent(Rule):
+    name = 'multiline-params-indent'
+
     def check(self, context: RuleContext) -> list[BaseDefFormException]:
         if context.is_single_line or context.has_correct_multiline_format:
             return []
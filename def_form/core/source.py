@@ -0,0 +1,56 @@
+import ast
+import re
+from functools import cached_property
+
+SKIP_COMMENT = '# def-form: skip'
+
+
+def find_skip_lines(code: str) -> frozenset[int]:
+    lowered = code.lower()
+    lines: set[int] = set()
+
+    line_no = 1
+    scanned = 0
+    start = lowered.find(SKIP_COMMENT)
+    while start != -1:
+        line_no += lowered.count('\n', scanned, start)
+        scanned = start
+        lines.add(line_no)
+        start = lowered.find(SKIP_COMMENT, start + len(SKIP_COMMENT))
+
+    return frozenset(lines)
+
+
+def find_def_starts(code: str) -> tuple[tuple[int, int], ...] | None:
+    # (line, column) of the `def` or `async` keyword of every function in source order, which
+    # is where libcst's PositionProvider starts a FunctionDef. None when ast cannot parse the code.
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError, RecursionError, MemoryError):
+        return None
+
+    return tuple(
+        sorted(
+            (node.lineno, node.col_offset)
+            for node in ast.walk(tree)
+            if isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef)
+        )
+    )
+
+
+def is_single_line_def(def_line: str) -> bool:
+    clean_line = re.sub(r'#.*', '', def_line)
+    return ')' in clean_line and ':' in clean_line
+
+
+class SourceIndex:
+    def __init__(self, code: str) -> None:
+        self.code = code
+
+    @cached_property
+    def skip_lines(self) -> frozenset[int]:
+        return find_skip_lines(self.code)
+
+    @cached_property
+    def def_starts(self) -> tuple[tuple[int, int], ...] | None:
+        return find_def_starts(self.code)
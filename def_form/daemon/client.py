@@ -0,0 +1,154 @@
+import os
+import socket
+import stat
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+
+from def_form.daemon.protocol import DEFAULT_IDLE_TIMEOUT
+from def_form.daemon.protocol import default_socket_path
+from def_form.daemon.protocol import iter_messages
+from def_form.daemon.protocol import send_message
+from def_form.version import package_version
+
+if TYPE_CHECKING:
+    from def_form.cli.ui import BaseUI
+    from def_form.exceptions.base import BaseDefFormException
+
+STARTUP_TIMEOUT = 15.0
+STARTUP_POLL_INTERVAL = 0.02
+CONSOLE_LEVELS = frozenset({'info', 'success', 'warning', 'error', 'debug'})
+
+
+class DaemonError(Exception):
+    pass
+
+
+def connect(socket_path: Path) -> socket.socket | None:
+    # Anyone could have put a socket at this path; only a daemon of the current user is trusted.
+    try:
+        st = socket_path.lstat()
+    except OSError:
+        return None
+    if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.getuid():
+        raise DaemonError(f'{socket_path} is not a socket owned by the current user')
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(socket_path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def start_daemon(socket_path: Path, idle_timeout: float = DEFAULT_IDLE_TIMEOUT) -> socket.socket:
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            '-m',
+            'def_form.cli.main',
+            'daemon',
+            '--socket',
+            str(socket_path),
+            '--idle-timeout',
+            str(idle_timeout),
+        ],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        # Checked before connecting: a daemon that lost the race to another one exits after it listens.
+        exited = process.poll() is not None
+        sock = connect(socket_path)
+        if sock is not None:
+            return sock
+        if exited:
+            raise DaemonError(f'The def-form daemon exited without listening on {socket_path}')
+        time.sleep(STARTUP_POLL_INTERVAL)
+
+    raise DaemonError(f'Timed out waiting for the def-form daemon on {socket_path}')
+
+
+def send_request(sock: socket.socket, request: dict[str, Any], ui: 'BaseUI | None' = None) -> tuple[str, str]:
+    issues: list[BaseDefFormException] = []
+    with sock, sock.makefile('rwb') as stream:
+        send_message(stream, request)
+        for message in iter_messages(stream):
+            if message['event'] == 'done':
+                return message['status'], message['message']
+            if ui is not None:
+                _replay(message, ui, issues)
+
+    raise DaemonError('The def-form daemon closed the connection without a result')
+
+
+def _replay(message: dict[str, Any], ui: 'BaseUI', issues: list['BaseDefFormException']) -> None:
+    event = message['event']
+
+    if event == 'config':
+        ui.show_config_info(**message['config'])
+    elif event == 'start':
+        ui.start(total=message['total'])
+    elif event == 'total':
+        ui.update_total(message['total'], final=message['final'])
+    elif event == 'processing':
+        ui.processing(Path(message['path']))
+    elif event == 'skipped':
+        ui.skipped(Path(message['path']))
+    elif event == 'console' and message['level'] in CONSOLE_LEVELS:
+        getattr(ui.console, message['level'])(message['message'])
+    elif event == 'report':
+        from def_form.core.models import Issue  # noqa: PLC0415
+
+        found = [Issue(**issue) for issue in message['issues']]
+        ui.report(Path(message['path']), found)
+        if ui.collects_issues:
+            issues.extend(issue.to_exception() for issue in found)
+    elif event == 'finish':
+        ui.finish(message['processed'], issues, **message['stats'])
+
+
+def run_remote(
+    command: str,
+    options: dict[str, Any],
+    ui: 'BaseUI',
+    socket_path: Path | None = None,
+    idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+) -> None:
+    from def_form.exceptions.def_formatter import CheckCommandFoundAnIssue  # noqa: PLC0415
+
+    socket_path = socket_path or default_socket_path()
+    request = {
+        'command': command,
+        'cwd': str(Path.cwd()),
+        'version': package_version(),
+        'options': options,
+    }
+
+    # A daemon from another def-form version stops itself and asks for a restart.
+    for _ in range(2):
+        sock = connect(socket_path) or start_daemon(socket_path, idle_timeout)
+        status, message = send_request(sock, request, ui)
+        if status != 'restart':
+            break
+
+    if status == 'issues':
+        raise CheckCommandFoundAnIssue(str(Path.cwd()), message)
+    if status != 'ok':
+        raise DaemonError(message)
+
+
+def stop_daemon(socket_path: Path | None = None) -> bool:
+    sock = connect(socket_path or default_socket_path())
+    if sock is None:
+        return False
+    send_request(sock, {'command': 'shutdown'})
+    return True
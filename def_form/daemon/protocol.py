@@ -0,0 +1,58 @@
+import io
+import json
+import os
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+SOCKET_ENV = 'DEF_FORM_DAEMON_SOCKET'
+SOCKET_NAME = 'def-form.sock'
+DEFAULT_IDLE_TIMEOUT = 900.0
+
+# Keyword arguments a client may forward to DefManager.
+MANAGER_OPTIONS = frozenset(
+    {
+        'path',
+        'excluded',
+        'max_def_length',
+        'max_inline_args',
+        'indent_size',
+        'config',
+        'show_skipped',
+        'jobs',
+        'cache',
+        'cache_dir',
+        'backend',
+        'changed_since',
+        'staged',
+    }
+)
+
+
+def default_socket_dir() -> Path:
+    base = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return Path(base) / f'def-form-{os.getuid()}'
+
+
+def default_socket_path() -> Path:
+    if env_path := os.environ.get(SOCKET_ENV):
+        return Path(env_path)
+
+    return default_socket_dir() / SOCKET_NAME
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, set | frozenset):
+        return sorted(str(item) for item in value)
+    return str(value)
+
+
+def send_message(stream: io.BufferedIOBase, message: dict[str, Any]) -> None:
+    stream.write(json.dumps(message, default=_to_json).encode('utf-8') + b'\n')
+    stream.flush()
+
+
+def iter_messages(stream: io.BufferedIOBase) -> Iterator[dict[str, Any]]:
+    for line in stream:
+        yield json.loads(line)
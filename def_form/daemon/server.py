@@ -0,0 +1,325 @@
+import contextlib
+import os
+import socket
+import socketserver
+import stat
+from collections import OrderedDict
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Sequence
+from concurrent.futures import Executor
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+from def_form.cli.console import BaseConsole
+from def_form.cli.context import CLIContext
+from def_form.cli.ui import BaseUI
+from def_form.exceptions.base import BaseDefFormException
+from def_form.exceptions.def_formatter import CheckCommandFoundAnIssue
+from def_form.core.manager import DefManager
+from def_form.core.models import FileResult
+from def_form.core.models import Issue
+from def_form.core.processing import Processor
+from def_form.daemon.protocol import MANAGER_OPTIONS
+from def_form.daemon.protocol import default_socket_dir
+from def_form.daemon.protocol import iter_messages
+from def_form.daemon.protocol import send_message
+from def_form.version import package_version
+
+Send = Callable[[dict[str, Any]], None]
+
+MEMO_SIZE = 65536
+COMMANDS = ('check', 'format')
+PRIVATE_MODE = 0o700
+
+MemoKey = tuple[str, int, int, int, Processor, Any]
+
+
+class SocketConsole(BaseConsole):
+    def __init__(self, context: CLIContext, send: Send) -> None:
+        super().__init__(context=context)
+        self.send = send
+
+    def _message(self, level: str, message: str) -> None:
+        self.send({'event': 'console', 'level': level, 'message': message})
+
+    def info(self, message: str) -> None:
+        self._message('info', message)
+
+    def success(self, message: str) -> None:
+        self._message('success', message)
+
+    def warning(self, message: str) -> None:
+        self._message('warning', message)
+
+    def error(self, message: str) -> None:
+        self._message('error', message)
+
+    def debug(self, message: str) -> None:
+        self._message('debug', message)
+
+
+class SocketUI(BaseUI):
+    # Forwards UI calls to the client, which renders them with its own UI.
+    # Issues travel per file as they are found; the client collects them if its UI needs them.
+    collects_issues = False
+
+    def __init__(self, console: SocketConsole) -> None:
+        super().__init__(console=console)
+        self.send = console.send
+
+    def show_config_info(self, **config: Any) -> None:
+        self.send({'event': 'config', 'config': config})
+
+    def start(self, total: int | None) -> None:
+        self.send({'event': 'start', 'total': total})
+
+    def update_total(self, total: int, final: bool) -> None:
+        self.send({'event': 'total', 'total': total, 'final': final})
+
+    def processing(self, path: Path) -> None:
+        self.send({'event': 'processing', 'path': str(path)})
+
+    def skipped(self, path: Path) -> None:
+        self.send({'event': 'skipped', 'path': str(path)})
+
+    def report(self, path: Path, issues: Sequence[Issue]) -> None:
+        self.send({'event': 'report', 'path': str(path), 'issues': [asdict(issue) for issue in issues]})
+
+    def finish(self, processed: int, issues: list[BaseDefFormException], **stats: Any) -> None:
+        self.send({'event': 'finish', 'processed': processed, 'stats': stats})
+
+    def show_issues(self, processed: int, issues: list[BaseDefFormException], **stats: Any) -> None:
+        return
+
+    def show_summary(self, processed: int, issues: list[BaseDefFormException], **stats: Any) -> None:
+        return
+
+
+class ResultMemo:
+    # In-memory results for files whose stat has not changed since they were last processed.
+    def __init__(self, max_size: int = MEMO_SIZE) -> None:
+        self.max_size = max_size
+        self.entries: OrderedDict[MemoKey, FileResult] = OrderedDict()
+
+    def get(self, key: MemoKey) -> FileResult | None:
+        result = self.entries.get(key)
+        if result is not None:
+            self.entries.move_to_end(key)
+        return result
+
+    def put(self, key: MemoKey, result: FileResult) -> None:
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+
+class WarmDefManager(DefManager):
+    def __init__(
+        self,
+        *args: Any,
+        memo: ResultMemo,
+        executor_factory: Callable[[int], Executor],
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.memo = memo
+        if self.jobs > 1:
+            self.executor = executor_factory(self.jobs)
+
+    def _memo_key(self, path: Path, processor_class: Processor) -> MemoKey | None:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return str(path), st.st_mtime_ns, st.st_size, st.st_ino, processor_class, self.settings
+
+    def _iter_results(
+        self,
+        files: Iterable[Path],
+        processor_class: Processor,
+    ) -> Iterator[FileResult]:
+        # --no-cache also bypasses the in-memory results.
+        manifest = self.manifest
+        if manifest is None:
+            yield from super()._iter_results(files, processor_class)
+            return
+
+        # Memo hits and misses are merged back in order, so the warm walk is collected first.
+        files = list(files)
+
+        keys = [self._memo_key(path, processor_class) for path in files]
+        cached = [self.memo.get(key) if key is not None else None for key in keys]
+        misses = [path for path, result in zip(files, cached, strict=True) if result is None]
+        results = super()._iter_results(misses, processor_class)
+
+        for key, memoized in zip(keys, cached, strict=True):
+            if memoized is not None:
+                yield replace(memoized, cache_hit=True)
+                continue
+
+            result = next(results)
+            # A file the formatter rewrites gets a new stat, so only unchanged results are kept.
+            # As in the manifest, files changed within the racy window are not remembered yet.
+            if key is not None and result.code is None and manifest.settled(key[1]):
+                self.memo.put(key, result)
+            yield result
+
+
+@contextlib.contextmanager
+def _working_directory(path: str) -> Iterator[None]:
+    previous = Path.cwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+    server: 'DaemonServer'
+
+    def handle(self) -> None:
+        def send(message: dict[str, Any]) -> None:
+            send_message(self.wfile, message)
+
+        try:
+            for request in iter_messages(self.rfile):
+                self.server.handle_message(request, send)
+                return
+        except (OSError, ValueError):
+            return
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    def __init__(self, socket_path: Path, idle_timeout: float) -> None:
+        self.socket_path = socket_path
+        self.timeout = idle_timeout
+        self.running = True
+        self.memo = ResultMemo()
+        self.version = package_version()
+        self._executor: ProcessPoolExecutor | None = None
+        self._executor_jobs = 0
+
+        # Only the per-user directory def-form creates itself must be private; a socket
+        # elsewhere is trusted by its owner, which the client checks before connecting.
+        if socket_path.parent == default_socket_dir():
+            socket_path.parent.mkdir(mode=PRIVATE_MODE, parents=True, exist_ok=True)
+            _check_private_directory(socket_path.parent)
+        else:
+            socket_path.parent.mkdir(parents=True, exist_ok=True)
+        _remove_stale_socket(socket_path)
+        # The socket is created private rather than restricted after bind, which leaves a window.
+        umask = os.umask(0o077)
+        try:
+            super().__init__(str(socket_path), DaemonRequestHandler)
+        finally:
+            os.umask(umask)
+
+    def executor(self, jobs: int) -> Executor:
+        if self._executor is None or self._executor_jobs != jobs:
+            if self._executor is not None:
+                self._executor.shutdown()
+            self._executor = ProcessPoolExecutor(max_workers=jobs)
+            self._executor_jobs = jobs
+        return self._executor
+
+    def _drop_executor(self) -> None:
+        # A worker died: the pool refuses all further work, so the next request gets a new one.
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+        self._executor_jobs = 0
+
+    def handle_timeout(self) -> None:
+        self.running = False
+
+    def stop(self) -> None:
+        # Unlink first, so new clients start a fresh daemon instead of queueing on this one.
+        self.running = False
+        with contextlib.suppress(OSError):
+            self.socket_path.unlink()
+
+    def handle_message(self, request: dict[str, Any], send: Send) -> None:
+        command = request.get('command')
+
+        if command == 'ping':
+            send({'event': 'done', 'status': 'ok', 'message': self.version})
+            return
+
+        if command == 'shutdown':
+            self.stop()
+            send({'event': 'done', 'status': 'ok', 'message': 'Daemon stopped'})
+            return
+
+        if request.get('version') != self.version:
+            self.stop()
+            send({'event': 'done', 'status': 'restart', 'message': 'Daemon version mismatch'})
+            return
+
+        if command not in COMMANDS:
+            send({'event': 'done', 'status': 'error', 'message': f'Unknown command: {command!r}'})
+            return
+
+        options = {key: value for key, value in request.get('options', {}).items() if key in MANAGER_OPTIONS}
+        ui = SocketUI(console=SocketConsole(context=CLIContext(), send=send))
+
+        try:
+            with _working_directory(request.get('cwd') or str(Path.cwd())):
+                manager = WarmDefManager(ui=ui, memo=self.memo, executor_factory=self.executor, **options)
+                getattr(manager, command)()
+        except CheckCommandFoundAnIssue as exc:
+            send({'event': 'done', 'status': 'issues', 'message': exc.message})
+        except BrokenProcessPool as exc:
+            self._drop_executor()
+            send({'event': 'done', 'status': 'error', 'message': f'A worker process died: {exc}'})
+        except Exception as exc:
+            send({'event': 'done', 'status': 'error', 'message': str(exc)})
+        else:
+            send({'event': 'done', 'status': 'ok', 'message': ''})
+
+    def serve(self) -> None:
+        try:
+            while self.running:
+                self.handle_request()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+            self.server_close()
+            self.stop()
+
+
+def _check_private_directory(directory: Path) -> None:
+    # mkdir(exist_ok=True) accepts a directory someone else created first, e.g. in a shared /tmp.
+    st = directory.lstat()
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or stat.S_IMODE(st.st_mode) != PRIVATE_MODE:
+        raise PermissionError(f'{directory} must be a directory owned by the current user with mode 0700')
+
+
+def _remove_stale_socket(socket_path: Path) -> None:
+    try:
+        mode = socket_path.lstat().st_mode
+    except FileNotFoundError:
+        return
+
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f'{socket_path} exists and is not a socket')
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(socket_path))
+        except OSError:
+            socket_path.unlink()
+            return
+
+    raise FileExistsError(f'A def-form daemon is already listening on {socket_path}')
+
+
+def serve(socket_path: Path, idle_timeout: float) -> None:
+    DaemonServer(socket_path, idle_timeout).serve()
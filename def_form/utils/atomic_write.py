@@ -0,0 +1,21 @@
+import os
+import tempfile
+from pathlib import Path
+
+
+def atomic_write(
+    path: Path,
+    data: bytes,
+    mode: int | None = None,
+) -> None:
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        if mode is not None:
+            tmp_path.chmod(mode)
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
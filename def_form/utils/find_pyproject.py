@@ -1,8 +1,8 @@
 from pathlib import Path
 
 
-def find_pyproject_toml() -> str | None:
-    current = Path.cwd()
+def find_pyproject_toml(start: Path | None = None) -> str | None:
+    current = start or Path.cwd()
     for parent in [current, *list(current.parents)]:
         candidate = parent / 'pyproject.toml'
         if candidate.is_file():
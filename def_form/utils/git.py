@@ -0,0 +1,54 @@
+import subprocess
+from pathlib import Path
+
+
+class GitError(Exception):
+    pass
+
+
+def _run_git(cwd: Path, *args: str) -> str:
+    try:
+        completed = subprocess.run(
+            ['git', *args],
+            cwd=cwd,
+            capture_output=True,
+            encoding='utf-8',
+            errors='surrogateescape',
+            check=False,
+        )
+    except OSError as exc:
+        raise GitError(f'Could not run git: {exc}') from exc
+
+    if completed.returncode != 0:
+        raise GitError(completed.stderr.strip() or f'git {args[0]} failed with exit code {completed.returncode}')
+
+    return completed.stdout
+
+
+def _split_names(output: str) -> list[str]:
+    return [name for name in output.split('\0') if name]
+
+
+def find_git_root(path: Path) -> Path:
+    cwd = path if path.is_dir() else path.parent
+    return Path(_run_git(cwd, 'rev-parse', '--show-toplevel').strip()).resolve()
+
+
+def changed_files(
+    path: Path,
+    changed_since: str | None = None,
+    staged: bool = False,
+) -> list[Path]:
+    # Files added, copied, modified or renamed in the index (staged) and/or in the working
+    # tree relative to `changed_since`, including untracked files; deleted files are left out.
+    root = find_git_root(path)
+    names: list[str] = []
+
+    if staged:
+        names.extend(_split_names(_run_git(root, 'diff', '--cached', '--name-only', '-z', '--diff-filter=d')))
+
+    if changed_since is not None:
+        names.extend(_split_names(_run_git(root, 'diff', '--name-only', '-z', '--diff-filter=d', changed_since, '--')))
+        names.extend(_split_names(_run_git(root, 'ls-files', '--others', '--exclude-standard', '-z')))
+
+    return sorted({root / name for name in names})
@@ -0,0 +1,8 @@
+def package_version() -> str:
+    from importlib.metadata import PackageNotFoundError  # noqa: PLC0415
+    from importlib.metadata import version  # noqa: PLC0415
+
+    try:
+        return version('def-form')
+    except PackageNotFoundError:
+        return 'unknown'
@@ -0,0 +1,74 @@
+import sys
+
+TABLE = {'a': [1, 2, 3], 'b': {'c': (4, 5)}}
+
+
+if sys.version_info >= (3, 10):
+    def in_if(
+        first,
+        second,
+        third,
+        fourth,
+    ):
+        return first
+else:
+    def in_else(
+        first,
+        second,
+        third,
+        fourth,
+    ):
+        return first
+
+try:
+    import json
+except ImportError:
+    def in_except(
+        first,
+        second,
+        third,
+        fourth,
+    ):
+        return first
+finally:
+    def in_finally(
+        first,
+        second,
+        third,
+        fourth,
+    ):
+        return first
+
+for _ in range(1):
+    with open(__file__) as f:
+        def in_with(
+            first,
+            second,
+            third,
+            fourth,
+        ):
+            return first
+
+
+class Outer:
+    @staticmethod
+    def method(first):
+        if first:
+            def nested(
+                first,
+                second,
+                third,
+                fourth,
+            ):
+                return [first for _ in range(second)]
+        while first:
+            class Inner:
+                def inner(
+                    self,
+                    first,
+                    second,
+                    third,
+                ):
+                    return (lambda x: x)(first)
+            break
+        return first
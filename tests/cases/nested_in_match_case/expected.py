@@ -0,0 +1,27 @@
+def handle(command):
+    match command:
+        case 'one':
+            def first(
+                a,
+                b,
+                c,
+            ): pass
+        case {'key': value}:
+            def second(
+                a,
+                b,
+                c,
+            ):
+                return value
+        case [x, *rest] if rest:
+            match x:
+              case 1:
+                def third(
+                    first,
+                    second,
+                    third,
+                ):
+                    return rest
+        case _:
+            def fine(a):
+                return a
@@ -19,6 +19,7 @@ CASE_DIR_BY_ID = {name: path for name, path in _cases}
 
 def _manager_kwargs(path: str) -> dict:
     return {
+        'cache': False,
         'config': '/nonexistent',
         'excluded': (),
         'max_def_length': MAX_DEF_LENGTH,
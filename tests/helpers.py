@@ -1,11 +1,35 @@
 import json
+import os
+from collections.abc import Sequence
 from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+from unittest.mock import patch
 
+from def_form.core.manager import DefManager
 from def_form.exceptions.base import BaseDefFormException
 
 
 MAX_DEF_LENGTH = 100
 MAX_INLINE_ARGS = 2
+AN_HOUR_NS = 3600 * 1_000_000_000
+
+# One def with more inline arguments than MAX_INLINE_ARGS, and one without issues.
+BAD_SOURCE = 'def too_many(a, b, c):\n    pass\n'
+CLEAN_SOURCE = 'def fine(a):\n    pass\n'
+
+
+def make_manager(path: Path | str | Sequence[str], **options: Any) -> DefManager:
+    # No pyproject.toml is looked up around the test tree; pass config= to use one.
+    options.setdefault('ui', MagicMock())
+    options.setdefault('max_inline_args', MAX_INLINE_ARGS)
+    with patch('def_form.core.manager.find_pyproject_toml', return_value=None):
+        return DefManager(path=str(path) if isinstance(path, Path) else path, **options)
+
+
+def make_cached_manager(tmp_path: Path, **options: Any) -> DefManager:
+    # Checks tmp_path/src with the result cache beside it, so each new manager reuses the last run.
+    return make_manager(tmp_path / 'src', cache_dir=str(tmp_path / '.cache'), **options)
 
 
 def get_case_dir() -> Path:
@@ -52,3 +76,10 @@ def load_expected_content(case_dir: Path) -> str | None:
     if not path.is_file():
         return None
     return path.read_text(encoding='utf-8')
+
+
+def age(path: Path) -> None:
+    # Files changed within the racy window are not recorded, so the tree is moved back an hour.
+    for entry in sorted([path, *path.rglob('*')], key=lambda p: len(p.parts), reverse=True):
+        mtime_ns = entry.stat().st_mtime_ns - AN_HOUR_NS
+        os.utime(entry, ns=(mtime_ns, mtime_ns))
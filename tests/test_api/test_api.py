@@ -0,0 +1,98 @@
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from def_form.api import DefFormConfig
+from def_form.api import DefFormError
+from def_form.api import Issue
+from def_form.api import check_source
+from def_form.api import format_source
+from def_form.api import format_sources
+from def_form.api import load_config
+
+CONFIG = DefFormConfig(max_inline_args=2)
+SOURCE = 'def f(a, b, c):\n    pass\n'
+FORMATTED = 'def f(\n    a,\n    b,\n    c,\n):\n    pass\n'
+
+
+@pytest.mark.parametrize('backend', [None, 'libcst', 'fast'])
+def test_check_source_returns_issues(backend: str | None) -> None:
+    issues = check_source(SOURCE, CONFIG, filename='gen/mod.py', backend=backend)
+
+    assert issues == [
+        Issue(
+            path='gen/mod.py',
+            line=1,
+            kind='TooManyInlineArgumentsException',
+            message='Too many inline args (3 > 2)',
+        )
+    ]
+
+
+def test_format_source_rewrites_and_keeps_clean_code() -> None:
+    assert format_source(SOURCE, CONFIG) == FORMATTED
+    assert format_source(FORMATTED, CONFIG) == FORMATTED
+    assert format_source(SOURCE) == SOURCE
+
+
+@pytest.mark.parametrize('backend', [None, 'libcst', 'fast'])
+def test_invalid_source_raises(backend: str | None) -> None:
+    with pytest.raises(DefFormError, match=r'gen/mod\.py'):
+        check_source('def f(a, b, c:\n    pass\n', CONFIG, filename='gen/mod.py', backend=backend)
+    with pytest.raises(DefFormError):
+        format_source('def f(:\n', CONFIG)
+    with pytest.raises(DefFormError):
+        check_source('def f(a):\n    x = (\n', CONFIG, backend=backend)
+    with pytest.raises(DefFormError):
+        list(format_sources([SOURCE, 'def f(:\n'], CONFIG))
+
+
+def test_format_sources_preserves_order_with_and_without_a_pool() -> None:
+    sources = [SOURCE, 'x = 1\n', SOURCE.replace('f(', 'g(')] * 3
+    expected = [format_source(code, CONFIG) for code in sources]
+
+    assert list(format_sources(sources, CONFIG)) == expected
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert list(format_sources(iter(sources), CONFIG, executor=executor)) == expected
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        assert list(format_sources(sources, CONFIG, executor=executor, chunksize=2)) == expected
+        assert list(format_sources(sources, CONFIG, executor=executor)) == expected
+
+
+def test_api_does_not_touch_the_filesystem(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    check_source(SOURCE, CONFIG, filename='missing.py')
+    list(format_sources([SOURCE], CONFIG))
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_load_config_reads_tool_section(tmp_path: Path) -> None:
+    pyproject = tmp_path / 'pyproject.toml'
+    pyproject.write_text('[tool.def-form]\nmax_inline_args = 3\nindent_size = 2\nexclude = ["build"]\n')
+
+    assert load_config(pyproject) == DefFormConfig(max_inline_args=3, indent_size=2)
+
+
+def test_load_config_reads_rule_selection(tmp_path: Path) -> None:
+    pyproject = tmp_path / 'pyproject.toml'
+    pyproject.write_text('[tool.def-form]\nselect = ["max-inline-args", "Max-Def-Length"]\nignore = ["max-def-length"]\n')
+
+    config = load_config(pyproject)
+    assert config == DefFormConfig(select=('max-inline-args', 'max-def-length'), ignore=('max-def-length',))
+
+    pyproject.write_text('[tool.def-form]\nignore = ["line-length"]\n')
+    with pytest.raises(ValueError, match='Unknown rule in ignore: line-length'):
+        load_config(pyproject)
+
+
+def test_api_import_does_not_load_rich() -> None:
+    code = 'import sys, def_form.api; print(sorted(m for m in sys.modules if m.split(".")[0] == "rich"))'
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)  # noqa: S603
+
+    assert result.stdout.strip() == '[]'
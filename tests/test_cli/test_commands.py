@@ -1,10 +1,16 @@
+import io
+import json
+import sys
 from pathlib import Path
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
+import pytest
 from click.testing import CliRunner
 
+from def_form.cli.context import context
 from def_form.cli.main import cli
+from def_form.cli.main import main
 
 
 runner = CliRunner()
@@ -19,7 +25,7 @@ def test_format_default_path_is_current_dir() -> None:
 
         assert result.exit_code == 0
         call_kw = mock_manager_class.call_args[1]
-        assert call_kw['path'] == '.'
+        assert call_kw['path'] == ('.',)
 
 
 def test_format_invokes_def_manager_and_format(tmp_path: Path) -> None:
@@ -32,7 +38,7 @@ def test_format_invokes_def_manager_and_format(tmp_path: Path) -> None:
         assert result.exit_code == 0
         mock_manager_class.assert_called_once()
         call_kw = mock_manager_class.call_args[1]
-        assert call_kw['path'] == str(tmp_path)
+        assert call_kw['path'] == (str(tmp_path),)
         assert call_kw['excluded'] == ()
         assert call_kw['max_def_length'] is None
         assert call_kw['max_inline_args'] is None
@@ -81,7 +87,7 @@ def test_check_invokes_def_manager_and_check(tmp_path: Path) -> None:
         assert result.exit_code == 0
         mock_manager_class.assert_called_once()
         call_kw = mock_manager_class.call_args[1]
-        assert call_kw['path'] == str(tmp_path)
+        assert call_kw['path'] == (str(tmp_path),)
         assert call_kw['excluded'] == ()
         mock_instance.check.assert_called_once()
 
@@ -99,6 +105,9 @@ def test_check_passes_options_to_def_manager(tmp_path: Path) -> None:
                 '--max-def-length', '100',
                 '--max-inline-args', '2',
                 '--exclude', 'build',
+                '--backend', 'fast',
+                '--changed-since', 'main',
+                '--staged',
             ],
         )
 
@@ -107,6 +116,187 @@ def test_check_passes_options_to_def_manager(tmp_path: Path) -> None:
         assert call_kw['max_def_length'] == 100
         assert call_kw['max_inline_args'] == 2
         assert call_kw['excluded'] == ('build',)
+        assert call_kw['backend'] == 'fast'
+        assert call_kw['changed_since'] == 'main'
+        assert call_kw['staged'] is True
+
+
+def test_check_accepts_many_paths_and_files_from_stdin(tmp_path: Path) -> None:
+    first = tmp_path / 'a.py'
+    second = tmp_path / 'b.py'
+    first.write_text('x = 1\n')
+    second.write_text('x = 1\n')
+
+    with patch('def_form.cli.commands.check.DefManager') as mock_manager_class:
+        mock_manager_class.return_value = MagicMock()
+
+        result = runner.invoke(
+            cli,
+            ['check', str(first), str(tmp_path), '--files-from', '-'],
+            input=f'{second}\0dir with spaces/c.py\0',
+        )
+
+        assert result.exit_code == 0
+        call_kw = mock_manager_class.call_args[1]
+        assert call_kw['path'] == (str(first), str(tmp_path), str(second), 'dir with spaces/c.py')
+
+
+def test_format_reads_newline_separated_files_from(tmp_path: Path) -> None:
+    listing = tmp_path / 'files.txt'
+    listing.write_text('a.py\n\nb.py\n')
+
+    with patch('def_form.cli.commands.format.DefManager') as mock_manager_class:
+        mock_manager_class.return_value = MagicMock()
+
+        result = runner.invoke(cli, ['format', '--files-from', str(listing)])
+
+        assert result.exit_code == 0
+        assert mock_manager_class.call_args[1]['path'] == ('a.py', 'b.py')
+
+
+STDIN_SOURCE = 'def f(a, b, c):\r\n    pass\r\n'
+
+
+def _stdin_project(tmp_path: Path) -> Path:
+    (tmp_path / 'pyproject.toml').write_text('[tool.def-form]\nmax_inline_args = 2\nexclude = ["generated"]\n')
+    return tmp_path / 'pkg' / 'mod.py'
+
+
+def test_format_stdin_writes_formatted_source_to_stdout(tmp_path: Path) -> None:
+    filename = _stdin_project(tmp_path)
+
+    result = runner.invoke(
+        cli,
+        ['format', '-', '--stdin-filename', str(filename), '--no-cache'],
+        input=STDIN_SOURCE.encode('utf-8'),
+    )
+
+    assert result.exit_code == 0
+    assert result.stdout_bytes == b'def f(\r\n    a,\r\n    b,\r\n    c,\r\n):\r\n    pass\r\n'
+    assert not filename.exists()
+    assert not list(tmp_path.rglob('*.py'))
+
+
+def test_check_stdin_reports_issues_as_json_lines_on_stderr(tmp_path: Path) -> None:
+    filename = _stdin_project(tmp_path)
+
+    result = runner.invoke(cli, ['check', '-', '--stdin-filename', str(filename), '--no-cache'], input=STDIN_SOURCE)
+
+    assert result.exit_code != 0
+    issues = [json.loads(line) for line in result.stderr.splitlines()]
+    assert issues == [
+        {
+            'path': str(filename.resolve()),
+            'line': 1,
+            'kind': 'TooManyInlineArgumentsException',
+            'message': 'Too many inline args (3 > 2)',
+            'description': None,
+        }
+    ]
+
+
+def test_stdin_respects_exclusions(tmp_path: Path) -> None:
+    filename = _stdin_project(tmp_path).parent.parent / 'generated' / 'mod.py'
+
+    check = runner.invoke(cli, ['check', '-', '--stdin-filename', str(filename), '--no-cache'], input=STDIN_SOURCE)
+    fmt = runner.invoke(cli, ['format', '-', '--stdin-filename', str(filename), '--no-cache'], input=STDIN_SOURCE)
+
+    assert check.exit_code == 0
+    assert check.stderr == ''
+    assert fmt.exit_code == 0
+    assert fmt.stdout_bytes == STDIN_SOURCE.encode('utf-8')
+
+
+def test_stdin_never_writes_the_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(context, 'report_to_stdout', False)
+    filename = _stdin_project(tmp_path)
+
+    result = runner.invoke(cli, ['check', '-', '--stdin-filename', str(filename)], input=STDIN_SOURCE)
+
+    assert result.exit_code != 0
+    assert list(tmp_path.iterdir()) == [tmp_path / 'pyproject.toml']
+
+
+# What each command prints when it fails on piped input.
+STDIN_ERRORS = {
+    'format': (b'def f(a):\n  \xff\n', 'stdin is not valid UTF-8'),
+    'check': (STDIN_SOURCE.encode('utf-8'), 'Code style violations found'),
+}
+
+
+@pytest.mark.parametrize('command', list(STDIN_ERRORS))
+def test_stdin_errors_go_to_stderr(
+    command: str,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    source, message = STDIN_ERRORS[command]
+    monkeypatch.setattr(context, 'report_to_stdout', False)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, 'argv', ['def-form', command, '-', '--max-inline-args', '2'])
+    monkeypatch.setattr(sys, 'stdin', io.TextIOWrapper(io.BytesIO(source)))
+
+    with pytest.raises(SystemExit):
+        main()
+
+    captured = capsys.readouterr()
+    assert message in captured.err
+    assert message not in captured.out
+
+
+@pytest.mark.parametrize(
+    'args',
+    [
+        ['check', '-', '.'],
+        ['format', '.', '--stdin-filename', 'mod.py'],
+    ],
+)
+def test_stdin_rejects_invalid_path_combinations(args: list[str]) -> None:
+    result = runner.invoke(cli, args, input='')
+
+    assert result.exit_code == 2
+
+
+def test_profile_output_implies_profile(tmp_path: Path) -> None:
+    trace = tmp_path / 'trace.json'
+    with patch('def_form.cli.commands.check.DefManager') as mock_manager_class:
+        result = runner.invoke(cli, ['check', str(tmp_path), '--profile-output', str(trace), '--profile-top', '3'])
+
+    assert result.exit_code == 0
+    call_kw = mock_manager_class.call_args[1]
+    assert call_kw['profile'] is True
+    assert call_kw['profile_top'] == 3
+    assert call_kw['profile_output'] == str(trace)
+
+
+def test_check_writes_events_as_json_lines(tmp_path: Path) -> None:
+    (tmp_path / 'mod.py').write_text(STDIN_SOURCE, encoding='utf-8')
+    events = tmp_path / 'events.jsonl'
+
+    result = runner.invoke(
+        cli,
+        ['check', str(tmp_path / 'mod.py'), '--no-cache', '--max-inline-args', '2', '--events', str(events)],
+    )
+
+    assert result.exit_code != 0
+    kinds = [json.loads(line)['event'] for line in events.read_text(encoding='utf-8').splitlines()]
+    assert kinds == ['file_discovered', 'file_started', 'issue_found', 'file_finished']
+
+
+@pytest.mark.parametrize(
+    'args',
+    [
+        ['check', '.', '--profile', '--daemon'],
+        ['format', '-', '--profile'],
+        ['check', '-', '--events', 'events.jsonl'],
+    ],
+)
+def test_local_only_options_reject_daemon_and_stdin(args: list[str]) -> None:
+    result = runner.invoke(cli, args, input='')
+
+    assert result.exit_code == 2
+    assert 'cannot be combined' in result.output
 
 
 def test_format_raises_cli_error_on_exception(tmp_path: Path) -> None:
@@ -0,0 +1,133 @@
+import io
+import json
+import os
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from def_form.cli.console import PlainConsole
+from def_form.cli.context import CLIContext
+from def_form.cli.main import cli
+from def_form.cli.ui.reporters import GithubUI
+from def_form.cli.ui.reporters import JsonLinesUI
+from def_form.cli.ui.reporters import PlainUI
+from def_form.cli.ui.reporters import SarifUI
+from def_form.cli.ui.reporters import StreamUI
+from def_form.core.models import Issue
+from def_form.exceptions.def_formatter import CheckCommandFoundAnIssue
+from def_form.version import package_version
+
+from tests.helpers import BAD_SOURCE
+from tests.helpers import make_manager
+
+runner = CliRunner()
+
+
+def _issues(path: str) -> list[Issue]:
+    return [
+        Issue(path=path, line=1, kind='TooManyInlineArgumentsException', message='Too many inline args (3 > 2)'),
+        Issue(path=path, line=7, kind='DefStringTooLongException', message='Line too long, 50%: a\nb'),
+    ]
+
+
+def _report(ui_class: type[StreamUI], *paths: str) -> str:
+    stream = io.StringIO()
+    ui = ui_class(console=PlainConsole(context=CLIContext()), stream=stream)
+    ui.start(None)
+    for path in paths:
+        ui.report(Path(path), _issues(path))
+    ui.finish(len(paths) + 1, [], prefilter_hits='1/3')
+    return stream.getvalue()
+
+
+def test_json_lines_reports_issue_fields() -> None:
+    lines = [json.loads(line) for line in _report(JsonLinesUI, '/abs/a.py').splitlines()]
+
+    assert lines[0] == {
+        'path': '/abs/a.py',
+        'line': 1,
+        'kind': 'TooManyInlineArgumentsException',
+        'message': 'Too many inline args (3 > 2)',
+        'description': None,
+    }
+    assert len(lines) == 2
+
+
+def test_sarif_is_one_document_with_results_and_rules() -> None:
+    inside = str(Path.cwd() / 'pkg' / 'a.py')
+
+    sarif = json.loads(_report(SarifUI, inside, '/elsewhere/b.py'))
+
+    run = sarif['runs'][0]
+    assert sarif['version'] == '2.1.0'
+    assert run['tool']['driver']['version'] == package_version()
+    assert [rule['id'] for rule in run['tool']['driver']['rules']] == [
+        'TooManyInlineArgumentsException',
+        'DefStringTooLongException',
+    ]
+    assert len(run['results']) == 4
+    location = run['results'][1]['locations'][0]['physicalLocation']
+    assert location == {
+        'artifactLocation': {'uri': 'pkg/a.py', 'uriBaseId': '%SRCROOT%'},
+        'region': {'startLine': 7},
+    }
+    assert run['results'][2]['locations'][0]['physicalLocation']['artifactLocation'] == {
+        'uri': 'file:///elsewhere/b.py'
+    }
+
+
+def test_sarif_without_issues_is_still_valid() -> None:
+    sarif = json.loads(_report(SarifUI))
+
+    assert sarif['runs'][0]['results'] == []
+
+
+def test_github_annotations_escape_values() -> None:
+    output = _report(GithubUI, f'{Path.cwd()}{os.sep}a.py').splitlines()
+
+    assert output == [
+        '::error file=a.py,line=1,title=TooManyInlineArgumentsException::Too many inline args (3 > 2)',
+        '::error file=a.py,line=7,title=DefStringTooLongException::Line too long, 50%25: a%0Ab',
+    ]
+
+
+def test_plain_lists_issues_then_a_summary() -> None:
+    output = _report(PlainUI, 'a.py', 'b.py').splitlines()
+
+    assert output[0] == 'a.py:1: Too many inline args (3 > 2) (TooManyInlineArgumentsException)'
+    assert output[-2:] == ['Found 4 errors in 2 files (3 files processed)', 'Prefilter hits: 1/3']
+
+
+def test_streaming_ui_keeps_no_issues_on_the_manager(tmp_path: Path) -> None:
+    for i in range(3):
+        (tmp_path / f'mod_{i}.py').write_text(BAD_SOURCE, encoding='utf-8')
+    stream = io.StringIO()
+    ui = JsonLinesUI(console=PlainConsole(context=CLIContext()), stream=stream)
+    manager = make_manager(tmp_path, ui=ui, cache=False)
+
+    with pytest.raises(CheckCommandFoundAnIssue):
+        manager.check()
+
+    assert manager.issues == []
+    assert len(stream.getvalue().splitlines()) == 3
+
+
+def test_check_writes_sarif_to_stdout(tmp_path: Path) -> None:
+    (tmp_path / 'mod.py').write_text(BAD_SOURCE, encoding='utf-8')
+
+    result = runner.invoke(
+        cli,
+        ['check', str(tmp_path), '--no-cache', '--max-inline-args', '2', '--output-format', 'sarif'],
+    )
+
+    assert result.exit_code != 0
+    sarif = json.loads(result.stdout)
+    assert sarif['runs'][0]['results'][0]['ruleId'] == 'TooManyInlineArgumentsException'
+
+
+def test_output_format_rejects_stdin() -> None:
+    result = runner.invoke(cli, ['check', '-', '--output-format', 'github'], input='')
+
+    assert result.exit_code == 2
+    assert '--output-format cannot be combined' in result.output
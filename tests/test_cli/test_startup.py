@@ -0,0 +1,79 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import def_form
+
+# Generous enough for slow CI machines; importing libcst or rich alone used to exceed it.
+STARTUP_BUDGET_US = 400_000
+HEAVY_PACKAGES = ('libcst', 'rich')
+ROOT = Path(def_form.__file__).resolve().parent.parent
+
+
+def _run(*args: str, cwd: Path | None = None) -> subprocess.CompletedProcess[str]:
+    env = {**os.environ, 'PYTHONPATH': str(ROOT)}
+    return subprocess.run(  # noqa: S603
+        [sys.executable, '-X', 'importtime', *args],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+        env=env,
+        check=False,
+    )
+
+
+def _import_times(stderr: str) -> dict[str, int]:
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line.split('|')
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def _heavy_imports(times: dict[str, int]) -> list[str]:
+    return [name for name in times if name.split('.')[0] in HEAVY_PACKAGES]
+
+
+def test_cli_import_skips_heavy_dependencies_and_fits_budget() -> None:
+    result = _run('-c', 'import def_form.cli.main')
+
+    assert result.returncode == 0, result.stderr
+    times = _import_times(result.stderr)
+    assert _heavy_imports(times) == []
+    assert times['def_form.cli.main'] < STARTUP_BUDGET_US
+
+
+def test_help_does_not_import_heavy_dependencies() -> None:
+    result = _run('-m', 'def_form.cli.main', 'check', '--help')
+
+    assert result.returncode == 0, result.stderr
+    assert 'Usage' in result.stdout
+    assert _heavy_imports(_import_times(result.stderr)) == []
+
+
+def test_quiet_check_loads_libcst_only_when_a_file_is_parsed(tmp_path: Path) -> None:
+    (tmp_path / 'mod.py').write_text('def f(\n    a,\n    b,\n):\n    pass\n', encoding='utf-8')
+    args = ('-m', 'def_form.cli.main', '--quiet', 'check', str(tmp_path), '--max-inline-args', '1')
+
+    cold = _run(*args, cwd=tmp_path)
+    warm = _run(*args, cwd=tmp_path)
+
+    assert cold.returncode == 0, cold.stderr
+    assert warm.returncode == 0, warm.stderr
+    assert 'libcst' in _import_times(cold.stderr)
+    assert _heavy_imports(_import_times(warm.stderr)) == []
+
+
+def test_machine_readable_report_does_not_import_rich(tmp_path: Path) -> None:
+    (tmp_path / 'mod.py').write_text('def f(a, b, c):\n    pass\n', encoding='utf-8')
+    args = ('-m', 'def_form.cli.main', 'check', str(tmp_path), '--max-inline-args', '2', '--output-format', 'jsonl')
+
+    result = _run(*args, '--no-cache', cwd=tmp_path)
+
+    assert result.returncode == 1
+    assert 'TooManyInlineArgumentsException' in result.stdout
+    assert 'rich' not in _import_times(result.stderr)
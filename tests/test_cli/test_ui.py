@@ -300,3 +300,13 @@ def test_rich_ui_show_summary_success_rate_branches() -> None:
     assert console.print.call_count >= 1
     ui.show_summary(10, [TooManyInlineArgumentsException(path=f'f{i}.py:1', message='x') for i in range(10)])
     assert console.print.call_count >= 2
+
+
+def test_rich_ui_show_summary_adds_stats_rows() -> None:
+    ctx = CLIContext()
+    output = StringIO()
+    console = RichConsole(context=ctx, file=output, width=120)
+    ui = RichUI(console=console)
+    ui.finish(4, [], prefilter_hits='3/4 (75.0%)')
+    assert 'Prefilter hits:' in output.getvalue()
+    assert '3/4 (75.0%)' in output.getvalue()
@@ -4,7 +4,14 @@ from unittest.mock import patch
 import libcst as cst
 
 from def_form.core.base import DefBase
+from def_form.core.base import render_def_header
 from def_form.core.checker import DefChecker
+from def_form.core.config import DefFormConfig
+from def_form.core.formatter import DefFormatter
+from def_form.core.processing import process_source
+from def_form.core.source import SourceIndex
+from def_form.core.source import find_def_starts
+from def_form.core.source import find_skip_lines
 
 
 def _parse_and_get_function(code: str) -> cst.FunctionDef:
@@ -90,3 +97,127 @@ def test_count_arguments_includes_star_kwarg() -> None:
     base = DefBase(filepath='x.py', max_def_length=None, max_inline_args=None)
     count = base._count_arguments(node)
     assert count == 2
+
+
+def test_find_skip_lines_collects_line_numbers() -> None:
+    code = 'x = 1\n# def-form: skip\ndef f(a, b, c): pass\ndef g(a, b, c):  # DEF-FORM: SKIP\n    pass\n'
+    assert find_skip_lines(code) == frozenset({2, 4})
+
+
+def test_has_skip_comment_uses_in_memory_source_without_reading_file() -> None:
+    code = '# def-form: skip\ndef f(a, b, c): pass\n'
+    wrapper = cst.metadata.MetadataWrapper(cst.parse_module(code))
+    checker = DefChecker(
+        filepath='<memory>',
+        max_def_length=None,
+        max_inline_args=2,
+        indent_size=4,
+        source=SourceIndex(code),
+    )
+
+    with patch.object(Path, 'open', side_effect=AssertionError('file must not be opened')):
+        wrapper.visit(checker)
+    assert checker.issues == []
+
+
+def test_skip_lines_reads_file_once_without_source(tmp_path: Path) -> None:
+    py_file = tmp_path / 'f.py'
+    py_file.write_text('def f(a, b, c): pass\ndef g(a, b, c): pass\n', encoding='utf-8')
+    wrapper = cst.metadata.MetadataWrapper(cst.parse_module(py_file.read_text()))
+    checker = DefChecker(filepath=str(py_file), max_def_length=None, max_inline_args=2, indent_size=4)
+
+    opened: list[Path] = []
+    original_open = Path.open
+
+    def open_side_effect(self: Path, *args: object, **kwargs: object) -> object:
+        opened.append(self)
+        return original_open(self, *args, **kwargs)
+
+    with patch.object(Path, 'open', open_side_effect):
+        wrapper.visit(checker)
+    assert opened == [py_file]
+    assert len(checker.issues) == 2
+
+
+def test_render_def_header_skips_decorators_comments_and_body() -> None:
+    code = '# leading comment\n@decorator\nasync def f(a, b):  # trailing\n    def inner(x):\n        pass\n    return a\n'
+    node = _parse_and_get_function(code)
+    header = render_def_header(node)
+    assert header.split('\n', 1)[0] == 'async def f(a, b):  # trailing'
+    assert 'inner' not in header
+    assert 'decorator' not in header
+
+
+def test_analyze_function_measures_def_line_of_decorated_function() -> None:
+    code = '@d\ndef function_with_long_name(a): pass\n'
+    wrapper = cst.metadata.MetadataWrapper(cst.parse_module(code))
+    checker = DefChecker(filepath='x.py', max_def_length=20, max_inline_args=None, indent_size=4)
+    wrapper.visit(checker)
+    assert [issue.message for issue in checker.issues] == ['Function definition too long (36 > 20)']
+
+
+def test_checker_does_not_enter_expressions_or_leaf_def_bodies() -> None:
+    code = (
+        'TABLE = {"a": [1, 2, 3]}\n'
+        'def leaf(a, b, c=f(x)):\n'
+        '    return [a for _ in TABLE]\n'
+        'class C:\n'
+        '    def outer(self, a):\n'
+        '        if a:\n'
+        '            def inner(a, b, c):\n'
+        '                return a\n'
+    )
+    checker = DefChecker(filepath='x.py', max_def_length=None, max_inline_args=2, indent_size=4)
+    reached: list[str] = []
+    on_leave = DefChecker.on_leave
+
+    def record(self: DefChecker, node: cst.CSTNode) -> None:
+        reached.append(type(node).__name__)
+        on_leave(self, node)
+
+    with patch.object(DefChecker, 'on_leave', record):
+        cst.metadata.MetadataWrapper(cst.parse_module(code)).visit(checker)
+
+    assert reached.count('FunctionDef') == 3
+    assert 'SimpleStatementLine' in reached
+    # Pruned nodes are reached, but nothing below them is.
+    assert not {'Dict', 'Integer', 'Call', 'ListComp', 'Param', 'Return'} & set(reached)
+    assert [issue.path.rsplit(':', 1)[-1] for issue in checker.issues] == ['2', '7']
+
+
+POSITIONS_SOURCE = (
+    '@decorator\n'
+    'def first(a, b, c):\n'
+    '    text = """\n'
+    'def not_a_def(a, b, c):\n'
+    '"""\n'
+    'class C:\n'
+    '    async  def  second (self,\n'
+    '            a, b):\n'
+    '        if a:\n'
+    '            def third(a, b, c): return a\n'
+)
+
+
+def test_find_def_starts_lists_def_keywords_in_source_order() -> None:
+    assert find_def_starts(POSITIONS_SOURCE) == ((2, 0), (7, 4), (10, 12))
+    assert find_def_starts('def broken(:\n') is None
+
+
+def test_source_positions_match_position_metadata() -> None:
+    config = DefFormConfig(max_def_length=100, max_inline_args=2, indent_size=4)
+
+    for processor in (DefChecker, DefFormatter):
+        with patch('libcst.metadata.MetadataWrapper', side_effect=AssertionError('metadata resolved')):
+            edits, issues = process_source(POSITIONS_SOURCE, 'x.py', processor, config)
+        with patch('def_form.core.source.find_def_starts', return_value=None):
+            expected_edits, expected_issues = process_source(POSITIONS_SOURCE, 'x.py', processor, config)
+
+        assert [issue.path for issue in issues] == ['x.py:2', 'x.py:10', 'x.py:7']
+        assert [issue.path for issue in issues] == [issue.path for issue in expected_issues]
+        assert edits == expected_edits
+    assert [(edit.start_line, edit.start_column, edit.end_line, edit.end_column) for edit in edits] == [
+        (2, 10, 2, 17),
+        (10, 22, 10, 29),
+        (7, 24, 8, 16),
+    ]
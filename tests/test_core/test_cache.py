@@ -0,0 +1,128 @@
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from def_form.cli.context import CLIContext
+from def_form.cli.console.null import NullConsole
+from def_form.cli.ui.null import NullUI
+from def_form.core.cache import CacheEntry
+from def_form.core.cache import ResultCache
+from def_form.core.config import DefFormConfig
+from def_form.core.manager import DefManager
+from def_form.core.models import Issue
+from def_form.exceptions.def_formatter import CheckCommandFoundAnIssue
+
+from tests.helpers import BAD_SOURCE
+from tests.helpers import make_manager
+
+
+def test_cache_roundtrip(tmp_path: Path) -> None:
+    cache = ResultCache(tmp_path, DefFormConfig(max_inline_args=2))
+    issue = Issue(path='a.py', line=3, kind='TooManyInlineArgumentsException', message='m')
+    key = cache.key(BAD_SOURCE)
+
+    assert cache.get(key) is None
+    cache.put(key, CacheEntry.build((issue,), changed=True))
+
+    entry = cache.get(key)
+    assert entry is not None
+    assert entry.changed is True
+    assert entry.issues_for(Path('b.py')) == (
+        Issue(path='b.py', line=3, kind='TooManyInlineArgumentsException', message='m'),
+    )
+
+
+def test_cache_key_depends_on_settings(tmp_path: Path) -> None:
+    first = ResultCache(tmp_path, DefFormConfig(max_inline_args=2))
+    second = ResultCache(tmp_path, DefFormConfig(max_inline_args=3))
+    ignored = ResultCache(tmp_path, DefFormConfig(max_inline_args=2, ignore=('max-inline-args',)))
+    assert first.key(BAD_SOURCE) != second.key(BAD_SOURCE)
+    assert first.key(BAD_SOURCE) != ignored.key(BAD_SOURCE)
+    assert first.key(BAD_SOURCE) != first.key(BAD_SOURCE + '\n')
+
+
+def test_cache_get_ignores_corrupt_entry(tmp_path: Path) -> None:
+    cache = ResultCache(tmp_path, DefFormConfig())
+    key = cache.key(BAD_SOURCE)
+    cache.put(key, CacheEntry.build((), changed=False))
+    cache._entry_path(key).write_text('{not json', encoding='utf-8')
+    assert cache.get(key) is None
+
+
+def test_cache_prune_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = ResultCache(tmp_path, DefFormConfig())
+    keys = [cache.key(f'x = {i}\n') for i in range(4)]
+    for i, key in enumerate(keys):
+        cache.put(key, CacheEntry.build((), changed=False))
+        os.utime(cache._entry_path(key), ns=(i * 10**9, i * 10**9))
+
+    cache.max_size = cache._entry_path(keys[0]).stat().st_size * 2
+    cache.prune()
+
+    assert [cache._entry_path(key).exists() for key in keys] == [False, False, True, True]
+
+
+def test_manager_check_reuses_cached_results(tmp_path: Path) -> None:
+    src = tmp_path / 'src'
+    src.mkdir()
+    (src / 'mod.py').write_text(BAD_SOURCE, encoding='utf-8')
+    cache_dir = tmp_path / 'cache'
+
+    with pytest.raises(CheckCommandFoundAnIssue):
+        make_manager(src, cache_dir=str(cache_dir)).check()
+
+    manager = make_manager(src, cache_dir=str(cache_dir))
+    with patch('libcst.parse_module') as parse_module, pytest.raises(CheckCommandFoundAnIssue):
+        manager.check()
+
+    parse_module.assert_not_called()
+    assert [(type(i).__name__, i.path) for i in manager.issues] == [
+        ('TooManyInlineArgumentsException', f'{src / "mod.py"}:1'),
+    ]
+
+
+def test_manager_format_skips_files_cached_as_unchanged(tmp_path: Path) -> None:
+    src = tmp_path / 'src'
+    src.mkdir()
+    (src / 'mod.py').write_text('def ok(a):\n    pass\n', encoding='utf-8')
+    cache_dir = tmp_path / 'cache'
+
+    make_manager(src, cache_dir=str(cache_dir)).check()
+
+    manager = make_manager(src, cache_dir=str(cache_dir))
+    with patch('libcst.parse_module') as parse_module:
+        manager.format()
+    parse_module.assert_not_called()
+
+
+def test_manager_no_cache_does_not_create_cache_dir(tmp_path: Path) -> None:
+    src = tmp_path / 'src'
+    src.mkdir()
+    (src / 'mod.py').write_text('x = 1\n', encoding='utf-8')
+    cache_dir = tmp_path / 'cache'
+
+    manager = make_manager(src, cache_dir=str(cache_dir), cache=False)
+    manager.check()
+
+    assert manager.cache is None
+    assert not cache_dir.exists()
+
+
+def test_cache_options_win_over_pyproject(tmp_path: Path) -> None:
+    pyproject = tmp_path / 'pyproject.toml'
+    pyproject.write_text('[tool.def-form]\ncache_dir = "from-config"\ncache_max_size = 1024\n', encoding='utf-8')
+    ui = NullUI(console=NullConsole(context=CLIContext()))
+
+    manager = DefManager(
+        path=str(tmp_path),
+        ui=ui,
+        config=str(pyproject),
+        cache_dir=str(tmp_path / 'cli'),
+        cache_max_size=2048,
+    )
+    assert (manager.cache_dir, manager.cache_max_size) == (str(tmp_path / 'cli'), 2048)
+
+    manager = DefManager(path=str(tmp_path), ui=ui, config=str(pyproject))
+    assert (manager.cache_dir, manager.cache_max_size) == ('from-config', 1024)
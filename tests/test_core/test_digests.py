@@ -0,0 +1,125 @@
+import contextlib
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from def_form.core.manager import DefManager
+from def_form.exceptions.def_formatter import CheckCommandFoundAnIssue
+
+from tests.helpers import BAD_SOURCE
+from tests.helpers import CLEAN_SOURCE
+from tests.helpers import age
+from tests.helpers import make_cached_manager
+
+
+def _tree(tmp_path: Path, files: dict[str, str]) -> Path:
+    src = tmp_path / 'src'
+    for name, content in files.items():
+        path = src / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
+    age(src)
+    return src
+
+
+def _set_mtime(path: Path, mtime_ns: int) -> None:
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def _rewrite_in_place(path: Path, content: str) -> None:
+    # Editing a file does not move its directory's mtime; restore it in case the filesystem did.
+    directory_mtime = path.parent.stat().st_mtime_ns
+    path.write_text(content, encoding='utf-8')
+    _set_mtime(path.parent, directory_mtime)
+
+
+def _read(manager: DefManager) -> list[str]:
+    with (
+        patch('def_form.core.processing.Path.read_text', autospec=True, side_effect=Path.read_text) as read_text,
+        contextlib.suppress(CheckCommandFoundAnIssue),
+    ):
+        manager.check()
+    return sorted(call.args[0].name for call in read_text.call_args_list)
+
+
+def test_clean_tree_is_skipped_without_listing(tmp_path: Path) -> None:
+    _tree(tmp_path, {'top.py': CLEAN_SOURCE, 'pkg/a.py': CLEAN_SOURCE, 'pkg/sub/b.py': CLEAN_SOURCE})
+    make_cached_manager(tmp_path).check()
+
+    manager = make_cached_manager(tmp_path)
+    with patch('def_form.core.manager.os.walk') as walk:
+        manager.check()
+
+    walk.assert_not_called()
+    assert (manager.stats.files, manager.stats.clean_dirs, manager.stats.clean_files) == (0, 3, 3)
+    assert manager.stats.summary()['clean_subtrees_skipped'] == '3 directories, 3 files'
+
+
+def test_in_place_edit_is_found_and_other_subtrees_stay_skipped(tmp_path: Path) -> None:
+    src = _tree(
+        tmp_path,
+        {'top.py': CLEAN_SOURCE, 'pkg/a.py': CLEAN_SOURCE, 'pkg/sub/b.py': CLEAN_SOURCE, 'other/c.py': CLEAN_SOURCE},
+    )
+    make_cached_manager(tmp_path).check()
+
+    _rewrite_in_place(src / 'pkg' / 'sub' / 'b.py', BAD_SOURCE)
+    manager = make_cached_manager(tmp_path)
+
+    # The walked directories' other files are still answered from the stat manifest.
+    assert _read(manager) == ['b.py']
+    assert (manager.stats.files, manager.stats.issues) == (3, 1)
+    assert (manager.stats.clean_dirs, manager.stats.clean_files) == (1, 1)
+
+
+def test_subtrees_with_issues_are_not_recorded(tmp_path: Path) -> None:
+    _tree(tmp_path, {'pkg/a.py': BAD_SOURCE, 'other/c.py': CLEAN_SOURCE})
+    for _ in range(2):
+        with pytest.raises(CheckCommandFoundAnIssue):
+            make_cached_manager(tmp_path).check()
+
+    manager = make_cached_manager(tmp_path)
+    assert _read(manager) == []
+    assert manager.stats.issues == 1
+    assert (manager.stats.files, manager.stats.clean_dirs) == (1, 1)
+
+
+def test_added_file_is_walked(tmp_path: Path) -> None:
+    src = _tree(tmp_path, {'pkg/a.py': CLEAN_SOURCE})
+    make_cached_manager(tmp_path).check()
+
+    (src / 'pkg' / 'new.py').write_text(BAD_SOURCE, encoding='utf-8')
+
+    with pytest.raises(CheckCommandFoundAnIssue):
+        make_cached_manager(tmp_path).check()
+
+
+def test_gitignore_edit_invalidates_the_subtree(tmp_path: Path) -> None:
+    src = _tree(tmp_path, {'.gitignore': 'generated.py\n', 'pkg/generated.py': BAD_SOURCE, 'pkg/a.py': CLEAN_SOURCE})
+    make_cached_manager(tmp_path).check()
+    assert make_cached_manager(tmp_path).digests.records  # type: ignore[union-attr]
+
+    _rewrite_in_place(src / '.gitignore', '# nothing ignored\n')
+
+    with pytest.raises(CheckCommandFoundAnIssue):
+        make_cached_manager(tmp_path).check()
+
+
+def test_recently_changed_directories_are_not_recorded(tmp_path: Path) -> None:
+    (tmp_path / 'src').mkdir()
+    (tmp_path / 'src' / 'a.py').write_text(CLEAN_SOURCE, encoding='utf-8')
+    make_cached_manager(tmp_path).check()
+
+    manager = make_cached_manager(tmp_path)
+    manager.check()
+
+    assert manager.stats.clean_dirs == 0
+    assert manager.stats.files == 1
+
+
+def test_show_skipped_walks_every_directory(tmp_path: Path) -> None:
+    _tree(tmp_path, {'a.py': CLEAN_SOURCE})
+
+    assert make_cached_manager(tmp_path, show_skipped=True).digests is None
+    assert make_cached_manager(tmp_path, cache=False).digests is None
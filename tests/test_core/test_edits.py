@@ -0,0 +1,34 @@
+import pytest
+
+from def_form.core.edits import TextEdit
+from def_form.core.edits import apply_edits
+from def_form.core.edits import line_offsets
+
+
+def test_line_offsets_follow_all_line_endings() -> None:
+    assert line_offsets('a\nbc\r\nd\re') == [0, 2, 6, 8, 9]
+
+
+def test_apply_edits_splices_in_any_order() -> None:
+    code = 'def f(a, b):\n    pass\n\n\ndef g(c):\n    pass\n'
+    edits = [
+        TextEdit(start_line=5, start_column=6, end_line=5, end_column=7, text='x, y'),
+        TextEdit(start_line=1, start_column=6, end_line=1, end_column=10, text='\n    a,\n    b,\n'),
+    ]
+
+    assert apply_edits(code, edits) == 'def f(\n    a,\n    b,\n):\n    pass\n\n\ndef g(x, y):\n    pass\n'
+
+
+def test_apply_edits_without_edits_returns_code() -> None:
+    code = 'x = 1\n'
+    assert apply_edits(code, []) is code
+
+
+def test_apply_edits_rejects_overlapping_edits() -> None:
+    edits = [
+        TextEdit(start_line=1, start_column=0, end_line=1, end_column=3, text=''),
+        TextEdit(start_line=1, start_column=2, end_line=1, end_column=4, text=''),
+    ]
+
+    with pytest.raises(ValueError):
+        apply_edits('abcdef\n', edits)
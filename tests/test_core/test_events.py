@@ -0,0 +1,143 @@
+import io
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from def_form.core.events import CACHE_HIT
+from def_form.core.events import FILE_DISCOVERED
+from def_form.core.events import FILE_FINISHED
+from def_form.core.events import FILE_STARTED
+from def_form.core.events import ISSUE_FOUND
+from def_form.core.events import WRITE_PERFORMED
+from def_form.core.events import Event
+from def_form.core.events import EventHooks
+from def_form.core.events import JsonLinesSink
+from def_form.core.events import MetricsCollector
+from def_form.core.manager import DefManager
+from def_form.exceptions.def_formatter import CheckCommandFoundAnIssue
+
+from tests.helpers import BAD_SOURCE
+from tests.helpers import CLEAN_SOURCE
+from tests.helpers import age
+from tests.helpers import make_manager
+
+
+def test_hooks_are_falsy_until_someone_subscribes() -> None:
+    hooks = EventHooks()
+    first: list[Event] = []
+    second: list[Event] = []
+
+    assert not hooks
+    unsubscribe = hooks.subscribe(first.append)
+    hooks.subscribe(second.append)
+    assert hooks
+
+    hooks.emit(ISSUE_FOUND, Path('mod.py'), 12.5, kind='TooManyArgs', line=1)
+    unsubscribe()
+    hooks.emit(CACHE_HIT, 'mod.py')
+
+    assert first == [Event(ISSUE_FOUND, 'mod.py', 12.5, {'kind': 'TooManyArgs', 'line': 1})]
+    assert [event.kind for event in second] == [ISSUE_FOUND, CACHE_HIT]
+
+
+def test_json_lines_sink_writes_one_object_per_event() -> None:
+    stream = io.StringIO()
+    sink = JsonLinesSink(stream)
+
+    sink(Event(FILE_FINISHED, 'a.py', 1.0, {'duration': 0.5, 'bytes': 10}))
+    sink(Event(CACHE_HIT, 'b.py', 2.0))
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert lines == [
+        {'event': FILE_FINISHED, 'path': 'a.py', 'timestamp': 1.0, 'duration': 0.5, 'bytes': 10},
+        {'event': CACHE_HIT, 'path': 'b.py', 'timestamp': 2.0},
+    ]
+
+
+def test_metrics_collector_aggregates_events() -> None:
+    metrics = MetricsCollector()
+
+    for event in (
+        Event(FILE_DISCOVERED, 'a.py', 0),
+        Event(FILE_FINISHED, 'a.py', 0, {'duration': 0.25, 'bytes': 100}),
+        Event(FILE_FINISHED, 'b.py', 0, {'duration': 0.5, 'bytes': 50}),
+        Event(ISSUE_FOUND, 'a.py', 0, {'kind': 'TooManyArgs'}),
+        Event(ISSUE_FOUND, 'b.py', 0, {'kind': 'TooManyArgs'}),
+        Event(WRITE_PERFORMED, 'a.py', 0, {'bytes': 120}),
+    ):
+        metrics(event)
+
+    snapshot = metrics.snapshot()
+    assert snapshot['files_discovered'] == 1
+    assert snapshot['files_finished'] == 2
+    assert snapshot['issues_by_kind'] == {'TooManyArgs': 2}
+    assert snapshot['bytes_read'] == 150
+    assert snapshot['bytes_written'] == 120
+    assert snapshot['duration'] == 0.75
+    assert snapshot['max_duration'] == 0.5
+
+
+def _manager(tmp_path: Path, **kwargs: object) -> DefManager:
+    (tmp_path / 'bad.py').write_text(BAD_SOURCE, encoding='utf-8')
+    (tmp_path / 'good.py').write_text(CLEAN_SOURCE, encoding='utf-8')
+    age(tmp_path)
+    return make_manager(tmp_path, **kwargs)
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_format_run_emits_file_lifecycle_events_on_the_calling_thread(tmp_path: Path, jobs: int) -> None:
+    manager = _manager(tmp_path, jobs=jobs, cache=False)
+    events: list[Event] = []
+    threads: set[threading.Thread] = set()
+    manager.events.subscribe(events.append)
+    manager.events.subscribe(lambda event: threads.add(threading.current_thread()))
+
+    manager.format()
+
+    assert threads == {threading.current_thread()}
+    bad = str(tmp_path / 'bad.py')
+    assert [event.kind for event in events if event.path == bad] == [
+        FILE_DISCOVERED,
+        FILE_STARTED,
+        ISSUE_FOUND,
+        WRITE_PERFORMED,
+        FILE_FINISHED,
+    ]
+
+    finished = {event.path: event.data for event in events if event.kind == FILE_FINISHED}
+    assert finished[bad]['bytes'] == len(BAD_SOURCE)
+    assert finished[bad]['issues'] == 1
+    assert finished[bad]['duration'] > 0
+    assert 'write' in finished[bad]['phases']
+    assert finished[str(tmp_path / 'good.py')]['prefiltered'] is True
+
+    written = next(event for event in events if event.kind == WRITE_PERFORMED)
+    assert written.data['bytes'] == (tmp_path / 'bad.py').stat().st_size
+
+
+def test_cached_results_emit_cache_hits(tmp_path: Path) -> None:
+    manager = _manager(tmp_path, cache_dir=str(tmp_path / '.cache'))
+    with pytest.raises(CheckCommandFoundAnIssue):
+        manager.check()
+
+    metrics = MetricsCollector()
+    manager.events.subscribe(metrics)
+    with pytest.raises(CheckCommandFoundAnIssue):
+        manager.check()
+
+    # The clean file was prefiltered on the first run; now the stat manifest answers it too.
+    snapshot = metrics.snapshot()
+    assert snapshot['cache_hits'] == 2
+    assert snapshot['issues'] == 1
+    assert snapshot['files_finished'] == 2
+
+
+def test_runs_without_subscribers_skip_per_file_measurements(tmp_path: Path) -> None:
+    manager = _manager(tmp_path, cache=False)
+    results = []
+
+    manager._run(manager.checker_class, on_result=results.append)
+
+    assert [result.profile for result in results] == [None, None]
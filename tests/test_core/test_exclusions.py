@@ -0,0 +1,163 @@
+import os
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from def_form.core.exclusions import ExclusionMatcher
+from def_form.core.exclusions import IgnorePattern
+from def_form.core.exclusions import IgnoreRules
+from def_form.core.exclusions import is_glob
+from def_form.core.manager import DefManager
+
+from tests.helpers import make_manager
+
+
+@pytest.mark.parametrize(
+    ('pattern', 'relative', 'is_dir', 'expected'),
+    [
+        ('*.py', 'pkg/mod.py', False, True),
+        ('*.py', 'pkg/mod.pyc', False, False),
+        ('build/', 'pkg/build', True, True),
+        ('build/', 'pkg/build', False, False),
+        ('/build', 'build', True, True),
+        ('/build', 'pkg/build', True, False),
+        ('pkg/*.py', 'pkg/mod.py', False, True),
+        ('pkg/*.py', 'pkg/sub/mod.py', False, False),
+        ('**/gen', 'a/b/gen', True, True),
+        ('pkg/**', 'pkg/a/b.py', False, True),
+        ('a/**/b', 'a/b', True, True),
+        ('a/**/b', 'a/x/y/b', True, True),
+        ('mod_[0-9].py', 'mod_7.py', False, True),
+        ('mod_[!0-9].py', 'mod_7.py', False, False),
+        ('te?t.py', 'test.py', False, True),
+        ('\\#literal.py', '#literal.py', False, True),
+    ],
+)
+def test_ignore_pattern_matches_like_gitignore(pattern: str, relative: str, is_dir: bool, expected: bool) -> None:
+    parsed = IgnorePattern.parse(pattern)
+
+    assert parsed is not None
+    assert parsed.matches(relative, relative.rsplit('/', 1)[-1], is_dir) is expected
+
+
+@pytest.mark.parametrize('line', ['', '   ', '# comment', '/', '!'])
+def test_ignore_pattern_skips_blank_and_comment_lines(line: str) -> None:
+    assert IgnorePattern.parse(line) is None
+
+
+def test_ignore_rules_last_match_wins_and_negation(tmp_path: Path) -> None:
+    rules = IgnoreRules.from_lines(tmp_path, ['*.py', '!keep.py'])
+
+    assert rules.match(str(tmp_path / 'drop.py'), 'drop.py', is_dir=False) is True
+    assert rules.match(str(tmp_path / 'keep.py'), 'keep.py', is_dir=False) is False
+    assert rules.match(str(tmp_path / 'notes.txt'), 'notes.txt', is_dir=False) is None
+    assert rules.match('/elsewhere/drop.py', 'drop.py', is_dir=False) is None
+
+
+def test_is_glob() -> None:
+    assert is_glob('*.py')
+    assert is_glob('mod_[0-9].py')
+    assert not is_glob('build/')
+
+
+def test_matcher_keeps_path_and_name_semantics(tmp_path: Path) -> None:
+    matcher = ExclusionMatcher({tmp_path / 'venv', Path('/')}, (), base=tmp_path)
+    only_names = ExclusionMatcher({tmp_path / 'venv'}, (), base=tmp_path)
+
+    assert matcher.excludes(Path('/anything.py'))
+    assert only_names.excludes(tmp_path / 'venv' / 'lib' / 'x.py')
+    assert only_names.excludes(Path('/other/venv/x.py'))
+    assert not only_names.excludes(tmp_path / 'venv_tools' / 'x.py')
+
+
+def test_matcher_checks_patterns_against_parent_directories(tmp_path: Path) -> None:
+    matcher = ExclusionMatcher((), ('gen*/', 'legacy/*.py'), base=tmp_path)
+
+    assert matcher.excludes(tmp_path / 'generated' / 'pkg' / 'mod.py')
+    assert matcher.excludes(tmp_path / 'legacy' / 'old.py')
+    assert not matcher.excludes(tmp_path / 'legacy' / 'pkg' / 'old.py')
+    assert not matcher.excludes(tmp_path / 'src' / 'gen.py')
+
+
+def _write(root: Path, *relative: str) -> None:
+    for name in relative:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('x = 1\n', encoding='utf-8')
+
+
+def _relative(manager: DefManager, root: Path) -> list[str]:
+    return sorted(path.relative_to(root).as_posix() for path in manager._iter_py_files())
+
+
+def test_walk_honours_nested_gitignore_files_and_info_exclude(tmp_path: Path) -> None:
+    tmp_path = tmp_path.resolve()
+    subprocess.run(['git', 'init', '-q', str(tmp_path)], check=True)  # noqa: S603, S607
+    _write(
+        tmp_path,
+        'src/app.py',
+        'src/build/out.py',
+        'src/gen/schema_pb2.py',
+        'src/gen/keep_pb2.py',
+        'scratch/tmp.py',
+        'local.py',
+    )
+    (tmp_path / '.gitignore').write_text('build/\n*_pb2.py\n', encoding='utf-8')
+    (tmp_path / 'src' / 'gen' / '.gitignore').write_text('!keep_pb2.py\n', encoding='utf-8')
+    (tmp_path / '.git' / 'info' / 'exclude').write_text('/scratch\n/local.py\n', encoding='utf-8')
+
+    assert _relative(make_manager(tmp_path, cache=False), tmp_path) == ['src/app.py', 'src/gen/keep_pb2.py']
+    assert _relative(make_manager(tmp_path / 'src', cache=False), tmp_path) == ['src/app.py', 'src/gen/keep_pb2.py']
+
+    unfiltered = make_manager(tmp_path, cache=False)
+    unfiltered.respect_gitignore = False
+    assert len(_relative(unfiltered, tmp_path)) == 6
+
+
+def test_walk_applies_glob_exclusions(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    tmp_path = tmp_path.resolve()
+    monkeypatch.chdir(tmp_path)
+    _write(tmp_path, 'pkg/mod.py', 'pkg/test_mod.py', 'migrations/0001_init.py', 'venv/lib/site.py')
+
+    manager = make_manager(tmp_path, cache=False, excluded=('test_*.py', 'migrations/', 'venv'))
+
+    assert _relative(manager, tmp_path) == ['pkg/mod.py']
+    assert manager.exclude_patterns == ('test_*.py',)
+    assert manager.excluded == {tmp_path / 'migrations', tmp_path / 'venv'}
+
+
+def test_assigning_excluded_recompiles_the_matcher(tmp_path: Path) -> None:
+    _write(tmp_path, 'a/mod.py', 'b/mod.py')
+    manager = make_manager(tmp_path, cache=False)
+
+    manager.excluded = {tmp_path / 'a'}
+
+    assert _relative(manager, tmp_path) == ['b/mod.py']
+
+
+def test_pruned_directories_are_never_statted(tmp_path: Path) -> None:
+    tmp_path = tmp_path.resolve()
+    _write(tmp_path, 'src/mod.py', *(f'node_modules/pkg_{i}/mod.py' for i in range(20)))
+    manager = make_manager(tmp_path, cache=False, excluded=('node_modules',))
+    real_stat = os.stat
+    statted: list[str] = []
+
+    def recording_stat(path: object, *args: object, **kwargs: object) -> os.stat_result:
+        statted.append(os.fspath(path))  # type: ignore[arg-type]
+        return real_stat(path, *args, **kwargs)  # type: ignore[arg-type]
+
+    with patch('os.stat', recording_stat):
+        assert _relative(manager, tmp_path) == ['src/mod.py']
+
+    assert not any('node_modules' in path for path in statted)
+
+
+def test_cache_directory_is_never_walked(tmp_path: Path) -> None:
+    tmp_path = tmp_path.resolve()
+    _write(tmp_path, 'src/mod.py', '.def_form_cache/ab/stray.py', 'src/.def_form_cache/cd/stray.py')
+    manager = make_manager(tmp_path, cache=False)
+    manager.respect_gitignore = False
+
+    assert _relative(manager, tmp_path) == ['src/mod.py']
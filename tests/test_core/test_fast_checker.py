@@ -0,0 +1,112 @@
+from pathlib import Path
+
+import pytest
+
+import def_form
+
+from def_form.cli.context import CLIContext
+from def_form.cli.console.null import NullConsole
+from def_form.cli.ui.null import NullUI
+from def_form.core.checker import DefChecker
+from def_form.core.config import DefFormConfig
+from def_form.core.fast_checker import FastDefChecker
+from def_form.core.fast_checker import resolve_backend
+from def_form.core.manager import DefManager
+from def_form.core.processing import load_processor
+from def_form.core.processing import process_source
+from def_form.exceptions.def_formatter import CheckCommandFoundAnIssue
+
+from tests.conftest import CASE_IDS
+from tests.helpers import BAD_SOURCE
+from tests.helpers import MAX_DEF_LENGTH
+from tests.helpers import MAX_INLINE_ARGS
+from tests.helpers import make_manager
+
+
+CONFIGS = [
+    DefFormConfig(max_def_length=MAX_DEF_LENGTH, max_inline_args=MAX_INLINE_ARGS, indent_size=4),
+    DefFormConfig(max_def_length=40, max_inline_args=1, indent_size=2),
+    DefFormConfig(),
+]
+
+EDGE_CASES = {
+    'lambda_default': 'def f(\n    a=lambda x, y: x,\n    b=1,\n):\n    pass\n',
+    'nested_lambda_default': 'def f(\n    a=lambda x=lambda: 1, y=2: x,\n):\n    pass\n',
+    'posonly': 'def f(\n    a,\n    /,\n    b,\n):\n    pass\n',
+    'posonly_only': 'def f(a, b, /):\n    pass\n',
+    'bare_star': 'def f(\n    a,\n    *,\n    b,\n):\n    pass\n',
+    'star_args': 'def f(\n    *args: int,\n    **kwargs: str,\n):\n    pass\n',
+    'missing_trailing_comma': 'def f(\n    a,\n    b\n):\n    pass\n',
+    'closing_paren_indented': 'def f(\n    a,\n    b,\n    ):\n    pass\n',
+    'comments': 'def f(  # one\n    # two\n\n    a,  # three\n    b,\n):\n    pass\n',
+    'nested_brackets': 'def f(\n    a: dict[str, tuple[int, int]] = {1: (2, 3)},\n    b=[1, 2],\n):\n    pass\n',
+    'class_method': 'class A:\n    def f(\n        self,\n        a,\n    ):\n        pass\n',
+    'wrong_class_indent': 'class A:\n    def f(\n      self,\n      a,\n    ):\n        pass\n',
+    'decorated': '@decorator(1, 2)\n@other\nasync def f(\n    a,\n    b,\n):\n    pass\n',
+    'crlf': 'def f(\r\n    a,\r\n    b,\r\n):\r\n    pass\r\n',
+    'skip_comment': '# def-form: skip\ndef f(a, b, c, d):\n    pass\n\n\ndef g(a, b, c, d):  # def-form: skip\n    pass\n',
+    'nested_defs': 'def outer(a, b, c):\n    def inner(d, e, f):\n        pass\n',
+    'multiline_string_default': 'def f(\n    a="""x,\ny""",\n    b=1,\n):\n    pass\n',
+    'no_args': 'def f(\n):\n    pass\n',
+}
+
+
+def _issue_keys(issues: list) -> list[tuple[type, str, str]]:
+    return [(type(issue), issue.path, issue.message) for issue in issues]
+
+
+def _assert_parity(code: str, filepath: str, config: DefFormConfig) -> None:
+    _, expected = process_source(code, filepath, DefChecker, config)
+    _, actual = process_source(code, filepath, FastDefChecker, config)
+
+    assert _issue_keys(actual) == _issue_keys(expected)
+
+
+@pytest.mark.parametrize('config', CONFIGS)
+@pytest.mark.parametrize('case_id', CASE_IDS, indirect=True)
+def test_fast_checker_matches_libcst_on_cases(case_id: str, case_dir: Path, config: DefFormConfig) -> None:
+    for name in ('source.py', 'expected.py'):
+        path = case_dir / name
+        if path.exists():
+            _assert_parity(path.read_text(encoding='utf-8'), str(path), config)
+
+
+@pytest.mark.parametrize('config', CONFIGS)
+@pytest.mark.parametrize('code', EDGE_CASES.values(), ids=EDGE_CASES.keys())
+def test_fast_checker_matches_libcst_on_edge_cases(code: str, config: DefFormConfig) -> None:
+    _assert_parity(code, 'module.py', config)
+
+
+@pytest.mark.parametrize('config', CONFIGS)
+def test_fast_checker_matches_libcst_on_own_sources(config: DefFormConfig) -> None:
+    for path in sorted(Path(def_form.__file__).parent.rglob('*.py')):
+        _assert_parity(path.read_text(encoding='utf-8'), str(path), config)
+
+
+def test_resolve_backend_values() -> None:
+    assert resolve_backend(None) == 'libcst'
+    assert resolve_backend('fast') == 'fast'
+    assert resolve_backend(' LibCST ') == 'libcst'
+
+    with pytest.raises(ValueError):
+        resolve_backend('regex')
+
+
+def test_manager_uses_fast_checker_for_fast_backend(tmp_path: Path) -> None:
+    (tmp_path / 'mod.py').write_text(BAD_SOURCE, encoding='utf-8')
+
+    manager = make_manager(tmp_path, backend='fast', cache=False)
+
+    assert load_processor(manager.checker_class) is FastDefChecker
+    with pytest.raises(CheckCommandFoundAnIssue):
+        manager.check()
+    assert len(manager.issues) == 1
+
+
+def test_backend_option_wins_over_pyproject(tmp_path: Path) -> None:
+    pyproject = tmp_path / 'pyproject.toml'
+    pyproject.write_text('[tool.def-form]\nbackend = "fast"\n', encoding='utf-8')
+    ui = NullUI(console=NullConsole(context=CLIContext()))
+
+    assert DefManager(path=str(tmp_path), ui=ui, config=str(pyproject), backend='libcst').backend == 'libcst'
+    assert DefManager(path=str(tmp_path), ui=ui, config=str(pyproject)).backend == 'fast'
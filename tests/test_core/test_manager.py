@@ -1,11 +1,18 @@
+import shutil
+import subprocess
 from pathlib import Path
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
+import pytest
+
 from def_form.cli.context import CLIContext
 from def_form.cli.console.null import NullConsole
 from def_form.cli.ui.null import NullUI
 from def_form.core.manager import DefManager
+from def_form.core.processing import process_path
+
+from tests.helpers import make_manager
 
 
 def _make_manager(path: str = '.', config: str | None = None, excluded: tuple[str, ...] = ()) -> DefManager:
@@ -99,54 +106,165 @@ def test_iter_py_files_file_excluded_calls_ui_skipped(tmp_path: Path) -> None:
     ui.skipped.assert_called_once()
 
 
-def test_process_file_read_error_returns_empty(tmp_path: Path) -> None:
+# A header split over lines gets past the prefilter, so these files are really parsed.
+UNFILTERED_SOURCE = 'def f(a,\n      b): pass\n'
+
+
+def test_process_path_read_error_returns_empty(tmp_path: Path) -> None:
     f = tmp_path / 'x.py'
-    f.write_text('def f(): pass')
+    f.write_text(UNFILTERED_SOURCE)
     with patch('def_form.core.manager.find_pyproject_toml', return_value=None):
         m = _make_manager(path=str(tmp_path))
     with patch.object(Path, 'read_text', side_effect=OSError):
-        tree, issues = m._process_file(f, m.checker_class)
-    assert tree is None
-    assert issues == []
+        result = process_path(f, m.checker_class, m.settings)
+    assert result.issues == ()
+    assert result.code is None
 
 
-def test_process_file_syntax_error_returns_empty(tmp_path: Path) -> None:
+def test_process_path_syntax_error_returns_empty(tmp_path: Path) -> None:
     import libcst as cst
 
     f = tmp_path / 'x.py'
-    f.write_text('x = 1')
+    f.write_text(UNFILTERED_SOURCE)
     with patch('def_form.core.manager.find_pyproject_toml', return_value=None):
         m = _make_manager(path=str(tmp_path))
     err = cst.ParserSyntaxError('syntax error', lines=(), raw_line=1, raw_column=0)
-    with patch('def_form.core.manager.cst.parse_module', side_effect=err):
-        tree, issues = m._process_file(f, m.checker_class)
-    assert tree is None
-    assert issues == []
+    with patch('libcst.parse_module', side_effect=err) as parse_module:
+        result = process_path(f, m.checker_class, m.settings)
+    parse_module.assert_called_once()
+    assert result.issues == ()
+    assert result.code is None
 
 
-def test_process_file_generic_exception_returns_empty(tmp_path: Path) -> None:
+def test_process_path_generic_exception_returns_empty(tmp_path: Path) -> None:
     f = tmp_path / 'x.py'
-    f.write_text('def f(): pass')
+    f.write_text(UNFILTERED_SOURCE)
     with patch('def_form.core.manager.find_pyproject_toml', return_value=None):
         m = _make_manager(path=str(tmp_path))
 
     def raise_in_visit(*args: object, **kwargs: object) -> None:
         raise RuntimeError('visit failed')
 
-    with patch('def_form.core.manager.cst.metadata.MetadataWrapper') as MockWrapper:
-        mock_wrapper = MagicMock()
-        MockWrapper.return_value = mock_wrapper
-        mock_wrapper.visit.side_effect = raise_in_visit
-        tree, issues = m._process_file(f, m.checker_class)
-    assert tree is None
-    assert issues == []
+    with patch('libcst.Module.visit', side_effect=raise_in_visit) as visit:
+        result = process_path(f, m.formatter_class, m.settings)
+    visit.assert_called_once()
+    assert result.issues == ()
+    assert result.code is None
 
 
 def test_write_on_os_error_calls_ui_error(tmp_path: Path) -> None:
     ui = MagicMock()
     with patch('def_form.core.manager.find_pyproject_toml', return_value=None):
         m = DefManager(path=str(tmp_path), ui=ui, config=None)
-    with patch.object(Path, 'write_text', side_effect=OSError('permission')):
+    with patch('def_form.core.manager.atomic_write', side_effect=OSError('permission')):
         m._write(tmp_path / 'out.py', 'code')
     ui.console.error.assert_called_once()
     assert 'Exception occurred' in str(ui.console.error.call_args[0][0])
+
+
+def test_write_replaces_file_atomically_and_keeps_mode(tmp_path: Path) -> None:
+    target = tmp_path / 'mod.py'
+    target.write_text('old', encoding='utf-8')
+    target.chmod(0o640)
+    with patch('def_form.core.manager.find_pyproject_toml', return_value=None):
+        m = _make_manager(path=str(tmp_path))
+
+    m._write(target, 'new')
+
+    assert target.read_text(encoding='utf-8') == 'new'
+    assert target.stat().st_mode & 0o777 == 0o640
+    assert [p.name for p in tmp_path.iterdir()] == ['mod.py']
+
+
+def test_format_writes_only_changed_files(tmp_path: Path) -> None:
+    changed = tmp_path / 'changed.py'
+    changed.write_text('def f(a, b, c):\n    pass\n', encoding='utf-8')
+    unchanged = tmp_path / 'unchanged.py'
+    unchanged.write_text('def f(\n  a,\n):\n    pass\n', encoding='utf-8')
+    clean = tmp_path / 'clean.py'
+    clean.write_text('def f(a):\n    pass\n', encoding='utf-8')
+    m = make_manager(tmp_path, cache=False)
+    m.indent_size = 2
+
+    with patch.object(m, '_write', wraps=m._write) as mocked_write:
+        m.format()
+
+    assert [call[1]['dest'] for call in mocked_write.call_args_list] == [changed]
+    assert m.stats.reformatted == 1
+    assert m.stats.unchanged == 2
+    assert m.stats.summary(cache_enabled=False)['files_unchanged'].startswith('2 (')
+
+
+def _commit_all(repo: Path) -> None:
+    git = ['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com']
+    subprocess.run([*git, 'init', '-q'], cwd=repo, check=True)
+    subprocess.run([*git, 'add', '.'], cwd=repo, check=True)
+    subprocess.run([*git, 'commit', '-q', '-m', 'initial'], cwd=repo, check=True)
+
+
+@pytest.mark.skipif(shutil.which('git') is None, reason='git is not installed')
+def test_changed_since_limits_files_to_git_changes(tmp_path: Path) -> None:
+    repo = tmp_path / 'repo'
+    (repo / 'src').mkdir(parents=True)
+    (repo / 'src' / 'clean.py').write_text('def f(a):\n    pass\n', encoding='utf-8')
+    (repo / 'src' / 'touched.py').write_text('def f(a):\n    pass\n', encoding='utf-8')
+    (repo / 'src' / 'notes.txt').write_text('x\n', encoding='utf-8')
+    (repo / 'outside.py').write_text('def f(a):\n    pass\n', encoding='utf-8')
+    _commit_all(repo)
+
+    for name in ('src/touched.py', 'src/notes.txt', 'outside.py'):
+        (repo / name).write_text((repo / name).read_text(encoding='utf-8') + '\n', encoding='utf-8')
+    (repo / 'src' / 'excluded.py').write_text('x = 1\n', encoding='utf-8')
+
+    ui = MagicMock()
+    m = make_manager(repo / 'src', ui=ui, excluded=(str(repo / 'src' / 'excluded.py'),), changed_since='HEAD')
+
+    assert list(m._iter_py_files()) == [(repo / 'src' / 'touched.py').resolve()]
+    ui.skipped.assert_called_once_with((repo / 'src' / 'excluded.py').resolve())
+
+
+@pytest.mark.skipif(shutil.which('git') is None, reason='git is not installed')
+def test_changed_since_looks_up_each_path_in_its_own_repository(tmp_path: Path) -> None:
+    tmp_path = tmp_path.resolve()
+    for name in ('first', 'second'):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / 'clean.py').write_text('def f(a):\n    pass\n', encoding='utf-8')
+        _commit_all(tmp_path / name)
+        (tmp_path / name / 'touched.py').write_text('def f(a):\n    pass\n', encoding='utf-8')
+
+    m = make_manager([str(tmp_path / 'first'), str(tmp_path / 'second' / 'touched.py')], changed_since='HEAD')
+
+    assert list(m._iter_py_files()) == [tmp_path / 'first' / 'touched.py', tmp_path / 'second' / 'touched.py']
+
+
+def test_many_paths_are_deduplicated_by_resolved_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    tmp_path = tmp_path.resolve()
+    (tmp_path / 'pkg').mkdir()
+    first = tmp_path / 'pkg' / 'a.py'
+    second = tmp_path / 'b.py'
+    first.write_text('x = 1\n', encoding='utf-8')
+    second.write_text('x = 1\n', encoding='utf-8')
+    (tmp_path / 'notes.txt').write_text('x\n', encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+
+    m = make_manager(('pkg', str(first), 'pkg/../pkg', 'b.py', 'notes.txt', str(second)))
+
+    assert m.paths == [tmp_path / 'pkg', first, second, tmp_path / 'notes.txt']
+    assert list(m._iter_py_files()) == [first, second]
+
+
+def test_format_and_check_source_stay_in_memory(tmp_path: Path) -> None:
+    filepath = tmp_path / 'missing.py'
+    ui = MagicMock()
+    m = make_manager(filepath, ui=ui, max_inline_args=1, excluded=('generated',), cache=False)
+
+    formatted = m.format_source('def f(a, b):\n    pass\n', filepath)
+    checked = m.check_source('def f(a, b):\n    pass\n', filepath)
+    skipped = m.check_source('def f(a, b):\n    pass\n', tmp_path / 'generated' / 'mod.py')
+
+    assert formatted.code == 'def f(\n    a,\n    b,\n):\n    pass\n'
+    assert [issue.line for issue in checked.issues] == [1]
+    assert m.issues == []
+    assert skipped.issues == ()
+    ui.skipped.assert_called_once_with(tmp_path / 'generated' / 'mod.py')
+    assert not filepath.exists()
@@ -0,0 +1,135 @@
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from def_form.core.cache import CacheEntry
+from def_form.core.manager import DefManager
+from def_form.core.manifest import StatManifest
+from def_form.core.manifest import stat_key
+from def_form.exceptions.def_formatter import CheckCommandFoundAnIssue
+
+from tests.helpers import BAD_SOURCE
+from tests.helpers import CLEAN_SOURCE
+from tests.helpers import age
+from tests.helpers import make_cached_manager
+
+ENTRY = CacheEntry(issues=((1, 'TooManyInlineArgumentsException', 'm', None),), changed=True)
+
+
+def test_manifest_roundtrip_is_keyed_by_stat_and_fingerprint(tmp_path: Path) -> None:
+    manifest = StatManifest(tmp_path, b'config')
+    manifest.put('/src/a.py', (1, 2, 3), ENTRY)
+    manifest.save()
+
+    loaded = StatManifest(tmp_path, b'config')
+    assert loaded.get('/src/a.py', (1, 2, 3)) == ENTRY
+    assert loaded.get('/src/a.py', (1, 2, 4)) is None
+    assert loaded.get('/src/b.py', (1, 2, 3)) is None
+    assert StatManifest(tmp_path, b'other config').get('/src/a.py', (1, 2, 3)) is None
+
+
+def test_manifest_appends_only_changed_records(tmp_path: Path) -> None:
+    manifest = StatManifest(tmp_path, b'config')
+    manifest.put('/src/a.py', (1, 2, 3), ENTRY)
+    manifest.put('/src/b.py', (1, 2, 3), ENTRY)
+    manifest.save()
+
+    manifest = StatManifest(tmp_path, b'config')
+    manifest.put('/src/a.py', (1, 2, 3), ENTRY)
+    manifest.put('/src/b.py', (5, 2, 3), ENTRY)
+    manifest.save()
+    with manifest.path.open('a', encoding='utf-8') as f:
+        f.write('["/src/c.py", 1, 2')
+
+    lines = manifest.path.read_text(encoding='utf-8').splitlines()
+    assert len(lines) == 4
+    assert StatManifest(tmp_path, b'config').get('/src/b.py', (5, 2, 3)) == ENTRY
+
+
+def test_manifest_compacts_stale_records(tmp_path: Path) -> None:
+    kept = tmp_path / 'kept.py'
+    kept.write_text(CLEAN_SOURCE, encoding='utf-8')
+    manifest = StatManifest(tmp_path, b'config')
+
+    with patch('def_form.core.manifest.COMPACT_MIN_RECORDS', 4):
+        for mtime in range(3):
+            manifest.put(str(kept), (mtime, 2, 3), ENTRY)
+            manifest.put(str(tmp_path / 'deleted.py'), (mtime, 2, 3), ENTRY)
+            manifest.save()
+
+    assert manifest.path.read_text(encoding='utf-8').count('\n') == 1
+    assert StatManifest(tmp_path, b'config').get(str(kept), (2, 2, 3)) == ENTRY
+
+
+def _results(manager: DefManager) -> list[tuple[str, bool, int]]:
+    results: list[tuple[str, bool, int]] = []
+    manager._run(manager.checker_class, on_result=lambda r: results.append((r.path.name, r.cache_hit, len(r.issues))))
+    return results
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_unchanged_files_are_answered_without_reading(tmp_path: Path, jobs: int) -> None:
+    src = tmp_path / 'src'
+    src.mkdir()
+    for name in ('a', 'b', 'c', 'd'):
+        (src / f'{name}.py').write_text(BAD_SOURCE if name in 'ac' else CLEAN_SOURCE, encoding='utf-8')
+    age(src)
+    first = _results(make_cached_manager(tmp_path, jobs=jobs))
+
+    # Same size and content, new mtime: only this file is read again.
+    changed = src / 'c.py'
+    st = changed.stat()
+    os.utime(changed, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    manager = make_cached_manager(tmp_path, jobs=jobs)
+    with patch('def_form.core.processing.Path.read_text', autospec=True, side_effect=Path.read_text) as read_text:
+        second = _results(manager)
+
+    assert [call.args[0].name for call in read_text.call_args_list] == ['c.py']
+    assert [(name, issues) for name, _, issues in second] == [(name, issues) for name, _, issues in first]
+    assert [hit for _, hit, _ in second] == [True, True, True, True]
+
+
+def test_formatted_files_are_read_again_after_rewrite(tmp_path: Path) -> None:
+    src = tmp_path / 'src'
+    src.mkdir()
+    target = src / 'a.py'
+    target.write_text(BAD_SOURCE, encoding='utf-8')
+
+    make_cached_manager(tmp_path).format()
+    assert make_cached_manager(tmp_path).manifest.get(str(target), stat_key(target.stat())) is None  # type: ignore[union-attr]
+
+    age(src)
+    make_cached_manager(tmp_path).check()
+    manager = make_cached_manager(tmp_path)
+    assert manager.manifest.get(str(target), stat_key(target.stat())) is not None  # type: ignore[union-attr]
+
+    target.write_text(BAD_SOURCE, encoding='utf-8')
+    with pytest.raises(CheckCommandFoundAnIssue):
+        make_cached_manager(tmp_path).check()
+
+
+def test_files_changed_within_the_racy_window_are_not_recorded(tmp_path: Path) -> None:
+    src = tmp_path / 'src'
+    src.mkdir()
+    target = src / 'a.py'
+    target.write_text(CLEAN_SOURCE, encoding='utf-8')
+    mtime_ns = target.stat().st_mtime_ns
+
+    make_cached_manager(tmp_path).check()
+
+    # Rewritten with the same size within the same timestamp tick: the stat does not change.
+    rewritten = 'def f(a, b, c):\n pass\n'
+    assert len(rewritten) == len(CLEAN_SOURCE)
+    target.write_text(rewritten, encoding='utf-8')
+    os.utime(target, ns=(mtime_ns, mtime_ns))
+
+    with pytest.raises(CheckCommandFoundAnIssue):
+        make_cached_manager(tmp_path).check()
+
+
+def test_no_cache_skips_the_manifest(tmp_path: Path) -> None:
+    (tmp_path / 'src').mkdir()
+
+    assert make_cached_manager(tmp_path, cache=False).manifest is None
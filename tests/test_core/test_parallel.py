@@ -0,0 +1,78 @@
+from pathlib import Path
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+
+from def_form.core.parallel import resolve_jobs
+from def_form.exceptions.def_formatter import CheckCommandFoundAnIssue
+
+from tests.helpers import make_manager
+
+
+SOURCE = 'def too_many(a, b, c):\n    pass\n\n\ndef ok(a):\n    pass\n'
+
+
+def _make_tree(root: Path, count: int) -> list[Path]:
+    paths = []
+    for i in range(count):
+        path = root / f'pkg{i % 3}' / f'mod_{i}.py'
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(SOURCE, encoding='utf-8')
+        paths.append(path)
+    return paths
+
+
+def test_resolve_jobs_values() -> None:
+    assert resolve_jobs(None) == 1
+    assert resolve_jobs(3) == 3
+    assert resolve_jobs('2') == 2
+    assert resolve_jobs('auto') >= 1
+
+
+def test_auto_jobs_counts_only_the_cpus_this_process_may_use() -> None:
+    with patch('def_form.core.parallel.os.sched_getaffinity', return_value={0, 1}, create=True):
+        assert resolve_jobs('auto') == 2
+
+
+def test_jobs_option_wins_over_pyproject(tmp_path: Path) -> None:
+    pyproject = tmp_path / 'pyproject.toml'
+    pyproject.write_text('[tool.def-form]\njobs = 3\n', encoding='utf-8')
+
+    assert make_manager(tmp_path, jobs=2, cache=False, config=str(pyproject)).jobs == 2
+    assert make_manager(tmp_path, jobs=None, cache=False, config=str(pyproject)).jobs == 3
+
+
+@pytest.mark.parametrize('value', [0, -1, 'many'])
+def test_resolve_jobs_rejects_invalid_values(value: int | str) -> None:
+    with pytest.raises(ValueError):
+        resolve_jobs(value)
+
+
+def test_parallel_check_matches_serial_in_deterministic_order(tmp_path: Path) -> None:
+    _make_tree(tmp_path, 12)
+
+    serial = make_manager(tmp_path, jobs=1, cache=False)
+    with pytest.raises(CheckCommandFoundAnIssue):
+        serial.check()
+
+    parallel = make_manager(tmp_path, jobs=3, cache=False)
+    with pytest.raises(CheckCommandFoundAnIssue):
+        parallel.check()
+
+    assert len(parallel.issues) == 12
+    assert [(type(i), i.path, i.message) for i in parallel.issues] == [
+        (type(i), i.path, i.message) for i in serial.issues
+    ]
+
+
+def test_parallel_format_writes_rewritten_sources(tmp_path: Path) -> None:
+    paths = _make_tree(tmp_path, 4)
+    ui = MagicMock()
+
+    manager = make_manager(tmp_path, jobs=2, cache=False, ui=ui)
+    manager.format()
+
+    assert ui.processing.call_count == 4
+    for path in paths:
+        assert path.read_text(encoding='utf-8').startswith('def too_many(\n    a,\n    b,\n    c,\n):')
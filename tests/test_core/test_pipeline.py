@@ -0,0 +1,126 @@
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+
+from def_form.core.config import DefFormConfig
+from def_form.core.parallel import iter_chunks
+from def_form.core.parallel import iter_parallel
+from def_form.core.pipeline import BackgroundIterator
+from def_form.core.pipeline import iter_prefetched
+from def_form.core.processing import CHECKER
+from def_form.exceptions.def_formatter import CheckCommandFoundAnIssue
+
+from tests.helpers import BAD_SOURCE
+from tests.helpers import make_manager
+
+CONFIG = DefFormConfig(max_inline_args=2)
+
+
+def _make_files(root: Path, count: int) -> list[Path]:
+    paths = []
+    for i in range(count):
+        path = root / f'mod_{i}.py'
+        path.write_text(BAD_SOURCE, encoding='utf-8')
+        paths.append(path)
+    return paths
+
+
+def test_background_iterator_yields_everything_in_order() -> None:
+    items = BackgroundIterator(iter(range(100)), maxsize=4)
+
+    assert list(items) == list(range(100))
+    assert items.produced == 100
+    assert items.finished
+
+
+def test_background_iterator_reraises_producer_errors() -> None:
+    def failing() -> Iterator[int]:
+        yield 1
+        raise RuntimeError('walk failed')
+
+    with pytest.raises(RuntimeError, match='walk failed'):
+        list(BackgroundIterator(failing()))
+
+
+def test_background_iterator_stops_the_producer_when_closed_early() -> None:
+    items = BackgroundIterator(iter(range(10_000)), maxsize=2)
+    iterator = iter(items)
+
+    assert next(iterator) == 0
+    iterator.close()  # type: ignore[attr-defined]
+
+    assert not items._thread.is_alive()
+    assert not items.finished
+
+
+def test_iter_chunks_grows_up_to_the_maximum() -> None:
+    chunks = list(iter_chunks(iter([Path(str(i)) for i in range(40)]), max_size=8))
+
+    assert [len(chunk) for chunk in chunks] == [1, 2, 4, 8, 8, 8, 8, 1]
+
+
+def test_iter_prefetched_keeps_order_and_handles_unreadable_files(tmp_path: Path) -> None:
+    paths = _make_files(tmp_path, 40)
+    paths.insert(3, tmp_path / 'missing.py')
+
+    results = list(iter_prefetched(iter(paths), CHECKER, CONFIG))
+
+    assert [result.path for result in results] == paths
+    assert results[3].issues == ()
+    assert sum(len(result.issues) for result in results) == 40
+
+
+def test_iter_parallel_consumes_a_stream(tmp_path: Path) -> None:
+    paths = _make_files(tmp_path, 30)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(iter_parallel((p for p in paths), CHECKER, CONFIG, jobs=2, executor=executor))
+
+    assert [result.path for result in results] == paths
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_processing_starts_before_the_walk_finishes(tmp_path: Path, jobs: int) -> None:
+    first, second, third = _make_files(tmp_path, 3)
+    first_processed = threading.Event()
+    waited: list[bool] = []
+    ui = MagicMock()
+    ui.processing.side_effect = lambda path: first_processed.set()
+
+    def slow_walk(on_skipped: object = None) -> Iterator[Path]:
+        yield first
+        yield second
+        # A walk that materialises the list first would never get past this point in time.
+        waited.append(first_processed.wait(timeout=10))
+        yield third
+
+    manager = make_manager(tmp_path, ui=ui, jobs=jobs, cache=False)
+
+    with patch.object(manager, '_iter_py_files', slow_walk), pytest.raises(CheckCommandFoundAnIssue):
+        manager.check()
+
+    assert waited == [True]
+    assert [call.args[0] for call in ui.processing.call_args_list] == [first, second, third]
+    ui.start.assert_called_once_with(total=None)
+    assert ui.update_total.call_args_list[-1].args == (3,)
+    assert ui.update_total.call_args_list[-1].kwargs == {'final': True}
+
+
+def test_skipped_files_are_reported_on_the_main_thread(tmp_path: Path) -> None:
+    _make_files(tmp_path, 2)
+    (tmp_path / 'generated').mkdir()
+    (tmp_path / 'generated.py').write_text('x = 1\n', encoding='utf-8')
+    threads: list[threading.Thread] = []
+    ui = MagicMock()
+    ui.skipped.side_effect = lambda path: threads.append(threading.current_thread())
+
+    manager = make_manager(tmp_path, ui=ui, max_inline_args=None, excluded=('generated.py',), cache=False)
+    manager.check()
+
+    assert threads == [threading.main_thread()]
+    assert ui.finish.call_args.args[0] == 2
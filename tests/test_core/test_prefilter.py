@@ -0,0 +1,86 @@
+import pytest
+
+from def_form.core.checker import DefChecker
+from def_form.core.config import DefFormConfig
+from def_form.core.prefilter import has_no_candidate_defs
+from def_form.core.prefilter import is_clean_def_line
+from def_form.core.processing import process_source
+
+from tests.conftest import CASE_IDS
+from tests.helpers import MAX_DEF_LENGTH
+from tests.helpers import MAX_INLINE_ARGS
+
+
+CONFIG = DefFormConfig(max_def_length=MAX_DEF_LENGTH, max_inline_args=MAX_INLINE_ARGS, indent_size=4)
+
+
+@pytest.mark.parametrize(
+    ('def_line', 'expected'),
+    [
+        ('def f():', True),
+        ('def f(a, b):', True),
+        ('def f(a, b,): return (1, 2)', True),
+        ('def f(a: dict[str, int], b) -> x[1:2]:  # comment', True),
+        ('async def f(a=lambda x: x): pass', True),
+        ('def f(a, b, c):', False),
+        ('def f(a, *, b):', False),
+        ('def f(a,', False),
+        ("def f(a='#'):", False),
+        ('def f(a="""x"""):', False),
+        ('def f[T](a):', False),
+        (f'def f(a): return {"x" * MAX_DEF_LENGTH}', False),
+    ],
+)
+def test_is_clean_def_line(def_line: str, expected: bool) -> None:
+    assert is_clean_def_line(def_line, CONFIG) is expected
+
+
+def test_is_clean_def_line_skips_rules_that_are_not_enabled() -> None:
+    assert is_clean_def_line('def f(a, b, c):', CONFIG) is False
+    assert is_clean_def_line('def f(a, b, c):', DefFormConfig(max_inline_args=2, select=('max-def-length',))) is True
+    assert has_no_candidate_defs('def f(a, b, c):\n', DefFormConfig(max_inline_args=2, select=())) is True
+
+
+def test_has_no_candidate_defs_without_defs() -> None:
+    assert has_no_candidate_defs('x = 1\nprint(x)\n', CONFIG) is True
+
+
+def test_has_no_candidate_defs_gives_up_on_backslash_continuation() -> None:
+    assert has_no_candidate_defs('async \\\ndef f(a): pass\n', CONFIG) is False
+
+
+def test_has_no_candidate_defs_gives_up_on_carriage_return_line_endings() -> None:
+    code = 'x = 1\rdef f(a, b, c):\r    pass\r'
+    _, issues = process_source(code, 'x.py', DefChecker, CONFIG)
+
+    assert [issue.path for issue in issues] == ['x.py:2']
+    assert has_no_candidate_defs(code, CONFIG) is False
+    assert has_no_candidate_defs(code.replace('\r', '\r\n'), CONFIG) is False
+
+
+def test_has_no_candidate_defs_finds_nested_defs() -> None:
+    code = 'class A:\n    def ok(self):\n        def bad(a, b, c): pass\n'
+    assert has_no_candidate_defs(code, CONFIG) is False
+
+
+@pytest.mark.parametrize('case_id', CASE_IDS, indirect=True)
+def test_prefilter_agrees_with_libcst_on_cases(case_id: str, case_source_path: str) -> None:
+    with open(case_source_path, encoding='utf-8') as f:
+        code = f.read()
+
+    _, issues = process_source(code, case_source_path, DefChecker, CONFIG)
+
+    if has_no_candidate_defs(code, CONFIG):
+        assert issues == []
+
+
+@pytest.mark.parametrize('newline', ['\r', '\r\n'])
+@pytest.mark.parametrize('case_id', CASE_IDS, indirect=True)
+def test_prefilter_agrees_with_libcst_on_other_line_endings(case_id: str, case_source_path: str, newline: str) -> None:
+    with open(case_source_path, encoding='utf-8') as f:
+        code = f.read().replace('\n', newline)
+
+    _, issues = process_source(code, case_source_path, DefChecker, CONFIG)
+
+    if has_no_candidate_defs(code, CONFIG):
+        assert issues == []
@@ -0,0 +1,107 @@
+import json
+import pstats
+from pathlib import Path
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+
+from def_form.core.config import DefFormConfig
+from def_form.core.manager import DefManager
+from def_form.core.models import FileResult
+from def_form.core.processing import CHECKER
+from def_form.core.processing import FORMATTER
+from def_form.core.processing import process_path
+from def_form.core.profiling import FileProfile
+from def_form.core.profiling import RunProfile
+from def_form.exceptions.def_formatter import CheckCommandFoundAnIssue
+
+from tests.helpers import BAD_SOURCE
+from tests.helpers import make_manager
+
+CONFIG = DefFormConfig(max_inline_args=2)
+
+
+def test_nested_phases_keep_only_their_own_time() -> None:
+    clock = iter([0.0, 1.0, 3.0, 4.0])
+    profile = FileProfile()
+
+    with patch('def_form.core.profiling.time') as mock_time:
+        mock_time.perf_counter.side_effect = lambda: next(clock)
+        mock_time.thread_time.return_value = 0.0
+        with profile.phase('visit'), profile.phase('rules'):
+            pass
+
+    assert profile.wall == {'rules': 2.0, 'visit': 2.0}
+    assert profile.total == 4.0
+    assert [event[:3] for event in profile.events] == [('rules', 1.0, 2.0), ('visit', 0.0, 4.0)]
+
+
+@pytest.mark.parametrize(('processor', 'phases'), [(CHECKER, set()), (FORMATTER, {'codegen'})])
+def test_process_path_records_every_phase(tmp_path: Path, processor: object, phases: set[str]) -> None:
+    path = tmp_path / 'mod.py'
+    path.write_text(BAD_SOURCE, encoding='utf-8')
+
+    result = process_path(path, processor, CONFIG, profile=True)  # type: ignore[arg-type]
+
+    assert result.profile is not None
+    assert {'read', 'prefilter', 'parse', 'metadata', 'visit', 'rules'} | phases <= set(result.profile.wall)
+    assert process_path(path, processor, CONFIG).profile is None  # type: ignore[arg-type]
+
+
+def test_profile_does_not_affect_result_equality(tmp_path: Path) -> None:
+    assert FileResult(path=tmp_path, profile=FileProfile()) == FileResult(path=tmp_path)
+
+
+def _manager(tmp_path: Path, ui: MagicMock, **kwargs: object) -> DefManager:
+    for i in range(3):
+        (tmp_path / f'mod_{i}.py').write_text(BAD_SOURCE * (i + 1), encoding='utf-8')
+    return make_manager(tmp_path, ui=ui, cache=False, **kwargs)
+
+
+def test_profiled_run_reports_phases_and_slowest_files(tmp_path: Path) -> None:
+    ui = MagicMock()
+    manager = _manager(tmp_path, ui, profile=True, profile_top=2)
+
+    manager.format()
+
+    ui.show_profile.assert_called_once()
+    report: RunProfile = ui.show_profile.call_args.args[0]
+    assert [name for name, _, _ in report.phases()][:2] == ['read', 'prefilter']
+    assert 'write' in report.wall
+    assert len(report.slowest()) == 2
+    assert report.elapsed > 0
+
+
+def test_unprofiled_run_does_not_report(tmp_path: Path) -> None:
+    ui = MagicMock()
+
+    _manager(tmp_path, ui).format()
+
+    ui.show_profile.assert_not_called()
+
+
+def test_profile_output_writes_chrome_trace(tmp_path: Path) -> None:
+    trace = tmp_path / 'out' / 'trace.json'
+    trace.parent.mkdir()
+    manager = _manager(tmp_path, MagicMock(), profile_output=str(trace))
+
+    with pytest.raises(CheckCommandFoundAnIssue):
+        manager.check()
+
+    events = json.loads(trace.read_text(encoding='utf-8'))['traceEvents']
+    assert {event['name'] for event in events} >= {'read', 'parse', 'visit'}
+    assert {event['ph'] for event in events} == {'X'}
+    assert {Path(event['args']['file']).name for event in events} == {'mod_0.py', 'mod_1.py', 'mod_2.py'}
+
+
+def test_profile_output_writes_pstats(tmp_path: Path) -> None:
+    output = tmp_path / 'out' / 'run.pstats'
+    output.parent.mkdir()
+    manager = _manager(tmp_path, MagicMock(), profile_output=str(output))
+
+    with pytest.raises(CheckCommandFoundAnIssue):
+        manager.check()
+
+    functions = {function for _, _, function in pstats.Stats(str(output)).stats}  # type: ignore[attr-defined]
+    assert 'process_text' in functions
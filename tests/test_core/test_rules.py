@@ -0,0 +1,135 @@
+from collections.abc import Callable
+from pathlib import Path
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+
+from def_form.core.config import DefFormConfig
+from def_form.core.manager import DefManager
+from def_form.core.processing import CHECKER
+from def_form.core.processing import FAST_CHECKER
+from def_form.core.processing import FORMATTER
+from def_form.core.processing import process_source
+from def_form.core.rules import DEFAULT_RULES
+from def_form.core.rules import RULES
+from def_form.core.rules import enabled_rules
+from def_form.core.rules import run_rules
+from def_form.core.rules.context import RuleContext
+from def_form.exceptions.def_formatter import CheckCommandFoundAnIssue
+
+SOURCE = 'def long_name(a, b, c): pass\n\n\ndef g(\n  a,\n  b,\n):\n    pass\n'
+
+
+def _names(config: DefFormConfig) -> list[str]:
+    return [rule.name for rule in enabled_rules(config)]
+
+
+def _context(
+    def_line: str,
+    arg_count: int,
+    multiline_format: Callable[[], bool] = lambda: False,
+) -> RuleContext:
+    return RuleContext(
+        filepath='x.py',
+        line_no=1,
+        arg_count=arg_count,
+        indent_size=4,
+        max_def_length=10,
+        max_inline_args=2,
+        def_line=lambda: def_line,
+        multiline_format=multiline_format,
+    )
+
+
+def test_rules_without_threshold_are_not_enabled() -> None:
+    assert _names(DefFormConfig()) == ['multiline-params-indent']
+    assert _names(DefFormConfig(max_def_length=10, max_inline_args=2)) == list(RULES)
+
+
+def test_select_and_ignore_pick_the_enabled_rules() -> None:
+    config = DefFormConfig(max_def_length=10, max_inline_args=2, select=('max-inline-args', 'multiline-params-indent'))
+    assert _names(config) == ['max-inline-args', 'multiline-params-indent']
+
+    config = DefFormConfig(max_def_length=10, max_inline_args=2, ignore=['Multiline-Params-Indent'])  # type: ignore[arg-type]
+    assert _names(config) == ['max-def-length', 'max-inline-args']
+    assert config == DefFormConfig(max_def_length=10, max_inline_args=2, ignore=('Multiline-Params-Indent',))
+
+    assert enabled_rules(DefFormConfig(select=())) == ()
+
+
+def test_unknown_rule_names_are_rejected() -> None:
+    with pytest.raises(ValueError, match='Unknown rule in select: max-args'):
+        enabled_rules(DefFormConfig(select=('max-args',)))
+
+
+def test_facts_are_computed_on_first_use_and_kept() -> None:
+    def_lines: list[str] = []
+    multiline_calls: list[bool] = []
+
+    def def_line() -> str:
+        def_lines.append('def f(a, b, c):')
+        return def_lines[-1]
+
+    def multiline_format() -> bool:
+        multiline_calls.append(True)
+        return True
+
+    context = RuleContext(
+        filepath='x.py',
+        line_no=1,
+        arg_count=1,
+        indent_size=4,
+        max_def_length=100,
+        max_inline_args=2,
+        def_line=def_line,
+        multiline_format=multiline_format,
+    )
+
+    # Within the inline argument limit, nothing about the header is looked at.
+    assert run_rules(context, (RULES['max-inline-args'],)) == []
+    assert def_lines == []
+
+    assert run_rules(context, DEFAULT_RULES) == []
+    assert len(def_lines) == 1
+    # A single-line def never needs the multiline format check.
+    assert multiline_calls == []
+
+
+def test_facts_can_still_be_passed_in_directly() -> None:
+    context = RuleContext('x.py', 1, 24, 3, True, False, 4, 100, 2)
+
+    assert [type(issue).__name__ for issue in run_rules(context, DEFAULT_RULES)] == ['TooManyInlineArgumentsException']
+    assert RuleContext(filepath='x.py', line_no=1, arg_count=3, is_single_line=True).is_single_line is True
+
+
+@pytest.mark.parametrize('processor', [CHECKER, FAST_CHECKER, FORMATTER])
+def test_ignored_rules_are_not_reported(processor: object) -> None:
+    config = DefFormConfig(max_def_length=10, max_inline_args=2, ignore=('max-def-length',))
+    _, issues = process_source(SOURCE, 'x.py', processor, config)  # type: ignore[arg-type]
+
+    assert [type(issue).__name__ for issue in issues] == [
+        'TooManyInlineArgumentsException',
+        'InvalidMultilineParamsIndentException',
+    ]
+
+
+def test_nothing_is_parsed_without_enabled_rules() -> None:
+    with patch('libcst.parse_module') as parse_module:
+        assert process_source(SOURCE, 'x.py', CHECKER, DefFormConfig(select=())) == ([], [])
+
+    parse_module.assert_not_called()
+
+
+def test_manager_reads_rule_selection_from_pyproject(tmp_path: Path) -> None:
+    pyproject = tmp_path / 'pyproject.toml'
+    pyproject.write_text('[tool.def-form]\nmax_inline_args = 2\nselect = ["multiline-params-indent"]\n')
+    (tmp_path / 'a.py').write_text('def f(a, b, c):\n    pass\n', encoding='utf-8')
+
+    manager = DefManager(path=str(tmp_path), ui=MagicMock(), config=str(pyproject), cache=False)
+    assert manager.settings.select == ('multiline-params-indent',)
+    manager.check()
+
+    pyproject.write_text('[tool.def-form]\nmax_inline_args = 2\n')
+    with pytest.raises(CheckCommandFoundAnIssue):
+        DefManager(path=str(tmp_path), ui=MagicMock(), config=str(pyproject), cache=False).check()
@@ -0,0 +1,238 @@
+import os
+import stat
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from def_form.cli.errors import CLIError
+from def_form.cli.main import cli
+from def_form.daemon.client import STARTUP_TIMEOUT
+from def_form.daemon.client import DaemonError
+from def_form.daemon.client import connect
+from def_form.daemon.client import run_remote
+from def_form.daemon.client import send_request
+from def_form.daemon.client import start_daemon
+from def_form.daemon.client import stop_daemon
+from def_form.daemon.server import DaemonServer
+from def_form.exceptions.def_formatter import CheckCommandFoundAnIssue
+
+from tests.helpers import BAD_SOURCE
+from tests.helpers import age
+
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32', reason='the daemon uses Unix sockets')
+
+
+@pytest.fixture
+def socket_path() -> Iterator[Path]:
+    # AF_UNIX paths are limited to ~100 bytes, so tmp_path can be too long.
+    with tempfile.TemporaryDirectory(prefix='dfd-') as directory:
+        yield Path(directory) / 'd.sock'
+
+
+@pytest.fixture
+def server(socket_path: Path) -> Iterator[DaemonServer]:
+    daemon = DaemonServer(socket_path, idle_timeout=0.2)
+    daemon.timeout = 30
+    thread = threading.Thread(target=daemon.serve, daemon=True)
+    thread.start()
+    yield daemon
+    stop_daemon(socket_path)
+    thread.join(timeout=5)
+
+
+def _options(path: Path, **overrides: object) -> dict:
+    return {
+        'path': [str(path)],
+        'config': '/nonexistent',
+        'max_inline_args': 2,
+        'cache_dir': str(path / '.cache'),
+        **overrides,
+    }
+
+
+def test_check_streams_ui_events_and_raises_on_issues(tmp_path: Path, socket_path: Path, server: DaemonServer) -> None:
+    (tmp_path / 'bad.py').write_text(BAD_SOURCE, encoding='utf-8')
+    ui = MagicMock()
+
+    with pytest.raises(CheckCommandFoundAnIssue):
+        run_remote('check', _options(tmp_path), ui, socket_path=socket_path)
+
+    ui.show_config_info.assert_called_once()
+    ui.start.assert_called_once_with(total=None)
+    ui.update_total.assert_called_with(1, final=True)
+    ui.processing.assert_called_once_with(tmp_path / 'bad.py')
+    processed, issues = ui.finish.call_args[0]
+    assert processed == 1
+    assert [issue.path for issue in issues] == [f'{tmp_path / "bad.py"}:1']
+
+
+def test_repeated_check_is_served_from_memory(tmp_path: Path, socket_path: Path, server: DaemonServer) -> None:
+    (tmp_path / 'bad.py').write_text(BAD_SOURCE, encoding='utf-8')
+    age(tmp_path)
+    options = _options(tmp_path)
+
+    with pytest.raises(CheckCommandFoundAnIssue):
+        run_remote('check', options, MagicMock(), socket_path=socket_path)
+
+    ui = MagicMock()
+    with patch('def_form.core.pipeline.process_text') as mock_process_text, pytest.raises(CheckCommandFoundAnIssue):
+        run_remote('check', options, ui, socket_path=socket_path)
+
+    mock_process_text.assert_not_called()
+    assert ui.finish.call_args[1]['cache_hits'].startswith('1/1')
+    assert len(ui.finish.call_args[0][1]) == 1
+
+
+def test_files_changed_within_the_racy_window_are_not_remembered(
+    tmp_path: Path,
+    socket_path: Path,
+    server: DaemonServer,
+) -> None:
+    target = tmp_path / 'mod.py'
+    target.write_text(BAD_SOURCE, encoding='utf-8')
+    options = _options(tmp_path)
+    with pytest.raises(CheckCommandFoundAnIssue):
+        run_remote('check', options, MagicMock(), socket_path=socket_path)
+
+    # Same size and mtime: only a fresh read can tell the def now fits.
+    st = target.stat()
+    target.write_text(BAD_SOURCE.replace('b, c', 'bcde'), encoding='utf-8')
+    os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert target.stat().st_size == st.st_size
+
+    run_remote('check', options, MagicMock(), socket_path=socket_path)
+
+
+def test_format_writes_through_daemon(tmp_path: Path, socket_path: Path, server: DaemonServer) -> None:
+    target = tmp_path / 'bad.py'
+    target.write_text(BAD_SOURCE, encoding='utf-8')
+
+    run_remote('format', _options(tmp_path, cache=False), MagicMock(), socket_path=socket_path)
+
+    assert target.read_text(encoding='utf-8') == 'def too_many(\n    a,\n    b,\n    c,\n):\n    pass\n'
+
+
+def test_errors_are_reported_to_the_client(tmp_path: Path, socket_path: Path, server: DaemonServer) -> None:
+    with pytest.raises(DaemonError, match='Invalid jobs value'):
+        run_remote('check', _options(tmp_path, jobs='many'), MagicMock(), socket_path=socket_path)
+
+
+def test_version_mismatch_stops_the_daemon(socket_path: Path, server: DaemonServer) -> None:
+    sock = connect(socket_path)
+    assert sock is not None
+
+    status, _ = send_request(sock, {'command': 'check', 'version': 'other'})
+
+    assert status == 'restart'
+    assert not socket_path.exists()
+
+
+def test_idle_timeout_stops_the_daemon(socket_path: Path) -> None:
+    daemon = DaemonServer(socket_path, idle_timeout=0.05)
+    daemon.serve()
+
+    assert not socket_path.exists()
+    assert connect(socket_path) is None
+
+
+def test_refuses_to_start_twice(socket_path: Path, server: DaemonServer) -> None:
+    with pytest.raises(FileExistsError):
+        DaemonServer(socket_path, idle_timeout=1)
+
+
+def test_socket_is_private_to_the_user(socket_path: Path, server: DaemonServer) -> None:
+    assert stat.S_IMODE(socket_path.stat().st_mode) & 0o077 == 0
+
+
+def test_refuses_a_socket_directory_open_to_others(socket_path: Path) -> None:
+    socket_path.parent.chmod(0o755)
+
+    with (
+        patch('def_form.daemon.server.default_socket_dir', return_value=socket_path.parent),
+        pytest.raises(PermissionError, match='mode 0700'),
+    ):
+        DaemonServer(socket_path, idle_timeout=1)
+    assert not socket_path.exists()
+
+
+def test_explicit_socket_path_may_live_in_a_shared_directory(socket_path: Path) -> None:
+    socket_path.parent.chmod(0o755)
+
+    daemon = DaemonServer(socket_path, idle_timeout=0.05)
+    daemon.serve()
+
+    assert not socket_path.exists()
+
+
+def test_daemon_command_reports_startup_errors(socket_path: Path) -> None:
+    socket_path.parent.chmod(0o755)
+
+    with patch('def_form.daemon.server.default_socket_dir', return_value=socket_path.parent):
+        result = CliRunner().invoke(cli, ['daemon', '--socket', str(socket_path)])
+
+    assert isinstance(result.exception, CLIError)
+    assert 'mode 0700' in str(result.exception)
+
+
+def test_client_stops_waiting_for_a_daemon_that_exited(tmp_path: Path) -> None:
+    (tmp_path / 'file').write_text('', encoding='utf-8')
+    started = time.monotonic()
+
+    with pytest.raises(DaemonError, match='exited without listening'):
+        start_daemon(tmp_path / 'file' / 'd.sock')
+    assert time.monotonic() - started < STARTUP_TIMEOUT
+
+
+def test_client_refuses_a_socket_owned_by_someone_else(socket_path: Path, server: DaemonServer) -> None:
+    with (
+        patch('def_form.daemon.client.os.getuid', return_value=os.getuid() + 1),
+        pytest.raises(DaemonError, match='not a socket owned by the current user'),
+    ):
+        connect(socket_path)
+
+
+def test_broken_worker_pool_is_replaced(tmp_path: Path, socket_path: Path, server: DaemonServer) -> None:
+    broken = MagicMock()
+    server._executor = broken
+    server._executor_jobs = 2
+
+    with (
+        patch('def_form.daemon.server.WarmDefManager.check', side_effect=BrokenProcessPool('worker died')),
+        pytest.raises(DaemonError, match='A worker process died'),
+    ):
+        run_remote('check', _options(tmp_path), MagicMock(), socket_path=socket_path)
+
+    broken.shutdown.assert_called_once()
+    assert server._executor is None
+    assert server.executor(2) is not broken
+
+
+def test_client_starts_daemon_on_demand(tmp_path: Path, socket_path: Path) -> None:
+    (tmp_path / 'ok.py').write_text('def ok(a):\n    pass\n', encoding='utf-8')
+
+    try:
+        run_remote('check', _options(tmp_path), MagicMock(), socket_path=socket_path, idle_timeout=30)
+        assert connect(socket_path) is not None
+    finally:
+        stop_daemon(socket_path)
+
+
+def test_check_daemon_flag_forwards_options(tmp_path: Path) -> None:
+    with patch('def_form.cli.commands.check.run_remote') as mock_run_remote:
+        result = CliRunner().invoke(cli, ['check', str(tmp_path), '--daemon', '--max-inline-args', '3'])
+
+    assert result.exit_code == 0
+    command, options, _ = mock_run_remote.call_args[0]
+    assert command == 'check'
+    assert options['path'] == (str(tmp_path),)
+    assert options['max_inline_args'] == 3
@@ -4,10 +4,21 @@ from unittest.mock import patch
 import pytest
 
 from def_form.core import DefManager
+from def_form.core.config import DefFormConfig
+from def_form.core.edits import TextEdit
+from def_form.core.edits import apply_edits
+from def_form.core.formatter import DefFormatter
+from def_form.core.processing import process_path
+from def_form.core.processing import process_source
 from tests.helpers import normalize_issues
+from tests.helpers import MAX_DEF_LENGTH
+from tests.helpers import MAX_INLINE_ARGS
 from tests.conftest import CASE_IDS
 
 
+CONFIG = DefFormConfig(max_def_length=MAX_DEF_LENGTH, max_inline_args=MAX_INLINE_ARGS, indent_size=4)
+
+
 @pytest.mark.parametrize('case_id', CASE_IDS, indirect=True)
 def test_format_case(
     case_id: str,
@@ -27,6 +38,53 @@ def test_format_case(
         f'case_id={case_id}: expected issues {case_expected_issues}, got {got_issues}'
     )
 
-    if case_expected_content is not None:
-        mocked_write.assert_called_once()
-        assert mocked_write.call_args[1]['module'].strip() == case_expected_content.strip()
+    if case_expected_content is None:
+        return
+
+    if case_expected_content == (case_dir / 'source.py').read_text(encoding='utf-8'):
+        mocked_write.assert_not_called()
+        return
+
+    mocked_write.assert_called_once()
+    assert mocked_write.call_args[1]['module'].strip() == case_expected_content.strip()
+
+
+def _format_edits(code: str) -> list[TextEdit]:
+    edits, _ = process_source(code, 'module.py', DefFormatter, CONFIG)
+    return edits
+
+
+def test_formatter_edits_only_cover_changed_parameter_lists() -> None:
+    code = 'def ok(a):\n    pass\n\n\ndef bad(a, b, c):\n    pass\n'
+
+    edits = _format_edits(code)
+
+    assert edits == [TextEdit(start_line=5, start_column=8, end_line=5, end_column=15, text='\n    a,\n    b,\n    c,\n')]
+
+
+@pytest.mark.parametrize(
+    ('code', 'expected'),
+    [
+        (
+            'class A:\n\tdef f(self, a, b):\n\t\tpass\n',
+            'class A:\n\tdef f(\n\t    self,\n\t    a,\n\t    b,\n\t):\n\t\tpass\n',
+        ),
+        (
+            'def f(a, b, c):\r\n    pass\r\n',
+            'def f(\r\n    a,\r\n    b,\r\n    c,\r\n):\r\n    pass\r\n',
+        ),
+    ],
+    ids=['tab_indented_method', 'crlf'],
+)
+def test_formatter_edits_keep_block_indent_and_newlines(code: str, expected: str) -> None:
+    assert apply_edits(code, _format_edits(code)) == expected
+
+
+def test_process_path_returns_edits_with_spliced_code(tmp_path: Path) -> None:
+    path = tmp_path / 'mod.py'
+    path.write_text('def bad(a, b, c):\n    pass\n', encoding='utf-8')
+
+    result = process_path(path, DefFormatter, CONFIG)
+
+    assert len(result.edits) == 1
+    assert result.code == 'def bad(\n    a,\n    b,\n    c,\n):\n    pass\n'
@@ -0,0 +1,69 @@
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from def_form.utils.git import GitError
+from def_form.utils.git import changed_files
+from def_form.utils.git import find_git_root
+
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason='git is not installed')
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(
+        ['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    root = tmp_path / 'repo'
+    (root / 'pkg').mkdir(parents=True)
+    (root / 'pkg' / 'a.py').write_text('def a(x):\n    pass\n', encoding='utf-8')
+    (root / 'pkg' / 'b.py').write_text('def b(x):\n    pass\n', encoding='utf-8')
+    (root / 'gone.py').write_text('x = 1\n', encoding='utf-8')
+    (root / '.gitignore').write_text('ignored.py\n', encoding='utf-8')
+    _git(root, 'init', '-q')
+    _git(root, 'add', '.')
+    _git(root, 'commit', '-q', '-m', 'initial')
+    return root.resolve()
+
+
+def test_find_git_root_from_subdirectory(repo: Path) -> None:
+    assert find_git_root(repo / 'pkg') == repo
+    assert find_git_root(repo / 'pkg' / 'a.py') == repo
+
+
+def test_find_git_root_outside_repository_raises(tmp_path: Path) -> None:
+    outside = tmp_path / 'outside'
+    outside.mkdir()
+    with pytest.raises(GitError):
+        find_git_root(outside)
+
+
+def test_changed_since_includes_modified_and_untracked_files(repo: Path) -> None:
+    (repo / 'pkg' / 'a.py').write_text('def a(x, y):\n    pass\n', encoding='utf-8')
+    (repo / 'pkg' / 'new.py').write_text('x = 1\n', encoding='utf-8')
+    (repo / 'ignored.py').write_text('x = 1\n', encoding='utf-8')
+    (repo / 'gone.py').unlink()
+
+    assert changed_files(repo, changed_since='HEAD') == [repo / 'pkg' / 'a.py', repo / 'pkg' / 'new.py']
+
+
+def test_staged_only_includes_index_changes(repo: Path) -> None:
+    (repo / 'pkg' / 'a.py').write_text('def a(x, y):\n    pass\n', encoding='utf-8')
+    (repo / 'pkg' / 'b.py').write_text('def b(x, y):\n    pass\n', encoding='utf-8')
+    _git(repo, 'add', 'pkg/b.py')
+
+    assert changed_files(repo, staged=True) == [repo / 'pkg' / 'b.py']
+
+
+def test_changed_since_unknown_ref_raises(repo: Path) -> None:
+    with pytest.raises(GitError):
+        changed_files(repo, changed_since='no-such-ref')